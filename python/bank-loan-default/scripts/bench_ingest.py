@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from src.io import import_data
+
+FPATH = "data/bank_loan_dataset.xlsx"
+SHEET = "Data"
+HEADER = 2
+EXCLUDE = ["Unnamed: 0"]
+REPEATS = 5
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run() -> None:
+    cache_dir = tempfile.mkdtemp()
+    try:
+
+        def excel():
+            pd.read_excel(FPATH, sheet_name=SHEET, header=HEADER)
+
+        def cached():
+            import_data(FPATH, SHEET, HEADER, EXCLUDE, cache_dir=cache_dir)
+
+        baseline = min(timed(excel) for _ in range(REPEATS))
+        cold = timed(cached)
+        warm = min(timed(cached) for _ in range(REPEATS))
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print(f"{'load':>12} | {'seconds':>8} | speedup")
+    print(f"{'read_excel':>12} | {baseline:>8.3f} |")
+    print(f"{'cold cache':>12} | {cold:>8.3f} | {baseline / cold:.2f}x")
+    print(f"{'warm cache':>12} | {warm:>8.3f} | {baseline / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
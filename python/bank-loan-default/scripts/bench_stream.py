@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from src.io import import_data
+from src.preprocess import preprocess_data
+from src.stream import preprocess_stream
+
+ROWS = [200_000, 1_000_000]
+CHUNKSIZE = 50_000
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def run() -> None:
+    data = import_data(
+        "data/bank_loan_dataset.xlsx", "Data", header=2, exclude_columns=["Unnamed: 0"]
+    )
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'rows':>10} | {'mode':>10} | {'seconds':>8} | {'peak MiB':>9}")
+        for rows in ROWS:
+            source = workdir / f"loans_{rows}.csv"
+            data.sample(rows, replace=True, random_state=0).to_csv(source, index=False)
+
+            def in_memory():
+                preprocess_data(pd.read_csv(source))
+
+            def streamed():
+                preprocess_stream(source, workdir / "features", chunksize=CHUNKSIZE)
+
+            for mode, fn in (("in-memory", in_memory), ("streamed", streamed)):
+                elapsed, peak = measure(fn)
+                print(f"{rows:>10,} | {mode:>10} | {elapsed:>8.2f} | {peak:>9.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,31 @@
+import argparse
+import time
+from pathlib import Path
+
+from src.cache import cache_key, read_manifest
+from src.config import CACHE_DIR
+from src.io import import_cached
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a workbook sheet to the columnar ingestion cache"
+    )
+    parser.add_argument("fpath", nargs="?", default="data/bank_loan_dataset.xlsx")
+    parser.add_argument("--sheet", default="Data")
+    parser.add_argument("--header", type=int, default=2)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = import_cached(args.fpath, args.sheet, args.header, cache_dir=args.cache_dir)
+    elapsed = time.perf_counter() - start
+
+    entry = Path(args.cache_dir) / cache_key(args.fpath, args.sheet, args.header)
+    manifest = read_manifest(entry)
+    print(f"{args.fpath} [{args.sheet}] -> {entry}")
+    print(f"{manifest['rows']} rows, {len(data.columns)} columns in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+CACHE_VERSION = 2
+
+
+def file_digest(fpath: str | Path) -> str:
+    """
+    SHA-256 of the file contents, read in 1 MiB blocks
+    """
+    digest = hashlib.sha256()
+    with open(fpath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(fpath: str | Path, sheet_name: str, header: int) -> str:
+    """
+    Cache entry name for one sheet of one version of a workbook. Editing the file, or
+    reading a different sheet or header row, gives a different key
+    """
+    source = f"{file_digest(fpath)}\0{sheet_name}\0{header}\0{CACHE_VERSION}"
+    return hashlib.sha256(source.encode()).hexdigest()[:32]
+
+
+def write_cache(data: pd.DataFrame, entry: Path) -> None:
+    """
+    Store each column as its own .npy file plus a manifest of names and dtypes. Text
+    columns become fixed-width unicode arrays (with a mask file if any are missing) so they
+    can be memory-mapped back. Object columns holding anything but strings (say numbers and
+    text mixed) are pickled as they are, so they read back unchanged but are not mapped
+    """
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-"))
+
+    columns = []
+    for i, name in enumerate(data.columns):
+        series = data[name]
+        # Column labels are strings, or positions when the sheet is read without a header
+        label = name if isinstance(name, (str, int)) else str(name)
+        column = {"name": label, "file": f"{i:04d}.npy", "dtype": str(series.dtype)}
+        if series.dtype.kind in "biufcmM":
+            values = series.to_numpy()
+        elif pd.api.types.infer_dtype(series, skipna=True) == "string":
+            missing = series.isna().to_numpy()
+            values = series.to_numpy(dtype=str, na_value="")
+            if missing.any():
+                column["mask"] = f"{i:04d}.mask.npy"
+                np.save(tmp / column["mask"], missing)
+        else:
+            column["pickled"] = True
+            values = series.to_numpy(dtype=object)
+        np.save(tmp / column["file"], values, allow_pickle=column.get("pickled", False))
+        columns.append(column)
+
+    with open(tmp / MANIFEST, "w") as f:
+        json.dump({"version": CACHE_VERSION, "rows": len(data), "columns": columns}, f)
+
+    # Another process may have warmed the same entry meanwhile; either copy is valid
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def read_manifest(entry: Path) -> dict | None:
+    try:
+        with open(entry / MANIFEST) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    return manifest if manifest.get("version") == CACHE_VERSION else None
+
+
+def read_cache(
+    entry: Path, manifest: dict, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Load the named columns (all by default) from a cache entry. Numeric columns stay
+    memory-mapped (copy-on-write, so the frame can be modified without touching the
+    cache); text columns are rebuilt as pandas strings with missing values restored
+    """
+    wanted = None if columns is None else set(columns)
+    data = {}
+    for column in manifest["columns"]:
+        name = column["name"]
+        if wanted is not None and name not in wanted:
+            continue
+        if column.get("pickled"):
+            values = np.load(entry / column["file"], allow_pickle=True)
+            data[name] = pd.Series(values, dtype=column["dtype"])
+            continue
+        # Copy-on-write mapping: pages load lazily and writes stay private to the frame
+        values = np.load(entry / column["file"], mmap_mode="c")
+        if values.dtype.kind == "U":
+            series = pd.Series(values, dtype=column["dtype"])
+            if "mask" in column:
+                series = series.mask(np.load(entry / column["mask"]))
+            data[name] = series
+        else:
+            # A plain ndarray over the mapped pages, not the np.memmap subclass
+            data[name] = values.view(np.ndarray)
+    return pd.DataFrame(data, copy=False)
@@ -25,3 +25,6 @@ AGE_COL = "Age"
 
 # Training config
 PARAMETERS = {"learning_rate": 0.15, "max_depth": 5, "n_estimators": 500}
+
+# Ingestion config
+CACHE_DIR = "data/.cache"
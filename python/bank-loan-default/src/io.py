@@ -1,21 +1,53 @@
+from pathlib import Path
+
 import pandas as pd
 
+from src.cache import cache_key, read_cache, read_manifest, write_cache
+from src.config import CACHE_DIR
+
 
 def import_data(
-    fpath: str, sheet_name: str, header: int = 1, exclude_columns: list[str] = []
+    fpath: str,
+    sheet_name: str,
+    header: int = 1,
+    exclude_columns: list[str] = [],
+    cache_dir: str | None = CACHE_DIR,
 ) -> pd.DataFrame:
+    # Serve from the columnar cache when this sheet of this file version has been read before
+    if cache_dir is not None:
+        return import_cached(fpath, sheet_name, header, exclude_columns, cache_dir)
+
     # Import the dataset
     data = pd.read_excel(fpath, sheet_name=sheet_name, header=header)
+    return drop_excluded(data, exclude_columns)
 
+
+def import_cached(
+    fpath: str,
+    sheet_name: str,
+    header: int = 1,
+    exclude_columns: list[str] = [],
+    cache_dir: str = CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Read a sheet through the cache: the first read parses the workbook and stores it as one
+    .npy file per column, later reads memory-map only the columns that are kept
+    """
+    entry = Path(cache_dir) / cache_key(fpath, sheet_name, header)
+    manifest = read_manifest(entry)
+    if manifest is None:
+        data = pd.read_excel(fpath, sheet_name=sheet_name, header=header)
+        write_cache(data, entry)
+        return drop_excluded(data, exclude_columns)
+
+    columns = [c["name"] for c in manifest["columns"] if c["name"] not in exclude_columns]
+    return read_cache(entry, manifest, columns)
+
+
+def drop_excluded(data: pd.DataFrame, exclude_columns: list[str]) -> pd.DataFrame:
     # Early return if no exclude columns
     if len(exclude_columns) == 0:
         return data
 
-    # Create a list of columns to keep -> Remove excluded columns
-    columns_to_keep = []
-    for col in data.columns:
-        if col not in exclude_columns:
-            columns_to_keep.append(col)
-
-    # Return a DataFrame with only the selected columns
-    return data[columns_to_keep]
+    # Return a DataFrame with only the columns that aren't excluded
+    return data[[col for col in data.columns if col not in exclude_columns]]
@@ -13,8 +13,25 @@ from src.config import (
     AGE_COL,
 )
 
+# Column dtypes that are label encoded, and the numerical ones kept as they are. Columns of
+# any other dtype are left out of the features
+CATEGORICAL_DTYPES = ["object", "category"]
+NUMERICAL_DTYPES = ["int64", "float64"]
+
 
 def preprocess_data(data: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+    Y_data, X_data = prepare_features(data)
+
+    encoded_x_data = encoding(X_data)
+
+    return Y_data, encoded_x_data
+
+
+def prepare_features(data: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+    """
+    Every step of preprocess_data before encoding. Works row by row, so it can be applied
+    to chunks of a dataset
+    """
     # Split data into features and target and drop specific columns for customer ID, target, and count
     x_target_columns = [col for col in data.columns if col not in EXCLUDE_FEATURES]
     Y_data, X_data = split_data(data, TARGET_COL, x_target_columns)
@@ -31,9 +48,7 @@ def preprocess_data(data: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
     cols_to_drop = [AGE_COL, EMPLOYMENT_COL]
     X_data = drop_columns(X_data, cols_to_drop)
 
-    encoded_x_data = encoding(X_data)
-
-    return Y_data, encoded_x_data
+    return Y_data, X_data
 
 
 def split_data(
@@ -68,7 +83,7 @@ def encoding(X_data: pd.DataFrame):
     cat_data_encoded = pd.DataFrame()
 
     for col in X_data.columns:
-        if X_data[col].dtype in ["object", "category"]:
+        if X_data[col].dtype in CATEGORICAL_DTYPES:
 
             # Initialize the LabelEncoder
             label_encoder = LabelEncoder()
@@ -84,7 +99,7 @@ def encoding(X_data: pd.DataFrame):
                 [
                     col
                     for col in X_data.columns
-                    if X_data[col].dtype in ["int64", "float64"]
+                    if X_data[col].dtype in NUMERICAL_DTYPES
                 ]
             ],
         ],
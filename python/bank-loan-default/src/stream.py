@@ -0,0 +1,169 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from src.config import TARGET_COL
+from src.preprocess import CATEGORICAL_DTYPES, NUMERICAL_DTYPES, prepare_features
+
+CHUNKSIZE = 100_000
+FEATURE_DTYPE = np.float32
+
+
+def iter_chunks(source: str | Path, chunksize: int = CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV or Parquet file as DataFrames of at most chunksize rows
+    """
+    suffix = Path(source).suffix.lower()
+    if suffix == ".csv":
+        with pd.read_csv(source, chunksize=chunksize) as reader:
+            yield from reader
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet in chunks requires pyarrow") from e
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported input format: {source}")
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    Encoded features (rows x columns, float32) and target, memory-mapped from .npy files
+    """
+
+    X: np.ndarray
+    y: np.ndarray
+    columns: list[str]
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "FeatureMatrix":
+        directory = Path(directory)
+        with open(directory / "columns.json") as f:
+            columns = json.load(f)
+        X = np.load(directory / "X.npy", mmap_mode="r")
+        y = np.load(directory / "y.npy", mmap_mode="r")
+        return cls(X=X, y=y, columns=columns)
+
+    @property
+    def x_data(self) -> pd.DataFrame:
+        # Wraps the mapped matrix without copying it
+        return pd.DataFrame(self.X.view(np.ndarray), columns=self.columns, copy=False)
+
+    @property
+    def y_data(self) -> pd.Series:
+        return pd.Series(self.y.view(np.ndarray), name=TARGET_COL, copy=False)
+
+
+@dataclass
+class StreamingPreprocessor:
+    """
+    preprocess_data for datasets that don't fit in memory. fit() reads the source once in
+    chunks to learn the feature columns, row count and label encoders; transform() reads it
+    again, applies the same binning and encoding to each chunk and writes it straight into
+    a memory-mapped feature matrix. Peak memory is bounded by chunksize, not the dataset
+    """
+
+    chunksize: int = CHUNKSIZE
+    encoders: dict[str, LabelEncoder] = field(default_factory=dict)
+    numerical_columns: list[str] = field(default_factory=list)
+    rows: int = 0
+    target_dtype: np.dtype | None = None
+
+    @property
+    def columns(self) -> list[str]:
+        # Same order as encoding(): encoded columns first, then numerical ones
+        return [*self.encoders, *self.numerical_columns]
+
+    def fit(self, source: str | Path) -> "StreamingPreprocessor":
+        order: list[str] = []
+        dtypes: dict[str, set[str]] = {}
+        classes: dict[str, set] = {}
+        target_dtypes = set()
+        rows = 0
+
+        for chunk in iter_chunks(source, self.chunksize):
+            Y_chunk, X_chunk = prepare_features(chunk)
+            rows += len(X_chunk)
+            target_dtypes.add(Y_chunk.dtype)
+            for col in X_chunk.columns:
+                if col not in dtypes:
+                    order.append(col)
+                    dtypes[col] = set()
+                dtype = X_chunk[col].dtype
+                dtypes[col].add("categorical" if dtype in CATEGORICAL_DTYPES else str(dtype))
+                if dtype in CATEGORICAL_DTYPES:
+                    classes.setdefault(col, set()).update(X_chunk[col].unique().tolist())
+
+        for col in order:
+            if "categorical" in dtypes[col] and len(dtypes[col]) > 1:
+                raise ValueError(f"Column {col} is categorical in only some chunks")
+
+        # LabelEncoder sorts its classes (missing values last), so fitting on every distinct
+        # value gives the same codes as fitting on the whole column
+        self.encoders = {
+            col: LabelEncoder().fit(np.array(list(classes[col]), dtype=object))
+            for col in order
+            if dtypes[col] == {"categorical"}
+        }
+        self.numerical_columns = [
+            col for col in order if dtypes[col] <= set(NUMERICAL_DTYPES)
+        ]
+        self.rows = rows
+        self.target_dtype = np.result_type(*target_dtypes) if target_dtypes else None
+        return self
+
+    def transform(self, source: str | Path, output_dir: str | Path) -> FeatureMatrix:
+        if self.target_dtype is None:
+            raise RuntimeError("Call fit() before transform()")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        columns = self.columns
+        X = np.lib.format.open_memmap(
+            output_dir / "X.npy", mode="w+", dtype=FEATURE_DTYPE, shape=(self.rows, len(columns))
+        )
+        y = np.lib.format.open_memmap(
+            output_dir / "y.npy", mode="w+", dtype=self.target_dtype, shape=(self.rows,)
+        )
+
+        start = 0
+        for chunk in iter_chunks(source, self.chunksize):
+            Y_chunk, X_chunk = prepare_features(chunk)
+            stop = start + len(X_chunk)
+            if stop > self.rows:
+                raise ValueError(f"{source} has more rows than when it was fitted")
+
+            block = X[start:stop]
+            for j, (col, encoder) in enumerate(self.encoders.items()):
+                block[:, j] = encoder.transform(X_chunk[col])
+            for j, col in enumerate(self.numerical_columns, start=len(self.encoders)):
+                block[:, j] = X_chunk[col].to_numpy(dtype=FEATURE_DTYPE)
+            y[start:stop] = Y_chunk.to_numpy()
+            start = stop
+
+        if start != self.rows:
+            raise ValueError(f"{source} has fewer rows than when it was fitted")
+        X.flush()
+        y.flush()
+        del X, y
+
+        with open(output_dir / "columns.json", "w") as f:
+            json.dump(columns, f)
+        return FeatureMatrix.load(output_dir)
+
+
+def preprocess_stream(
+    source: str | Path, output_dir: str | Path, chunksize: int = CHUNKSIZE
+) -> FeatureMatrix:
+    """
+    Fit on source and write its feature matrix to output_dir, in two chunked passes
+    """
+    return StreamingPreprocessor(chunksize=chunksize).fit(source).transform(source, output_dir)
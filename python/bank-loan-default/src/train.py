@@ -6,6 +6,8 @@ from sklearn.ensemble import GradientBoostingClassifier
 from numpy.typing import NDArray
 import numpy as np
 
+from src.stream import FeatureMatrix
+
 
 @dataclass
 class ModelTrainer:
@@ -18,6 +20,13 @@ class ModelTrainer:
     y_val: Optional[pd.DataFrame] = None
     model: Optional[GradientBoostingClassifier] = None
 
+    @classmethod
+    def from_features(cls, features: FeatureMatrix) -> "ModelTrainer":
+        """
+        Train on a memory-mapped feature matrix written by the streaming preprocessor
+        """
+        return cls(x_data=features.x_data, y_data=features.y_data)
+
     def split_data(self, test_size: float = 0.20, random_state: bool = True):
         self.X_train, self.X_val, self.y_train, self.y_val = train_test_split(
             self.x_data, self.y_data, test_size=test_size, random_state=random_state
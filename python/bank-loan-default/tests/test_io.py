@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.io import import_data
+
+
+@pytest.fixture
+def workbook(tmp_path, raw_bank_df: pd.DataFrame):
+    df = raw_bank_df.assign(Notes=["a", None, "c", "d", None], Rate=[0.1, np.nan, 0.3, 0.4, 0.5])
+    fpath = tmp_path / "loans.xlsx"
+    with pd.ExcelWriter(fpath) as writer:
+        df.to_excel(writer, sheet_name="Data", index=False, startrow=1)
+    return fpath
+
+
+def test_import_data_warm_cache_matches_excel(workbook, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cold = import_data(str(workbook), "Data", header=1, cache_dir=str(cache_dir))
+    expected = pd.read_excel(workbook, sheet_name="Data", header=1)
+    pd.testing.assert_frame_equal(cold, expected)
+
+    # Warm reads never parse the workbook
+    def fail(*args, **kwargs):
+        raise AssertionError("read_excel called on a warm cache")
+
+    monkeypatch.setattr(pd, "read_excel", fail)
+    warm = import_data(str(workbook), "Data", header=1, cache_dir=str(cache_dir))
+    pd.testing.assert_frame_equal(warm, expected)
+
+    # Changing the frame must not change the cache
+    warm.loc[0, "Age"] = 99
+    again = import_data(str(workbook), "Data", header=1, cache_dir=str(cache_dir))
+    assert again.loc[0, "Age"] == expected.loc[0, "Age"]
+
+
+def test_import_data_cache_keeps_mixed_object_columns(tmp_path, raw_bank_df: pd.DataFrame):
+    # Reading with the wrong header row mixes the real header's text into numeric columns
+    df = raw_bank_df.assign(Notes=[1, "b", None, 2.5, "e"])
+    fpath = tmp_path / "mixed.xlsx"
+    df.to_excel(fpath, sheet_name="Data", index=False)
+    cache_dir = str(tmp_path / "cache")
+
+    cold = import_data(str(fpath), "Data", header=None, cache_dir=cache_dir)
+    warm = import_data(str(fpath), "Data", header=None, cache_dir=cache_dir)
+    assert cold[0].tolist()[:2] == ["Customer_ID", 1]
+    pd.testing.assert_frame_equal(warm, cold)
+    pd.testing.assert_frame_equal(warm, pd.read_excel(fpath, sheet_name="Data", header=None))
+
+
+def test_import_data_cache_reads_only_kept_columns(workbook, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    exclude = ["Customer_ID", "Count", "Notes"]
+    import_data(str(workbook), "Data", header=1, exclude_columns=exclude, cache_dir=cache_dir)
+    warm = import_data(
+        str(workbook), "Data", header=1, exclude_columns=exclude, cache_dir=cache_dir
+    )
+    uncached = import_data(
+        str(workbook), "Data", header=1, exclude_columns=exclude, cache_dir=None
+    )
+
+    assert not set(exclude) & set(warm.columns)
+    pd.testing.assert_frame_equal(warm, uncached)
+
+
+def test_import_data_cache_key_follows_file_and_header(workbook, tmp_path):
+    cache_dir = tmp_path / "cache"
+    import_data(str(workbook), "Data", header=1, cache_dir=str(cache_dir))
+    import_data(str(workbook), "Data", header=0, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 2
+
+    edited = pd.read_excel(workbook, sheet_name="Data", header=1).assign(Age=30)
+    with pd.ExcelWriter(workbook) as writer:
+        edited.to_excel(writer, sheet_name="Data", index=False, startrow=1)
+    data = import_data(str(workbook), "Data", header=1, cache_dir=str(cache_dir))
+    assert (data["Age"] == 30).all()
+    assert len(list(cache_dir.iterdir())) == 3
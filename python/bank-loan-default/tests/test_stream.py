@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import PARAMETERS
+from src.preprocess import preprocess_data
+from src.stream import FeatureMatrix, StreamingPreprocessor, preprocess_stream
+from src.train import ModelTrainer
+
+
+def test_stream_matches_in_memory_preprocessing(raw_bank_df: pd.DataFrame, tmp_path):
+    source = tmp_path / "loans.csv"
+    raw_bank_df.to_csv(source, index=False)
+
+    # Chunks of 2 rows, so no chunk sees every category
+    features = preprocess_stream(source, tmp_path / "features", chunksize=2)
+    y, X = preprocess_data(pd.read_csv(source))
+
+    assert features.columns == list(X.columns)
+    assert isinstance(features.X, np.memmap)
+    np.testing.assert_array_equal(features.X, X.to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(features.y, y.to_numpy())
+
+    reloaded = FeatureMatrix.load(tmp_path / "features")
+    pd.testing.assert_frame_equal(reloaded.x_data, X.astype(np.float32))
+
+
+def test_stream_encodes_values_outside_the_bins(raw_bank_df: pd.DataFrame, tmp_path):
+    # Age 18 is below the first age bin, so its range is missing, in two different chunks
+    source = tmp_path / "loans.csv"
+    raw_bank_df.assign(Age=[18, 30, 18, 55, 76]).to_csv(source, index=False)
+
+    features = preprocess_stream(source, tmp_path / "features", chunksize=2)
+    _, X = preprocess_data(pd.read_csv(source))
+    np.testing.assert_array_equal(features.X, X.to_numpy(dtype=np.float32))
+
+
+def test_stream_features_train_model(raw_bank_df: pd.DataFrame, tmp_path):
+    source = tmp_path / "loans.csv"
+    raw_bank_df.to_csv(source, index=False)
+    features = preprocess_stream(source, tmp_path / "features", chunksize=3)
+
+    trainer = ModelTrainer.from_features(features)
+    trainer.split_data(test_size=0.4, random_state=42)
+    trainer.train(random_state=42, params=PARAMETERS)
+    assert len(trainer.predict()) == len(trainer.X_val)
+
+
+def test_stream_reads_parquet(raw_bank_df: pd.DataFrame, tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "loans.parquet"
+    raw_bank_df.to_parquet(source)
+
+    features = preprocess_stream(source, tmp_path / "features", chunksize=2)
+    _, X = preprocess_data(raw_bank_df)
+    np.testing.assert_array_equal(features.X, X.to_numpy(dtype=np.float32))
+
+
+def test_stream_transform_requires_fit(tmp_path):
+    with pytest.raises(RuntimeError):
+        StreamingPreprocessor().transform(tmp_path / "loans.csv", tmp_path / "features")
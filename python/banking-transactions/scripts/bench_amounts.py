@@ -0,0 +1,97 @@
+"""
+Amount parsing and deposit throughput: the original checks (isinstance, empty, strip(),
+isascii(), isdigit(), then int() once to validate and again to apply) against the
+single-pass, LRU-cached parse_amount, for payroll-style repeated amounts and for amounts
+that are all distinct
+
+Run from the project root:
+    python -m scripts.bench_amounts
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from account import Account, _parse_digits, parse_amount  # noqa: E402
+from errors import InvalidTransactionError  # noqa: E402
+
+OPERATIONS = 500_000
+REPEATS = 5
+
+
+def legacy_validate(amount: str) -> None:
+    """
+    Account._validate_transaction as it was before parse_amount
+    """
+    if not isinstance(amount, str):
+        raise InvalidTransactionError(amount)
+    if amount == "":
+        raise InvalidTransactionError(amount)
+    if amount.strip() != amount:
+        raise InvalidTransactionError(amount)
+    if not amount.isascii() or not amount.isdigit():
+        raise InvalidTransactionError(amount)
+    if int(amount) <= 0:
+        raise InvalidTransactionError(amount)
+
+
+def legacy_parse(amount: str) -> int:
+    legacy_validate(amount)
+    return int(amount)
+
+
+def legacy_deposit(account: Account, amount: str) -> None:
+    legacy_validate(amount)
+    account._deposit(int(amount), "Salary")
+
+
+def new_deposit(account: Account, amount: str) -> None:
+    account.deposit(amount, "Salary")
+
+
+def best_rate(fn, amounts: list[str]) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        _parse_digits.cache_clear()
+        account = Account(starting_balance="0")
+        start = time.perf_counter()
+        fn(account, amounts)
+        best = min(best, time.perf_counter() - start)
+    return len(amounts) / best
+
+
+def run() -> None:
+    rng = random.Random(7)
+    salaries = [str(rng.randrange(150_000, 900_000)) for _ in range(50)]
+    workloads = {
+        "repeated": [rng.choice(salaries) for _ in range(OPERATIONS)],
+        "distinct": [str(n) for n in rng.sample(range(1, 10**12), OPERATIONS)],
+    }
+    cases = {
+        "parse": (
+            lambda _, amounts: list(map(legacy_parse, amounts)),
+            lambda _, amounts: list(map(parse_amount, amounts)),
+        ),
+        "deposit": (
+            lambda account, amounts: [legacy_deposit(account, a) for a in amounts],
+            lambda account, amounts: [new_deposit(account, a) for a in amounts],
+        ),
+    }
+
+    print(f"{OPERATIONS:,} operations")
+    print(f"{'case':>8} | {'amounts':>8} | {'before ops/s':>12} | {'after ops/s':>12} | speedup")
+    for name, (before, after) in cases.items():
+        for workload, amounts in workloads.items():
+            before_rate = best_rate(before, amounts)
+            after_rate = best_rate(after, amounts)
+            print(
+                f"{name:>8} | {workload:>8} | {before_rate:>12,.0f} | {after_rate:>12,.0f} | "
+                f"{after_rate / before_rate:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    run()
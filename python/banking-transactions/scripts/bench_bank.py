@@ -0,0 +1,61 @@
+"""
+Transfer throughput across 1, 4 and 16 threads with lock striping (256 shards) against a
+single global lock (1 shard)
+
+Run from the project root:
+    python -m scripts.bench_bank
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bank import Bank  # noqa: E402
+from errors import InsufficientFundsError  # noqa: E402
+
+ACCOUNTS = 100_000
+TRANSFERS = 200_000
+THREADS = [1, 4, 16]
+SHARDS = [1, 256]
+
+
+def setup(shards: int) -> tuple[Bank, list[str]]:
+    bank = Bank(shards=shards)
+    ids = [bank.open_account("1000").account_id for _ in range(ACCOUNTS)]
+    return bank, ids
+
+
+def worker(bank: Bank, ids: list[str], count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    transfer = bank.transfer
+    for _ in range(count):
+        src, dst = rng.sample(ids, 2)
+        try:
+            transfer(src, dst, "10")
+        except InsufficientFundsError:
+            pass
+
+
+def run() -> None:
+    print(f"{ACCOUNTS:,} accounts, {TRANSFERS:,} transfers per run")
+    print(f"{'shards':>6} | {'threads':>7} | {'transfers/s':>12}")
+    for shards in SHARDS:
+        bank, ids = setup(shards)
+        expected = bank.total_balance()
+        for threads in THREADS:
+            per_thread = TRANSFERS // threads
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for i in range(threads):
+                    pool.submit(worker, bank, ids, per_thread, i)
+            elapsed = time.perf_counter() - start
+            assert bank.total_balance() == expected
+            print(f"{shards:>6} | {threads:>7} | {per_thread * threads / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
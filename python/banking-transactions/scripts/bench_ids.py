@@ -0,0 +1,91 @@
+"""
+Id and timestamp generation: the original uuid4() per transaction (os.urandom, 16 random
+bytes; batches translating version/variant bits into one urandom block) against the default
+IdProvider's counter-based UUIDv7 ids, on their own and inside deposit() and post_batch()
+
+Run from the project root:
+    python -m scripts.bench_ids
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from account import Account  # noqa: E402
+from ids import IdProvider  # noqa: E402
+
+OPERATIONS = 200_000
+BATCH = 10_000
+REPEATS = 5
+
+UUID_VERSION_BITS = bytes(b & 0x0F | 0x40 for b in range(256))
+UUID_VARIANT_BITS = bytes(b & 0x3F | 0x80 for b in range(256))
+
+
+class LegacyIds(IdProvider):
+    """
+    Random UUID4 ids and an unclamped wall clock, as Account used before IdProvider
+    """
+
+    def now_us(self) -> int:
+        return time.time_ns() // 1000
+
+    def new_id(self) -> bytes:
+        return uuid4().bytes
+
+    def new_ids(self, count: int) -> bytes:
+        ids = bytearray(os.urandom(16 * count))
+        ids[6::16] = ids[6::16].translate(UUID_VERSION_BITS)
+        ids[8::16] = ids[8::16].translate(UUID_VARIANT_BITS)
+        return bytes(ids)
+
+
+def best_rate(fn, count: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def cases(ids: IdProvider) -> dict:
+    batch = [("DEPOSIT", "3000", "Salary")] * BATCH
+
+    def single():
+        for _ in range(OPERATIONS):
+            ids.new_id()
+            ids.now_us()
+
+    def deposits():
+        account = Account(starting_balance="0", ids=ids)
+        for _ in range(OPERATIONS):
+            account.deposit("3000", "Salary")
+
+    def batches():
+        account = Account(starting_balance="0", ids=ids)
+        for _ in range(OPERATIONS // BATCH):
+            account.post_batch(batch)
+
+    return {"id + clock": single, "deposit": deposits, "post_batch": batches}
+
+
+def run() -> None:
+    print(f"{OPERATIONS:,} operations")
+    print(f"{'case':>10} | {'before ops/s':>12} | {'after ops/s':>12} | speedup")
+    before, after = cases(LegacyIds()), cases(IdProvider())
+    for name in before:
+        before_rate = best_rate(before[name], OPERATIONS)
+        after_rate = best_rate(after[name], OPERATIONS)
+        print(
+            f"{name:>10} | {before_rate:>12,.0f} | {after_rate:>12,.0f} | "
+            f"{after_rate / before_rate:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
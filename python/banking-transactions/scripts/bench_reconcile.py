@@ -0,0 +1,78 @@
+"""
+End-of-day reconciliation throughput: the original single-threaded job (get_statement() and
+a re-add of balances over Transaction objects for every account) against reconcile() with
+1, 2 and 4 worker processes reading ledgers from shared memory
+
+Run from the project root:
+    python -m scripts.bench_reconcile
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from account import Account  # noqa: E402
+from reconcile import reconcile  # noqa: E402
+
+ACCOUNTS = 50_000
+TRANSACTIONS = 40
+WORKERS = [1, 2, 4]
+
+
+def setup() -> list[Account]:
+    batch = [("DEPOSIT", "30", "Salary"), ("WITHDRAW", "20", "Groceries")] * (TRANSACTIONS // 2)
+    accounts = []
+    for _ in range(ACCOUNTS):
+        account = Account(starting_balance="100")
+        account.post_batch(batch)
+        accounts.append(account)
+    return accounts
+
+
+def legacy_job(accounts: list[Account]) -> int:
+    """
+    The end-of-day job before reconcile(): returns the number of inconsistent accounts
+    """
+    bad = 0
+    for account in accounts:
+        account.get_statement()
+        transactions = list(account.get_transactions())
+        if not transactions:
+            continue
+        first = transactions[0]
+        sign = 1 if first.transaction_type == "DEPOSIT" else -1
+        running = first.balance_after - sign * first.amount
+        for t in transactions:
+            running += t.amount if t.transaction_type == "DEPOSIT" else -t.amount
+            if running != t.balance_after:
+                bad += 1
+                break
+        else:
+            if running != account.balance:
+                bad += 1
+    return bad
+
+
+def run() -> None:
+    accounts = setup()
+    rows = ACCOUNTS * TRANSACTIONS
+    print(f"{ACCOUNTS:,} accounts x {TRANSACTIONS} transactions, {os.cpu_count()} CPUs")
+    print(f"{'version':>14} | {'seconds':>8} | {'rows/s':>12}")
+
+    start = time.perf_counter()
+    legacy_job(accounts)
+    elapsed = time.perf_counter() - start
+    print(f"{'legacy':>14} | {elapsed:>8.2f} | {rows / elapsed:>12,.0f}")
+
+    for workers in WORKERS:
+        report = reconcile(accounts, workers=workers)
+        assert report.ok
+        name = f"{workers} worker{'s' if workers > 1 else ''}"
+        print(f"{name:>14} | {report.seconds:>8.2f} | {rows / report.seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,74 @@
+"""
+Time and peak memory of a full statement for a large account: the original get_statement,
+which builds a string of str(Transaction) for every transaction, against write_statement
+streaming text, CSV and JSON Lines to a file in 64 KiB chunks
+
+Run from the project root:
+    python -m scripts.bench_statement
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from account import Account  # noqa: E402
+
+TRANSACTIONS = 1_000_000
+BATCH = 10_000
+
+
+def setup() -> Account:
+    account = Account(starting_balance="1000")
+    batch = [("DEPOSIT", "3", "Salary"), ("WITHDRAW", "2", "Groceries")] * (BATCH // 2)
+    for _ in range(TRANSACTIONS // BATCH):
+        account.post_batch(batch)
+    return account
+
+
+def legacy_statement(account: Account) -> str:
+    """
+    get_statement as it was before statements were streamed
+    """
+    lines = "\n".join([f"{t}" for t in account.get_transactions()])
+    return f"Account: {account.account_id}\nBalance: {account.balance}\nTransactions:\n{lines}"
+
+
+def measure(fn) -> tuple[float, int]:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run() -> None:
+    account = setup()
+    print(f"{TRANSACTIONS:,} transactions")
+    print(f"{'version':>16} | {'seconds':>8} | {'rows/s':>10} | {'peak MiB':>9}")
+
+    def streamed(format):
+        def write():
+            with open(os.devnull, "w") as f:
+                account.write_statement(f, format=format)
+
+        return write
+
+    cases = [("get_statement", lambda: legacy_statement(account))]
+    cases += [(f"stream {fmt}", streamed(fmt)) for fmt in ("text", "csv", "jsonl")]
+    for name, fn in cases:
+        elapsed, peak = measure(fn)
+        print(
+            f"{name:>16} | {elapsed:>8.2f} | {TRANSACTIONS / elapsed:>10,.0f} | "
+            f"{peak / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run()
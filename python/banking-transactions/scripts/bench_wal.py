@@ -0,0 +1,75 @@
+"""
+Durable deposit throughput for each WAL sync mode: fsync per transaction, group commit with
+a 1 ms and a 10 ms latency budget, and no fsync for reference. Group commit pays off when
+many threads commit at once, so each mode runs with 1 and 16 threads
+
+Run from the project root:
+    python -m scripts.bench_wal
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from storage import Storage  # noqa: E402
+
+DURATION = 2.0
+THREADS = [1, 16]
+MODES = [
+    ("fsync per txn", "always", 0.0),
+    ("group 1 ms", "group", 1.0),
+    ("group 10 ms", "group", 10.0),
+    ("no fsync", "none", 0.0),
+]
+
+
+def worker(bank, account_id: str, deadline: float) -> list[float]:
+    latencies = []
+    deposit = bank.deposit
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            return latencies
+        deposit(account_id, "1")
+        latencies.append(time.perf_counter() - start)
+
+
+def run() -> None:
+    print(
+        f"{'mode':>14} | {'threads':>7} | {'txn/s':>10} | {'p50 ms':>7} | "
+        f"{'p99 ms':>7} | fsyncs"
+    )
+    for label, sync, group_ms in MODES:
+        for threads in THREADS:
+            with tempfile.TemporaryDirectory() as directory:
+                storage = Storage(
+                    directory, sync=sync, group_commit_ms=group_ms, checkpoint_every=0
+                )
+                bank = storage.open()
+                ids = [bank.open_account("0").account_id for _ in range(threads)]
+                fsyncs = storage.wal.fsyncs
+
+                deadline = time.perf_counter() + DURATION
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    futures = [pool.submit(worker, bank, i, deadline) for i in ids]
+                    latencies = [lat for f in futures for lat in f.result()]
+                elapsed = time.perf_counter() - start
+                fsyncs = storage.wal.fsyncs - fsyncs
+                storage.close()
+
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+            print(
+                f"{label:>14} | {threads:>7} | {len(latencies) / elapsed:>10,.0f} | "
+                f"{statistics.median(latencies) * 1000:>7.3f} | {p99 * 1000:>7.3f} | {fsyncs}"
+            )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,23 +1,89 @@
+from array import array
+from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate, chain
+from operator import itemgetter, mul
+from typing import Iterable, Iterator, TextIO
 from uuid import uuid4
-from datetime import datetime, timezone
 
 from errors import InsufficientFundsError, InvalidTransactionError
+from ids import DEFAULT_IDS, IdProvider
+from ledger import (
+    TYPE_CODES,
+    Ledger,
+    LedgerView,
+    TransactionPage,
+    to_micros,
+)
+from statement import (
+    CHUNK_SIZE,
+    CSV_HEADER,
+    StatementFormat,
+    statement_lines,
+    write_chunks,
+)
 from transaction import Transaction
 
+# (transaction type, amount, description) with the description optional
+BatchOp = tuple[str, str] | tuple[str, str, str]
+
+SIGNS = {"DEPOSIT": 1, "WITHDRAW": -1}
+
+# Distinct amount strings remembered by parse_amount
+AMOUNT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=AMOUNT_CACHE_SIZE)
+def _parse_digits(amount: str) -> int:
+    # ASCII-only digits rules out empty strings, whitespace, signs and Unicode digits in one
+    # check, and guarantees int() accepts what's left
+    if not (amount.isascii() and amount.isdigit()):
+        raise InvalidTransactionError(amount)
+    return int(amount)
+
+
+def parse_amount(amount: str, minimum: int = 1) -> int:
+    """
+    Validate an amount string and return its integer value in one pass, raising
+    InvalidTransactionError unless it is ASCII digits only and at least minimum. Repeated
+    strings (the same salary on every payroll line) are served from an LRU cache
+    """
+    if not isinstance(amount, str):
+        raise InvalidTransactionError(amount)
+    value = _parse_digits(amount)
+    if value < minimum:
+        raise InvalidTransactionError(amount)
+    return value
+
 
 class Account:
 
-    def __init__(self, *, starting_balance: str = "0"):
+    def __init__(self, *, starting_balance: str = "0", ids: IdProvider | None = None):
 
-        # Perform checks on starting balance
-        self._validate_starting_amount(starting_balance)
+        # Validate and parse the starting balance (0 is allowed)
+        balance = parse_amount(starting_balance, minimum=0)
 
         # Init starting balance and account id
         self.account_id = str(uuid4())
-        self._balance = int(starting_balance)
+        self._balance = balance
+
+        # Transaction ids and timestamps
+        self._ids = ids if ids is not None else DEFAULT_IDS
+
+        # Init empty columnar transaction history
+        self._ledger = Ledger(self.account_id)
 
-        # Init empty list for transaction history
-        self._transaction_history: list[Transaction] = []
+    @classmethod
+    def restore(cls, account_id: str, balance: int, ledger: Ledger | None = None) -> "Account":
+        """
+        Rebuild an account from persisted state, skipping validation
+        """
+        account = cls.__new__(cls)
+        account.account_id = account_id
+        account._balance = balance
+        account._ledger = ledger if ledger is not None else Ledger(account_id)
+        account._ids = DEFAULT_IDS
+        return account
 
     @property
     def balance(self) -> int:
@@ -27,39 +93,38 @@ class Account:
         """
         Deposit funds into the account. Checks amount if is valid before updating the account balance and updating the transaction history with a Transaction object
         """
-        # Perform checks on amount
-        self._validate_transaction(amount)
+        return self._deposit(parse_amount(amount), description)
 
+    def _deposit(self, deposit_amount: int, description: str) -> Transaction:
+        """
+        Trusted path for deposit(): deposit_amount is an already validated positive int
+        """
         # Calculate new balance
-        deposit_amount = int(amount)
         self._balance += deposit_amount
 
-        # Init a transaction object
-        transaction = Transaction(
-            str(uuid4()),
-            self.account_id,
-            datetime.now(timezone.utc),
+        # Append the transaction to the history
+        index = self._ledger.append(
+            self._ids.new_id(),
+            self._now_us(),
             "DEPOSIT",
             deposit_amount,
             self._balance,
             description,
         )
 
-        # Append the transaction history with the transaction
-        self._transaction_history.append(transaction)
-
-        return transaction
+        return self._ledger.transaction(index)
 
     def withdraw(self, amount: str, description: str = "") -> Transaction:
         """
         Withdraw funds from account. Checks amount if is valid and whether the remaining balance is valid before updating the account balance and updating the transaction history.
         """
+        return self._withdraw(parse_amount(amount), description)
 
-        # Check is amount valid
-        self._validate_transaction(amount)
-
+    def _withdraw(self, withdraw_amount: int, description: str) -> Transaction:
+        """
+        Trusted path for withdraw(): withdraw_amount is an already validated positive int
+        """
         # Calculate new balance
-        withdraw_amount = int(amount)
         new_balance = self._balance - withdraw_amount
 
         # Check if the new balance is valid
@@ -69,73 +134,190 @@ class Account:
         # Push the new balance to the account
         self._balance = new_balance
 
-        # Init a transaction object
-        transaction = Transaction(
-            str(uuid4()),
-            self.account_id,
-            datetime.now(timezone.utc),
+        # Append the transaction to the history
+        index = self._ledger.append(
+            self._ids.new_id(),
+            self._now_us(),
             "WITHDRAW",
             withdraw_amount,
             new_balance,
             description,
         )
 
-        # Append the transaction history with the transaction
-        self._transaction_history.append(transaction)
-
-        return transaction
+        return self._ledger.transaction(index)
 
-    def get_transactions(self) -> tuple[Transaction]:
+    def post_batch(self, ops: Iterable[BatchOp]) -> LedgerView:
         """
-        Returns a copy of the transaction history
+        Post many deposits and withdrawals at once. The whole batch is validated before
+        anything is applied: an invalid entry raises InvalidTransactionError and an overdraft
+        at any point in the running balance raises InsufficientFundsError, leaving the account
+        untouched. All entries share one timestamp. Returns a view of the posted transactions
         """
-        return tuple(self._transaction_history)
-
-    def get_statement(self) -> str:
-        lines = "\n".join([f"{t}" for t in self._transaction_history])
-        return f"Account: {self.account_id}\nBalance: {self._balance}\nTransactions:\n{lines}"
+        entries = ops if isinstance(ops, (list, tuple)) else list(ops)
+        if not entries:
+            return self._ledger.view(len(self._ledger))
+
+        # Every entry is (type, amount) or (type, amount, description)
+        lengths = set(map(len, entries))
+        if not lengths <= {2, 3}:
+            raise InvalidTransactionError(next(op for op in entries if len(op) not in (2, 3)))
+
+        # Transpose into columns, defaulting missing descriptions to ""
+        if lengths != {3}:
+            entries = [op if len(op) == 3 else (*op, "") for op in entries]
+        types = list(map(itemgetter(0), entries))
+        amounts = list(map(itemgetter(1), entries))
+        descriptions = list(map(itemgetter(2), entries))
+
+        # Types must all be known
+        try:
+            codes = array("b", map(TYPE_CODES.__getitem__, types))
+            signs = map(SIGNS.__getitem__, types)
+        except KeyError as e:
+            raise InvalidTransactionError(e.args[0]) from None
+
+        # Every amount passes the same rules as deposit(), checked together
+        values = self._parse_batch_amounts(amounts)
+
+        # Running balance with withdrawals negated, checked for the first overdraft
+        balances = array("q", accumulate(map(mul, values, signs), initial=self._balance))
+        del balances[0]
+        if min(balances) < 0:
+            raise InsufficientFundsError(next(b for b in balances if b < 0))
+
+        first = self._ledger.extend(
+            self._ids.new_ids(len(entries)),
+            self._now_us(),
+            codes,
+            array("q", values),
+            balances,
+            descriptions,
+        )
+        self._balance = balances[-1]
+        return self._ledger.view(first)
 
-    def _validate_transaction(self, amount: str) -> None:
+    def _parse_batch_amounts(self, amounts: list[str]) -> list[int]:
         """
-        Validate the transaction amount
+        Validate and convert a batch of amount strings in one pass over the joined text,
+        falling back to per-amount checks to report the first bad one
         """
-        self._validate_amount(amount)
+        try:
+            joined = "".join(amounts)
+        except TypeError:
+            joined = None
 
-        # Positive only and not 0
-        if int(amount) <= 0:
-            raise InvalidTransactionError(amount)
+        if joined is not None and all(amounts) and joined.isascii() and joined.isdigit():
+            values = list(map(int, amounts))
+            if min(values) > 0:
+                return values
 
-    def _validate_starting_amount(self, amount: str) -> None:
+        return list(map(parse_amount, amounts))
+
+    def get_transactions(self) -> LedgerView:
         """
-        Validate the starting amount
+        Returns a read-only view of the transaction history as it is now. Nothing is copied,
+        Transaction objects are built as they are read
         """
-
-        self._validate_amount(amount)
-
-        # Positive or 0 only
-        if int(amount) < 0:
-            raise InvalidTransactionError(amount)
-
-    @staticmethod
-    def _validate_amount(amount: str) -> None:
+        return self._ledger.view()
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        transaction_type: str | None = None,
+        limit: int | None = None,
+        cursor: int | None = None,
+    ) -> TransactionPage:
         """
-        Validate amount is a string, not empty, no whitespace, is a string digit, and is not non-ASCII digits
+        Transactions with start <= timestamp < end (timezone-aware, either bound optional),
+        optionally of one type, oldest first. With a limit, results come in pages: pass the
+        returned next_cursor back in with the same filters to get the next one. Costs
+        O(log n + k) for k results
         """
-        # Must be a string
-        if not isinstance(amount, str):
-            raise InvalidTransactionError(amount)
-
-        # Reject empty
-        if amount == "":
-            raise InvalidTransactionError(amount)
+        type_code = None
+        if transaction_type is not None:
+            if transaction_type not in TYPE_CODES:
+                raise InvalidTransactionError(transaction_type)
+            type_code = TYPE_CODES[transaction_type]
+
+        rows = self._ledger.find(
+            None if start is None else to_micros(start),
+            None if end is None else to_micros(end),
+            type_code,
+            cursor or 0,
+            # One row past the page tells whether there is a next one
+            None if limit is None else limit + 1,
+        )
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            next_cursor = rows[limit]
+            rows = rows[:limit]
+        return TransactionPage(LedgerView(self._ledger, rows), next_cursor)
 
-        # Reject any whitespace
-        if amount.strip() != amount:
-            raise InvalidTransactionError(amount)
+    def get_statement(self) -> str:
+        lines = "".join(statement_lines(self._ledger, range(len(self._ledger))))
+        return (
+            f"Account: {self.account_id}\nBalance: {self._balance}\nTransactions:\n"
+            f"{lines[:-1]}"
+        )
 
-        # Reject non-ASCII digits or is not a digit
-        if not amount.isascii() or not amount.isdigit():
-            raise InvalidTransactionError(amount)
+    def iter_statement(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        transaction_type: str | None = None,
+        limit: int | None = None,
+        cursor: int | None = None,
+        format: StatementFormat = "text",
+    ) -> Iterator[str]:
+        """
+        Yields the statement line by line for the transactions query() selects with the same
+        arguments: a header (none for "jsonl") and then one line per transaction
+        """
+        page = self.query(start, end, transaction_type, limit, cursor)
+        yield from self._statement_header(format)
+        yield from statement_lines(self._ledger, page.transactions.rows, format)
+
+    def write_statement(
+        self,
+        file: TextIO,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        transaction_type: str | None = None,
+        limit: int | None = None,
+        cursor: int | None = None,
+        format: StatementFormat = "text",
+        chunk_size: int = CHUNK_SIZE,
+    ) -> int | None:
+        """
+        Write the statement to a text file object in chunks of about chunk_size characters,
+        in constant memory however long the history. Takes the same selection as query()
+        and returns the cursor of the next page (None if this was the last)
+        """
+        page = self.query(start, end, transaction_type, limit, cursor)
+        lines = statement_lines(self._ledger, page.transactions.rows, format)
+        write_chunks(file, chain(self._statement_header(format), lines), chunk_size)
+        return page.next_cursor
+
+    def _statement_header(self, format: StatementFormat) -> list[str]:
+        if format == "text":
+            return [
+                f"Account: {self.account_id}\n",
+                f"Balance: {self._balance}\n",
+                "Transactions:\n",
+            ]
+        if format == "csv":
+            return [CSV_HEADER]
+        return []
+
+    def _now_us(self) -> int:
+        """
+        Current time in epoch microseconds, never earlier than the last transaction so the
+        history stays in timestamp order even if a provider's clock steps back
+        """
+        now = self._ids.now_us()
+        timestamps = self._ledger.timestamps
+        return max(now, timestamps[-1]) if timestamps else now
 
 
 if __name__ == "__main__":
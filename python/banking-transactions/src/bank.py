@@ -0,0 +1,171 @@
+import threading
+from typing import TYPE_CHECKING
+
+from account import Account, parse_amount
+from errors import AccountNotFoundError, InvalidTransactionError
+from transaction import Transaction
+from wal import encode_open, encode_rows
+
+if TYPE_CHECKING:
+    from storage import Storage
+
+
+class Bank:
+    """
+    Registry of accounts keyed by account_id with thread-safe deposits, withdrawals and
+    atomic transfers.
+
+    Accounts are split across shards, each with its own dict and lock (lock striping), so
+    operations on accounts in different shards never wait on each other. A transfer locks
+    both shards in ascending shard order, which keeps concurrent transfers deadlock-free.
+    Operations called on an Account directly bypass these locks (and storage).
+
+    With storage attached (see Storage.open) every operation is written to the WAL as one
+    frame while its shard locks are held, and only returns once the frame is committed
+    """
+
+    def __init__(self, shards: int = 256):
+        if shards < 1:
+            raise ValueError("A bank needs at least one shard")
+        self._shards: list[dict[str, Account]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.storage: "Storage | None" = None
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, account_id: str) -> bool:
+        return account_id in self._shards[self._shard(account_id)]
+
+    def _shard(self, account_id: str) -> int:
+        return hash(account_id) % len(self._shards)
+
+    def open_account(self, starting_balance: str = "0") -> Account:
+        """
+        Create and register a new account
+        """
+        account = Account(starting_balance=starting_balance)
+        self.add_account(account)
+        return account
+
+    def add_account(self, account: Account) -> None:
+        """
+        Register an account. With storage attached only its id and current balance are
+        logged; earlier history is persisted by the next checkpoint
+        """
+        index = self._shard(account.account_id)
+        with self._locks[index]:
+            self._shards[index][account.account_id] = account
+            lsn = self._log(encode_open(account.account_id, account.balance))
+        self._commit(lsn)
+
+    def _register(self, account: Account) -> None:
+        # Used by recovery: no locking or logging
+        self._shards[self._shard(account.account_id)][account.account_id] = account
+
+    def get_account(self, account_id: str) -> Account:
+        try:
+            return self._shards[self._shard(account_id)][account_id]
+        except KeyError:
+            raise AccountNotFoundError(account_id) from None
+
+    def deposit(self, account_id: str, amount: str, description: str = "") -> Transaction:
+        account = self.get_account(account_id)
+        with self._locks[self._shard(account_id)]:
+            transaction = account.deposit(amount, description)
+            lsn = self._log_last(account)
+        self._commit(lsn)
+        return transaction
+
+    def withdraw(self, account_id: str, amount: str, description: str = "") -> Transaction:
+        account = self.get_account(account_id)
+        with self._locks[self._shard(account_id)]:
+            transaction = account.withdraw(amount, description)
+            lsn = self._log_last(account)
+        self._commit(lsn)
+        return transaction
+
+    def transfer(
+        self, src_id: str, dst_id: str, amount: str, description: str = ""
+    ) -> tuple[Transaction, Transaction]:
+        """
+        Move amount from src to dst atomically. Either both the withdrawal and the deposit
+        are recorded or neither is (InsufficientFundsError leaves both accounts untouched)
+        """
+        if src_id == dst_id:
+            raise InvalidTransactionError(amount)
+        src, dst = self.get_account(src_id), self.get_account(dst_id)
+
+        # Parse once up front so the deposit can't fail once the withdrawal has gone through
+        value = parse_amount(amount)
+
+        first, second = sorted((self._shard(src_id), self._shard(dst_id)))
+        with self._locks[first]:
+            if second != first:
+                self._locks[second].acquire()
+            try:
+                withdrawal = src._withdraw(value, description or f"Transfer to {dst_id}")
+                deposit = dst._deposit(value, description or f"Transfer from {src_id}")
+                # Both sides go in one frame so recovery never sees half a transfer
+                lsn = self._log_last(src, dst)
+            finally:
+                if second != first:
+                    self._locks[second].release()
+        self._commit(lsn)
+        return withdrawal, deposit
+
+    def total_balance(self) -> int:
+        """
+        Sum of all balances, taken with every shard locked so no transfer is half counted
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return sum(a.balance for shard in self._shards for a in shard.values())
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def checkpoint(self) -> bool:
+        """
+        Snapshot every account to storage so recovery only replays the WAL after this point.
+        The shards are only locked while balances and ledger lengths are captured and the WAL
+        starts a new segment; the snapshot itself is written afterwards
+        """
+        if self.storage is None:
+            raise RuntimeError("Bank has no storage attached")
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            accounts = [
+                (a, a.balance, len(a._ledger))
+                for shard in self._shards
+                for a in shard.values()
+            ]
+            # Frames up to here go in the old segment, which the snapshot then makes redundant
+            offset = self.storage.wal.rotate()
+        finally:
+            for lock in self._locks:
+                lock.release()
+        return self.storage.checkpoint(accounts, offset)
+
+    # ─── Persistence ──────────────────────────────────────────────────────────
+
+    def _log(self, payload: bytes) -> int:
+        if self.storage is None:
+            return 0
+        return self.storage.log(payload)
+
+    def _log_last(self, *accounts: Account) -> int:
+        # Each account's newest ledger row, as one frame
+        if self.storage is None:
+            return 0
+        rows = [encode_rows(a._ledger, len(a._ledger) - 1, len(a._ledger)) for a in accounts]
+        return self.storage.log(b"".join(rows))
+
+    def _commit(self, lsn: int) -> None:
+        if self.storage is None:
+            return
+        self.storage.commit(lsn)
+        if self.storage.checkpoint_due:
+            self.checkpoint()
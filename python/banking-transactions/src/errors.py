@@ -18,3 +18,13 @@ class InsufficientFundsError(Exception):
     def __init__(self, balance: int):
         self.message = f"Insufficient funds available: {balance}"
         super().__init__(self.message)
+
+
+class AccountNotFoundError(Exception):
+    """
+    Exception raised when an account id is not registered with the bank
+    """
+
+    def __init__(self, account_id: str):
+        self.message = f"Account not found: {account_id}"
+        super().__init__(self.message)
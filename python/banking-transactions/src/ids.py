@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+# UUIDv7 layout: 48-bit Unix milliseconds, 4-bit version, 12 bits, 2-bit variant, 62 bits.
+# The 74 bits after the timestamp hold a per-process counter, so ids sort by time and then
+# by creation order
+COUNTER_BITS = 74
+LOW_BITS = 62
+LOW_MASK = (1 << LOW_BITS) - 1
+VERSION_7 = 0x7 << 76
+VARIANT = 0b10 << 62
+
+
+class IdProvider:
+    """
+    Source of transaction ids and timestamps for an Account.
+
+    The default issues time-ordered UUIDv7 ids from a per-process counter (seeded randomly so
+    separate processes don't collide) and reads the wall clock as integer epoch microseconds,
+    never going backwards. No os.urandom call or string formatting per id: ids stay raw bytes
+    until a Transaction is read.
+
+    Subclass and override now_us/new_ids (e.g. with a fixed clock for tests) and pass the
+    instance to Account(ids=...)
+    """
+
+    def __init__(self):
+        # Reentrant: new_ids reads the clock through now_us (which subclasses may override)
+        # while holding it
+        self._lock = threading.RLock()
+        self._counter = int.from_bytes(os.urandom(8), "big")
+        self._last_us = 0
+
+    def now_us(self) -> int:
+        """
+        Current time in epoch microseconds, monotonic across the process
+        """
+        now = time.time_ns() // 1000
+        with self._lock:
+            if now > self._last_us:
+                self._last_us = now
+            return self._last_us
+
+    def new_id(self) -> bytes:
+        """
+        One 16-byte id
+        """
+        return self.new_ids(1)
+
+    def new_ids(self, count: int) -> bytes:
+        """
+        count 16-byte ids, concatenated, in ascending order
+        """
+        with self._lock:
+            first = self._counter
+            self._counter += count
+            millis = self.now_us() // 1000
+        prefix = millis << 80 | VERSION_7 | VARIANT
+        if count == 1:
+            return (prefix | (first >> LOW_BITS) << 64 | first & LOW_MASK).to_bytes(16, "big")
+        return b"".join(
+            (prefix | (c >> LOW_BITS) << 64 | c & LOW_MASK).to_bytes(16, "big")
+            for c in range(first, first + count)
+        )
+
+
+# Shared by every Account that isn't given its own
+DEFAULT_IDS = IdProvider()
@@ -0,0 +1,278 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import compress, repeat
+from operator import eq
+from typing import Iterator, overload
+from uuid import UUID
+
+from transaction import Transaction
+
+# Transaction types are stored as one-byte codes
+TRANSACTION_TYPES = ("DEPOSIT", "WITHDRAW")
+TYPE_CODES = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ID_SIZE = 16
+
+
+def to_micros(timestamp: datetime) -> int:
+    """
+    Convert an aware datetime to integer microseconds since the Unix epoch
+    """
+    delta = timestamp - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(micros: int) -> datetime:
+    """
+    Convert integer microseconds since the Unix epoch back to a UTC datetime
+    """
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class Ledger:
+    """
+    Append-only columnar store for one account's transactions. Each column is a typed array,
+    so a transaction costs around 45 bytes instead of a Transaction object with a uuid string,
+    a datetime and a description string. Transaction objects are only built when read
+    """
+
+    def __init__(self, account_id: str):
+        self.account_id = account_id
+
+        # One entry per transaction in every column
+        self.ids = bytearray()  # 16 raw UUID bytes per transaction
+        self.timestamps = array("q")  # microseconds since the Unix epoch (UTC)
+        self.types = array("b")  # index into TRANSACTION_TYPES
+        self.amounts = array("q")
+        self.balances = array("q")
+        self.descriptions = array("I")  # index into the description table
+
+        # Descriptions repeat a lot ("Salary", "Rent", ""), so each distinct one is kept once
+        self._description_table: list[str] = []
+        self._description_codes: dict[str, int] = {}
+
+        # Row numbers of each transaction type, in order. Built lazily by queries so appends
+        # stay cheap; _indexed is how many rows they cover
+        self._type_rows = [array("q") for _ in TRANSACTION_TYPES]
+        self._indexed = 0
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @property
+    def description_table(self) -> list[str]:
+        """
+        Distinct descriptions in code order. Read-only
+        """
+        return self._description_table
+
+    def load_description_table(self, table: list[str]) -> None:
+        """
+        Replace the description table, for restoring persisted columns
+        """
+        self._description_table = list(table)
+        self._description_codes = {d: i for i, d in enumerate(self._description_table)}
+
+    def _description_code(self, description: str) -> int:
+        code = self._description_codes.get(description)
+        if code is None:
+            code = len(self._description_table)
+            self._description_table.append(description)
+            self._description_codes[description] = code
+        return code
+
+    def append(
+        self,
+        transaction_id: bytes,
+        timestamp_us: int,
+        transaction_type: str,
+        amount: int,
+        balance_after: int,
+        description: str,
+    ) -> int:
+        """
+        Append one transaction and return its index
+        """
+        if len(transaction_id) != ID_SIZE:
+            raise ValueError(f"Transaction id must be {ID_SIZE} bytes")
+
+        self.ids += transaction_id
+        self.timestamps.append(timestamp_us)
+        self.types.append(TYPE_CODES[transaction_type])
+        self.amounts.append(amount)
+        self.balances.append(balance_after)
+        self.descriptions.append(self._description_code(description))
+        return len(self.amounts) - 1
+
+    def extend(
+        self,
+        transaction_ids: bytes,
+        timestamp_us: int,
+        type_codes: array,
+        amounts: array,
+        balances: array,
+        descriptions: Sequence[str],
+    ) -> int:
+        """
+        Append a batch of already validated transactions sharing one timestamp. Returns the
+        index of the first one
+        """
+        count = len(amounts)
+        if not (
+            len(transaction_ids) == count * ID_SIZE
+            and len(type_codes) == len(balances) == len(descriptions) == count
+        ):
+            raise ValueError("Batch columns must all have one entry per transaction")
+
+        first = len(self.amounts)
+        self.ids += transaction_ids
+        self.timestamps.extend(array("q", [timestamp_us]) * count)
+        self.types.extend(type_codes)
+        self.amounts.extend(amounts)
+        self.balances.extend(balances)
+        for description in set(descriptions):
+            self._description_code(description)
+        self.descriptions.extend(
+            array("I", map(self._description_codes.__getitem__, descriptions))
+        )
+        return first
+
+    def transaction(self, index: int) -> Transaction:
+        """
+        Build the Transaction object for the row at index
+        """
+        start = index * ID_SIZE
+        return Transaction(
+            str(UUID(bytes=bytes(self.ids[start : start + ID_SIZE]))),
+            self.account_id,
+            from_micros(self.timestamps[index]),
+            TRANSACTION_TYPES[self.types[index]],
+            self.amounts[index],
+            self.balances[index],
+            self._description_table[self.descriptions[index]],
+        )
+
+    def view(self, start: int = 0, stop: int | None = None) -> "LedgerView":
+        """
+        Read-only sequence over rows start..stop, fixed at the ledger's current length
+        """
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        return LedgerView(self, range(start, max(start, stop)))
+
+    def _index_types(self) -> None:
+        # Bring the per-type row lists up to date with rows appended since the last query
+        length, indexed = len(self.types), self._indexed
+        if indexed == length:
+            return
+        new_types = self.types[indexed:length]
+        for code, rows in enumerate(self._type_rows):
+            rows.extend(compress(range(indexed, length), map(eq, new_types, repeat(code))))
+        self._indexed = length
+
+    def find(
+        self,
+        start_us: int | None = None,
+        end_us: int | None = None,
+        type_code: int | None = None,
+        after_row: int = 0,
+        limit: int | None = None,
+    ) -> range | array:
+        """
+        Row numbers with start_us <= timestamp < end_us (either bound optional), optionally of
+        one type, from after_row on, and at most limit of them. Rows are in timestamp order,
+        so this is two binary searches plus the cost of copying the returned type rows:
+        O(log n + k)
+        """
+        length = len(self)
+        timestamps = self.timestamps
+        lo = 0 if start_us is None else bisect_left(timestamps, start_us, 0, length)
+        hi = length if end_us is None else bisect_left(timestamps, end_us, lo, length)
+        lo = max(lo, after_row)
+        if type_code is None:
+            hi = max(lo, hi)
+            return range(lo, hi if limit is None else min(hi, lo + limit))
+
+        self._index_types()
+        rows = self._type_rows[type_code]
+        i, j = bisect_left(rows, lo), bisect_left(rows, hi)
+        return rows[i : j if limit is None else min(j, i + limit)]
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the columns (excluding the description table)
+        """
+        return len(self.ids) + sum(
+            column.itemsize * len(column)
+            for column in (
+                self.timestamps,
+                self.types,
+                self.amounts,
+                self.balances,
+                self.descriptions,
+            )
+        )
+
+
+class LedgerView(Sequence):
+    """
+    Zero-copy, read-only sequence of Transactions over rows of a Ledger: a range of rows, or
+    the row numbers matched by a query. The rows are fixed when the view is created, so later
+    appends don't change it, and rows are only turned into Transaction objects when indexed
+    or iterated
+    """
+
+    __slots__ = ("_ledger", "_rows")
+
+    def __init__(self, ledger: Ledger, rows: range | array):
+        self._ledger = ledger
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def rows(self) -> range | array:
+        """
+        Ledger row numbers in this view, for reading the columns directly
+        """
+        return self._rows
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LedgerView": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LedgerView(self._ledger, self._rows[index])
+        try:
+            row = self._rows[index]
+        except IndexError:
+            raise IndexError("transaction index out of range") from None
+        return self._ledger.transaction(row)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return map(self._ledger.transaction, self._rows)
+
+    def __reversed__(self) -> Iterator[Transaction]:
+        return map(self._ledger.transaction, reversed(self._rows))
+
+    def __repr__(self) -> str:
+        return f"LedgerView({self._ledger.account_id!r}, {len(self)} transactions)"
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionPage:
+    """
+    One page of query results. Pass next_cursor back to the same query for the next page;
+    it is None on the last page
+    """
+
+    transactions: LedgerView
+    next_cursor: int | None
@@ -0,0 +1,260 @@
+"""
+End-of-day reconciliation: check that every account's balance_after chain follows from its
+amounts and ends at its balance, across a process pool.
+
+Run against a storage directory:
+    python src/reconcile.py data/ --workers 8
+"""
+
+import argparse
+import os
+import time
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain, compress, count, repeat
+from multiprocessing import shared_memory
+from operator import eq, lt, mul, ne, sub
+from typing import Iterable, Literal
+
+from account import Account
+from storage import Storage
+
+DiscrepancyKind = Literal["chain", "balance", "opening", "negative", "type"]
+
+# Sign of each type code's amount; anything else is an unknown type
+SIGN_OF = {0: 1, 1: -1}
+
+# Work is cut into about this many tasks per worker, on account boundaries, so one slow
+# task doesn't leave the other workers idle at the end
+TASKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Discrepancy:
+    """
+    One inconsistency. row is the ledger row it was found at (None for the account's final
+    balance); expected and actual are balances, except for "type" where actual is the
+    unknown type code and expected is None
+    """
+
+    account_id: str
+    kind: DiscrepancyKind
+    row: int | None
+    expected: int | None
+    actual: int
+
+
+@dataclass(slots=True)
+class ReconciliationReport:
+    accounts: int = 0
+    transactions: int = 0
+    seconds: float = 0.0
+    discrepancies: list[Discrepancy] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.discrepancies
+
+    def summary(self) -> str:
+        kinds = Counter(d.kind for d in self.discrepancies)
+        by_kind = ", ".join(f"{kind}={n}" for kind, n in sorted(kinds.items()))
+        return (
+            f"Accounts: {self.accounts}\n"
+            f"Transactions: {self.transactions}\n"
+            f"Discrepancies: {len(self.discrepancies)}{f' ({by_kind})' if by_kind else ''}\n"
+            f"Accounts with discrepancies: {len({d.account_id for d in self.discrepancies})}\n"
+            f"Seconds: {self.seconds:.2f}"
+        )
+
+
+class _Layout:
+    """
+    Byte offsets of the columns packed into one shared memory block: row offsets per account
+    (accounts + 1), expected balances, then amounts, balances and type codes per row
+    """
+
+    def __init__(self, accounts: int, rows: int):
+        self.accounts, self.rows = accounts, rows
+        self.offsets = 0
+        self.expected = self.offsets + 8 * (accounts + 1)
+        self.amounts = self.expected + 8 * accounts
+        self.balances = self.amounts + 8 * rows
+        self.types = self.balances + 8 * rows
+        self.size = max(1, self.types + rows)
+
+    def views(self, buf: memoryview) -> tuple[memoryview, ...]:
+        return (
+            buf[self.offsets : self.expected].cast("q"),
+            buf[self.expected : self.amounts].cast("q"),
+            buf[self.amounts : self.balances].cast("q"),
+            buf[self.balances : self.types].cast("q"),
+            buf[self.types : self.types + self.rows].cast("b"),
+        )
+
+
+def _pack(accounts: list[Account]) -> tuple[shared_memory.SharedMemory, _Layout]:
+    # Column memory is copied straight into the block: no per-transaction objects
+    lengths = [len(a._ledger) for a in accounts]
+    layout = _Layout(len(accounts), sum(lengths))
+    shm = shared_memory.SharedMemory(create=True, size=layout.size)
+    offsets, expected, amounts, balances, types = layout.views(shm.buf)
+    row = 0
+    for i, (account, length) in enumerate(zip(accounts, lengths)):
+        ledger = account._ledger
+        offsets[i] = row
+        expected[i] = account.balance
+        amounts[row : row + length] = memoryview(ledger.amounts)[:length]
+        balances[row : row + length] = memoryview(ledger.balances)[:length]
+        types[row : row + length] = memoryview(ledger.types)[:length]
+        row += length
+    offsets[len(accounts)] = row
+    for view in (offsets, expected, amounts, balances, types):
+        view.release()
+    return shm, layout
+
+
+# Per worker process: the attached block and its column views
+_shm: shared_memory.SharedMemory | None = None
+_views: tuple[memoryview, ...] = ()
+
+
+def _attach(name: str, layout: _Layout) -> None:
+    global _shm, _views
+    _shm = shared_memory.SharedMemory(name=name)
+    _views = layout.views(_shm.buf)
+
+
+def _check(first: int, stop: int) -> list[tuple]:
+    """
+    Check accounts first..stop. Returns (account index, kind, ledger row, expected, actual)
+    """
+    offsets, expected, amounts, balances, types = _views
+    r0, r1 = offsets[first], offsets[stop]
+    found = []
+    if r0 == r1:
+        return found
+
+    signs = list(map(SIGN_OF.get, types[r0:r1], repeat(0)))
+    signed = list(map(mul, amounts[r0:r1], signs))
+    bals = balances[r0:r1]
+
+    def located(rows):
+        for row in rows:
+            account = bisect_right(offsets, row, first, stop + 1) - 1
+            yield account, row - offsets[account]
+
+    for account, row in located(compress(count(r0), map(eq, signs, repeat(0)))):
+        found.append((account, "type", row, None, types[offsets[account] + row]))
+
+    # balance_after[i] - balance_after[i-1] must be the signed amount, except where a new
+    # account starts
+    steps = map(ne, map(sub, bals[1:], bals[:-1]), signed[1:])
+    for account, row in located(compress(count(r0 + 1), steps)):
+        if row:
+            at = offsets[account] + row
+            actual = balances[at]
+            found.append((account, "chain", row, balances[at - 1] + signed[at - r0], actual))
+
+    for account, row in located(compress(count(r0), map(lt, bals, repeat(0)))):
+        found.append((account, "negative", row, 0, balances[offsets[account] + row]))
+
+    for account in range(first, stop):
+        start, end = offsets[account], offsets[account + 1]
+        if start == end:
+            continue
+        opening = balances[start] - signed[start - r0]
+        if opening < 0:
+            found.append((account, "opening", 0, 0, opening))
+        if balances[end - 1] != expected[account]:
+            found.append((account, "balance", None, balances[end - 1], expected[account]))
+    return found
+
+
+def _tasks(offsets: list[int], tasks: int) -> list[tuple[int, int]]:
+    # Cut accounts into ranges of roughly equal row counts
+    accounts, rows = len(offsets) - 1, offsets[-1]
+    bounds = [0]
+    for i in range(1, tasks):
+        cut = bisect_right(offsets, rows * i // tasks, bounds[-1], accounts)
+        if cut > bounds[-1]:
+            bounds.append(cut)
+    if bounds[-1] < accounts:
+        bounds.append(accounts)
+    return list(zip(bounds, bounds[1:]))
+
+
+def reconcile(accounts: Iterable[Account], workers: int | None = None) -> ReconciliationReport:
+    """
+    Check every account's history: each balance_after must equal the previous one plus the
+    signed amount, no balance (including the implied opening balance) may be negative, type
+    codes must be known, and the last balance_after must equal the account's balance.
+
+    Ledgers are packed into one shared memory block that worker processes read in place;
+    tasks are account ranges, so nothing is pickled per transaction. workers defaults to
+    the CPU count, and workers=1 checks in this process. Accounts shouldn't change while
+    they are being packed (use a recovered Storage or a quiet bank)
+    """
+    started = time.perf_counter()
+    accounts = list(accounts)
+    workers = workers or os.cpu_count() or 1
+    report = ReconciliationReport(accounts=len(accounts))
+
+    shm, layout = _pack(accounts)
+    try:
+        offsets = layout.views(shm.buf)[0]
+        bounds = _tasks(offsets.tolist(), workers * TASKS_PER_WORKER)
+        offsets.release()
+        report.transactions = layout.rows
+
+        if workers == 1 or len(bounds) <= 1:
+            _attach(shm.name, layout)
+            try:
+                results = [_check(first, stop) for first, stop in bounds]
+            finally:
+                _detach()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach, initargs=(shm.name, layout)
+            ) as pool:
+                results = list(pool.map(_check, *zip(*bounds)))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # In account order, then row order with the final balance check last
+    found = sorted(chain.from_iterable(results), key=lambda f: (f[0], f[2] is None, f[2] or 0))
+    for index, kind, row, expected, actual in found:
+        account_id = accounts[index].account_id
+        report.discrepancies.append(Discrepancy(account_id, kind, row, expected, actual))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _detach() -> None:
+    global _shm, _views
+    for view in _views:
+        view.release()
+    _views = ()
+    if _shm is not None:
+        _shm.close()
+        _shm = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile every account in a storage directory")
+    parser.add_argument("directory", help="Storage directory (snapshot and WAL)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPUs)")
+    parser.add_argument("--limit", type=int, default=20, help="Discrepancies to list")
+    args = parser.parse_args(argv)
+
+    report = reconcile(Storage(args.directory).load().values(), args.workers)
+    print(report.summary())
+    for d in report.discrepancies[: args.limit]:
+        print(f"{d.account_id} {d.kind} row={d.row} expected={d.expected} actual={d.actual}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
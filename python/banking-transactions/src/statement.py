@@ -0,0 +1,139 @@
+import json
+from array import array
+from datetime import timedelta
+from typing import Callable, Iterable, Iterator, Literal, TextIO
+
+from ledger import EPOCH, ID_SIZE, TRANSACTION_TYPES, Ledger
+
+StatementFormat = Literal["text", "csv", "jsonl"]
+
+# Characters written per file.write() call
+CHUNK_SIZE = 64 * 1024
+
+CSV_HEADER = "transaction_id,timestamp,transaction_type,amount,balance_after,description\n"
+
+
+class TimestampFormatter:
+    """
+    Formats epoch microseconds exactly like str() of the UTC datetime (or isoformat() with
+    sep="T") without building one. Statements are in timestamp order, so the date and the
+    HH:MM:SS part are cached and only recomputed when the day or the second changes
+    """
+
+    __slots__ = ("sep", "_day", "_date", "_second", "_prefix")
+
+    def __init__(self, sep: str = " "):
+        self.sep = sep
+        self._day: int | None = None
+        self._date = ""
+        self._second: int | None = None
+        self._prefix = ""
+
+    def __call__(self, micros: int) -> str:
+        second, fraction = divmod(micros, 1_000_000)
+        if second != self._second:
+            day, in_day = divmod(second, 86_400)
+            if day != self._day:
+                self._date = (EPOCH + timedelta(days=day)).date().isoformat()
+                self._day = day
+            hours, rest = divmod(in_day, 3_600)
+            minutes, seconds = divmod(rest, 60)
+            self._prefix = f"{self._date}{self.sep}{hours:02d}:{minutes:02d}:{seconds:02d}"
+            self._second = second
+        if fraction:
+            return f"{self._prefix}.{fraction:06d}+00:00"
+        return self._prefix + "+00:00"
+
+
+def _csv_field(value: str) -> str:
+    # Minimal quoting, as csv.writer does
+    if any(c in value for c in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+class _Escaped(dict):
+    """
+    Escaped descriptions keyed by description table index, filled in as rows use them, so
+    a short page over a ledger with many distinct descriptions only escapes its own
+    """
+
+    __slots__ = ("table", "escape")
+
+    def __init__(self, table: list[str], escape: Callable[[str], str]):
+        super().__init__()
+        self.table = table
+        self.escape = escape
+
+    def __missing__(self, index: int) -> str:
+        value = self[index] = self.escape(self.table[index])
+        return value
+
+
+def _uuid(ids: bytearray, row: int) -> str:
+    h = ids[row * ID_SIZE : (row + 1) * ID_SIZE].hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def statement_lines(
+    ledger: Ledger, rows: range | array, format: StatementFormat = "text"
+) -> Iterator[str]:
+    """
+    Yields one newline-terminated line per ledger row, read straight from the columns.
+    "text" lines match str(Transaction); "csv" and "jsonl" use ISO 8601 timestamps and
+    include the transaction id. Descriptions are escaped the first time a row uses them
+    """
+    timestamps, types = ledger.timestamps, ledger.types
+    amounts, balances = ledger.amounts, ledger.balances
+    descriptions, table = ledger.descriptions, ledger.description_table
+
+    if format == "text":
+        stamp = TimestampFormatter()
+        for row in rows:
+            yield (
+                f"{stamp(timestamps[row])} | Type: {TRANSACTION_TYPES[types[row]]} | "
+                f"{amounts[row]} | Balance={balances[row]} | {table[descriptions[row]]}\n"
+            )
+    elif format == "csv":
+        stamp = TimestampFormatter("T")
+        escaped = _Escaped(table, _csv_field)
+        for row in rows:
+            yield (
+                f"{_uuid(ledger.ids, row)},{stamp(timestamps[row])},"
+                f"{TRANSACTION_TYPES[types[row]]},{amounts[row]},{balances[row]},"
+                f"{escaped[descriptions[row]]}\n"
+            )
+    elif format == "jsonl":
+        stamp = TimestampFormatter("T")
+        escaped = _Escaped(table, json.dumps)
+        for row in rows:
+            yield (
+                f'{{"transaction_id": "{_uuid(ledger.ids, row)}", '
+                f'"timestamp": "{stamp(timestamps[row])}", '
+                f'"transaction_type": "{TRANSACTION_TYPES[types[row]]}", '
+                f'"amount": {amounts[row]}, "balance_after": {balances[row]}, '
+                f'"description": {escaped[descriptions[row]]}}}\n'
+            )
+    else:
+        raise ValueError(f"Unknown statement format: {format}")
+
+
+def write_chunks(file: TextIO, lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Write lines to file in chunks of about chunk_size characters, so memory stays bounded
+    by the chunk rather than the statement. Returns the number of characters written
+    """
+    buffer: list[str] = []
+    size = written = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            file.write("".join(buffer))
+            written += size
+            buffer.clear()
+            size = 0
+    if buffer:
+        file.write("".join(buffer))
+        written += size
+    return written
@@ -0,0 +1,197 @@
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable
+from uuid import UUID
+
+from account import Account
+from bank import Bank
+from ledger import ID_SIZE, TRANSACTION_TYPES, Ledger
+from wal import SyncMode, WriteAheadLog, decode_records, fsync_directory, iter_frames
+
+SNAPSHOT_MAGIC = b"BSNP"
+SNAPSHOT_VERSION = 1
+# magic, version, WAL offset the snapshot is current up to, account count
+SNAPSHOT_HEADER = struct.Struct("<4sHqQ")
+# account id, balance, ledger rows, description table length (JSON bytes)
+SNAPSHOT_ACCOUNT = struct.Struct("<16sqQI")
+
+# Ledger columns in the order they are written to a snapshot (ids are written first)
+COLUMNS = ("timestamps", "types", "amounts", "balances", "descriptions")
+
+
+class Storage:
+    """
+    Durable home for a Bank in one directory: a write-ahead log of every operation plus the
+    latest snapshot of all accounts and their ledgers.
+
+    open() recovers the bank by loading the snapshot and replaying the WAL frames written
+    after it. A checkpoint is taken every checkpoint_every frames (0 disables automatic
+    checkpoints). Each one starts a new WAL segment and deletes the old ones once the
+    snapshot is durable, so both the WAL on disk and the tail recovery replays stay bounded
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        sync: SyncMode = "group",
+        group_commit_ms: float = 1.0,
+        checkpoint_every: int = 100_000,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.wal_path = self.directory / "bank.wal"
+        self.snapshot_path = self.directory / "bank.snapshot"
+        self.sync = sync
+        self.group_commit_ms = group_commit_ms
+        self.checkpoint_every = checkpoint_every
+        self.wal: WriteAheadLog | None = None
+        self._frames_since_checkpoint = 0
+        self._checkpointing = threading.Lock()
+
+    def open(self, shards: int = 256) -> Bank:
+        """
+        Recover the bank from disk (an empty bank if there is nothing yet) and attach it to
+        this storage so every later operation is logged
+        """
+        accounts, offset = self._recover()
+        self.wal = WriteAheadLog(self.wal_path, self.sync, self.group_commit_ms, offset or 0)
+        bank = Bank(shards=shards)
+        for account in accounts.values():
+            bank._register(account)
+        bank.storage = self
+        return bank
+
+    def load(self) -> dict[str, Account]:
+        """
+        Read-only recovery: the accounts as of the snapshot plus the WAL tail, keyed by id.
+        Nothing is attached or written, so this is safe on a copy or a live directory
+        """
+        return self._recover()[0]
+
+    def _recover(self) -> tuple[dict[str, Account], int | None]:
+        # The accounts and the WAL offset of the snapshot they were loaded from
+        while True:
+            accounts, offset = self._load_snapshot()
+            try:
+                for _, payload in iter_frames(self.wal_path, offset):
+                    self._replay(accounts, payload)
+            except FileNotFoundError:
+                # A checkpoint replaced the snapshot and dropped a segment meanwhile
+                continue
+            return accounts, offset
+
+    def close(self) -> None:
+        if self.wal is not None:
+            self.wal.close()
+
+    # ─── Logging ──────────────────────────────────────────────────────────────
+
+    def log(self, payload: bytes) -> int:
+        self._frames_since_checkpoint += 1
+        return self.wal.append(payload)
+
+    def commit(self, lsn: int) -> None:
+        self.wal.commit(lsn)
+
+    @property
+    def checkpoint_due(self) -> bool:
+        return 0 < self.checkpoint_every <= self._frames_since_checkpoint
+
+    # ─── Snapshots ────────────────────────────────────────────────────────────
+
+    def checkpoint(
+        self, accounts: Iterable[tuple[Account, int, int]], wal_offset: int
+    ) -> bool:
+        """
+        Write a snapshot of (account, balance, ledger rows) captured at wal_offset, then
+        delete the WAL segments it covers. Returns False without writing if another thread
+        is already checkpointing
+        """
+        if not self._checkpointing.acquire(blocking=False):
+            return False
+        try:
+            # Frames the snapshot covers must be on disk before the snapshot says so
+            self.wal.sync_to(wal_offset)
+            self._write_snapshot(list(accounts), wal_offset)
+            self.wal.drop_before(wal_offset)
+            self._frames_since_checkpoint = 0
+            return True
+        finally:
+            self._checkpointing.release()
+
+    def _write_snapshot(
+        self, accounts: list[tuple[Account, int, int]], wal_offset: int
+    ) -> None:
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC, SNAPSHOT_VERSION, wal_offset, len(accounts)
+                )
+            )
+            for account, balance, rows in accounts:
+                ledger = account._ledger
+                table = json.dumps(ledger.description_table).encode("utf-8")
+                f.write(
+                    SNAPSHOT_ACCOUNT.pack(
+                        UUID(account.account_id).bytes, balance, rows, len(table)
+                    )
+                )
+                # Ledgers are append-only, so the first rows rows can't change under us
+                f.write(ledger.ids[: rows * ID_SIZE])
+                for name in COLUMNS:
+                    f.write(getattr(ledger, name)[:rows].tobytes())
+                f.write(table)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # The new snapshot must survive a crash before the segments it covers are deleted
+        fsync_directory(self.directory)
+
+    def _load_snapshot(self) -> tuple[dict[str, Account], int | None]:
+        if not self.snapshot_path.exists():
+            return {}, None
+
+        data = memoryview(self.snapshot_path.read_bytes())
+        magic, version, wal_offset, count = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"{self.snapshot_path} is not a bank snapshot")
+        offset = SNAPSHOT_HEADER.size
+
+        accounts = {}
+        for _ in range(count):
+            raw_id, balance, rows, table_len = SNAPSHOT_ACCOUNT.unpack_from(data, offset)
+            offset += SNAPSHOT_ACCOUNT.size
+            account_id = str(UUID(bytes=raw_id))
+            ledger = Ledger(account_id)
+
+            ledger.ids[:] = data[offset : offset + rows * ID_SIZE]
+            offset += rows * ID_SIZE
+            for name in COLUMNS:
+                column = getattr(ledger, name)
+                size = column.itemsize * rows
+                column.frombytes(data[offset : offset + size])
+                offset += size
+            table = json.loads(bytes(data[offset : offset + table_len]))
+            ledger.load_description_table(table)
+            offset += table_len
+
+            accounts[account_id] = Account.restore(account_id, balance, ledger)
+        return accounts, wal_offset
+
+    @staticmethod
+    def _replay(accounts: dict[str, Account], payload: bytes) -> None:
+        for record in decode_records(payload):
+            if record[0] == "open":
+                _, account_id, balance = record
+                accounts[account_id] = Account.restore(account_id, balance)
+            else:
+                _, account_id, txn_id, ts, code, amount, balance, description = record
+                account = accounts[account_id]
+                account._ledger.append(
+                    txn_id, ts, TRANSACTION_TYPES[code], amount, balance, description
+                )
+                account._balance = balance
@@ -0,0 +1,373 @@
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Generator, Iterator, Literal
+from uuid import UUID
+
+from ledger import ID_SIZE, Ledger
+
+WAL_MAGIC = b"BWAL"
+WAL_VERSION = 2
+# magic, version, log sequence number of the segment's first byte. The log is a series of
+# segment files named <log>.<base lsn as 16 hex digits>; an lsn is the segment's base plus
+# the file offset, so lsns keep growing across segments
+WAL_HEADER = struct.Struct("<4sHq")
+
+# Every write is one frame: payload length, CRC32 of the payload, then the payload. A frame
+# holds all the records of one operation (a transfer's two sides), so recovery applies
+# operations whole or not at all
+FRAME = struct.Struct("<II")
+
+# Records inside a frame, each starting with a one-byte kind
+OPEN = 0
+TXN = 1
+# kind, account id, starting balance
+OPEN_RECORD = struct.Struct("<B16sq")
+# kind, account id, transaction id, timestamp (epoch us), type code, amount, balance after,
+# description length (UTF-8 bytes follow)
+TXN_RECORD = struct.Struct("<B16s16sqbqqH")
+
+SyncMode = Literal["always", "group", "none"]
+
+
+def encode_open(account_id: str, balance: int) -> bytes:
+    return OPEN_RECORD.pack(OPEN, UUID(account_id).bytes, balance)
+
+
+def encode_rows(ledger: Ledger, start: int, stop: int) -> bytes:
+    """
+    Encode ledger rows start..stop as TXN records, straight from the columns
+    """
+    account = UUID(ledger.account_id).bytes
+    ids, table = ledger.ids, ledger.description_table
+    parts = []
+    for i in range(start, stop):
+        description = table[ledger.descriptions[i]].encode("utf-8")
+        parts.append(
+            TXN_RECORD.pack(
+                TXN,
+                account,
+                bytes(ids[i * ID_SIZE : (i + 1) * ID_SIZE]),
+                ledger.timestamps[i],
+                ledger.types[i],
+                ledger.amounts[i],
+                ledger.balances[i],
+                len(description),
+            )
+        )
+        parts.append(description)
+    return b"".join(parts)
+
+
+def decode_records(payload: bytes) -> Iterator[tuple]:
+    """
+    Yields ("open", account_id, balance) and
+    ("txn", account_id, id_bytes, timestamp_us, type_code, amount, balance_after, description)
+    """
+    offset = 0
+    while offset < len(payload):
+        kind = payload[offset]
+        if kind == OPEN:
+            _, account, balance = OPEN_RECORD.unpack_from(payload, offset)
+            offset += OPEN_RECORD.size
+            yield ("open", str(UUID(bytes=account)), balance)
+        elif kind == TXN:
+            _, account, txn_id, ts, code, amount, balance, length = TXN_RECORD.unpack_from(
+                payload, offset
+            )
+            offset += TXN_RECORD.size
+            description = payload[offset : offset + length].decode("utf-8")
+            offset += length
+            account_id = str(UUID(bytes=account))
+            yield ("txn", account_id, txn_id, ts, code, amount, balance, description)
+        else:
+            raise ValueError(f"Unknown WAL record kind {kind}")
+
+
+def segment_path(path: str | Path, base: int) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.{base:016x}")
+
+
+def segments(path: str | Path) -> list[tuple[int, Path]]:
+    """
+    (base lsn, file) for every segment of the log at path, oldest first
+    """
+    path = Path(path)
+    found = []
+    for segment in path.parent.glob(f"{path.name}.*"):
+        suffix = segment.name[len(path.name) + 1 :]
+        if re.fullmatch("[0-9a-f]{16}", suffix):
+            found.append((int(suffix, 16), segment))
+    return sorted(found)
+
+
+def fsync_directory(path: str | Path) -> None:
+    """
+    Make file creations, renames and deletions in a directory durable
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _segment_frames(
+    segment: Path, base: int, start: int
+) -> Generator[tuple[int, bytes], None, bool]:
+    """
+    Yields (end lsn, payload) for the intact frames of one segment from lsn start, reading a
+    frame at a time. Returns False if it stopped at a torn or corrupt frame
+    """
+    with open(segment, "rb") as f:
+        header = f.read(WAL_HEADER.size)
+        if len(header) < WAL_HEADER.size:
+            return False
+        magic, version, header_base = WAL_HEADER.unpack(header)
+        if magic != WAL_MAGIC or version != WAL_VERSION or header_base != base:
+            raise ValueError(f"{segment} is not a banking WAL segment")
+
+        offset = max(WAL_HEADER.size, start - base)
+        f.seek(offset)
+        while True:
+            head = f.read(FRAME.size)
+            if not head:
+                return True
+            if len(head) < FRAME.size:
+                return False
+            length, crc = FRAME.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return False
+            offset += FRAME.size + length
+            yield base + offset, payload
+
+
+def iter_frames(path: str | Path, start: int | None = None) -> Iterator[tuple[int, bytes]]:
+    """
+    Yields (end lsn, payload) for every intact frame after lsn start (default: the first
+    frame), across segments, skipping the segments that end before start. Stops at the
+    first truncated or corrupt frame, which is where a crash cut the log short
+    """
+    start = start or 0
+    found = segments(path)
+    for i, (base, segment) in enumerate(found):
+        # A segment runs up to where the next one's frames begin
+        if i + 1 < len(found) and found[i + 1][0] + WAL_HEADER.size <= start:
+            continue
+        if not (yield from _segment_frames(segment, base, start)):
+            return
+
+
+class WriteAheadLog:
+    """
+    Append-only binary log of CRC-checked frames, split into segment files.
+
+    append() writes a frame to the OS and returns its log sequence number (the lsn just
+    past it); commit(lsn) returns once that frame is durable. rotate() starts a new segment,
+    and drop_before(lsn) deletes the segments a snapshot has made redundant, so the log on
+    disk only grows between checkpoints. How durable is the sync mode's choice:
+
+    - "always": every commit fsyncs (safest, slowest)
+    - "group": a background thread fsyncs at most every group_commit_ms, and every commit
+      waiting at that point is released by the same fsync. Throughput grows with the number
+      of concurrent committers at the cost of up to group_commit_ms extra latency each
+    - "none": never fsync, leaving it to the OS (a crash can lose recent commits)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        sync: SyncMode = "group",
+        group_commit_ms: float = 1.0,
+        start: int = 0,
+    ):
+        """
+        start is the lowest lsn the log may continue from: the offset of the latest
+        snapshot, so lsns never restart below what the snapshot already covers
+        """
+        if sync not in ("always", "group", "none"):
+            raise ValueError(f"Unknown sync mode: {sync}")
+        self.path = Path(path)
+        self.sync = sync
+        self.group_commit_interval = group_commit_ms / 1000
+
+        # Drop any torn frame left by a crash, and every segment after it, then append after
+        # the last intact frame
+        end, torn = None, False
+        for base, segment in segments(self.path):
+            if torn or segment.stat().st_size < WAL_HEADER.size:
+                segment.unlink()
+                torn = True
+                continue
+            end = base + WAL_HEADER.size
+            frames = _segment_frames(segment, base, 0)
+            while True:
+                try:
+                    end, _ = next(frames)
+                except StopIteration as stop:
+                    torn = not stop.value
+                    break
+            if torn:
+                with open(segment, "r+b") as f:
+                    f.truncate(end - base)
+            self._base = base
+
+        if end is None:
+            self._base = max(0, start - WAL_HEADER.size)
+            end = self._base + WAL_HEADER.size
+            self._file = self._create_segment(self._base)
+        elif end < start:
+            raise ValueError(f"{self.path} ends at {end}, before the snapshot at {start}")
+        else:
+            self._file = open(segment_path(self.path, self._base), "ab")
+
+        # Segments rotated out and not yet synced and closed by _fsync()
+        self._retired: list[BinaryIO] = []
+        self._lock = threading.Lock()
+        self._fsyncing = threading.Lock()
+        self._synced = threading.Condition(threading.Lock())
+        self._written = end
+        self._durable = end
+        self._pending = False
+        self._closed = False
+        self.fsyncs = 0
+
+        self._flusher = None
+        if sync == "group":
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    @property
+    def position(self) -> int:
+        """
+        Lsn just past the last appended frame
+        """
+        return self._written
+
+    @property
+    def segment(self) -> Path:
+        """
+        The segment frames are currently appended to
+        """
+        return segment_path(self.path, self._base)
+
+    def _create_segment(self, base: int) -> BinaryIO:
+        # The header and the directory entry are durable before any frame goes in, so a
+        # crash can't leave a snapshot pointing past an empty or missing segment
+        f = open(segment_path(self.path, base), "wb")
+        f.write(WAL_HEADER.pack(WAL_MAGIC, WAL_VERSION, base))
+        f.flush()
+        os.fsync(f.fileno())
+        fsync_directory(self.path.parent)
+        return f
+
+    def rotate(self) -> int:
+        """
+        Start a new segment at the current position and return that position. The new
+        segment is created durably; the old one is synced and closed by the next fsync. Does
+        nothing if the current segment holds no frames yet
+        """
+        with self._lock:
+            if self._written > self._base + WAL_HEADER.size:
+                self._file.flush()
+                self._retired.append(self._file)
+                self._base = self._written - WAL_HEADER.size
+                self._file = self._create_segment(self._base)
+            return self._written
+
+    def drop_before(self, lsn: int) -> None:
+        """
+        Delete the segments that hold no frames after lsn, once a snapshot covers them
+        """
+        found = segments(self.path)
+        for (_, segment), (next_base, _) in zip(found, found[1:]):
+            if next_base + WAL_HEADER.size <= lsn:
+                segment.unlink(missing_ok=True)
+
+    def append(self, payload: bytes) -> int:
+        frame = FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._file.write(frame)
+            self._written += len(frame)
+            return self._written
+
+    def commit(self, lsn: int) -> None:
+        if self.sync == "none" or self._durable >= lsn:
+            return
+        if self.sync == "always":
+            self._fsync()
+            return
+
+        with self._synced:
+            self._pending = True
+            self._synced.notify_all()
+            while self._durable < lsn and not self._closed:
+                self._synced.wait()
+
+    def sync_to(self, lsn: int) -> None:
+        """
+        Make everything up to lsn durable now, whatever the sync mode
+        """
+        if self._durable < lsn:
+            self._fsync()
+
+    def _fsync(self) -> None:
+        # The buffer is flushed under the append lock, the fsync runs without it so appends
+        # can carry on while the disk catches up. Rotated-out segments are synced and closed
+        # first, and the directory so the new segment's entry is durable too
+        with self._fsyncing:
+            with self._lock:
+                self._file.flush()
+                target = self._written
+                current, retired, self._retired = self._file, self._retired, []
+            for f in retired:
+                os.fsync(f.fileno())
+                f.close()
+            if retired:
+                fsync_directory(self.path.parent)
+            os.fsync(current.fileno())
+            self.fsyncs += 1
+        with self._synced:
+            self._durable = max(self._durable, target)
+            self._synced.notify_all()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._synced:
+                while not self._pending and not self._closed:
+                    self._synced.wait()
+                if self._closed:
+                    return
+                self._pending = False
+            # Latency budget: let more commits pile up behind this fsync
+            time.sleep(self.group_commit_interval)
+            self._fsync()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if self.sync != "none":
+            self._fsync()
+        else:
+            with self._lock:
+                self._file.flush()
+        with self._synced:
+            self._closed = True
+            self._synced.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+        for f in self._retired:
+            f.close()
+        self._file.close()
+
+    def __enter__(self) -> "WriteAheadLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,7 +1,16 @@
-import pytest, dataclasses
+import pytest, csv, dataclasses, io, json, random, subprocess, sys, threading
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import UUID
 
-from account import Account
-from errors import InvalidTransactionError, InsufficientFundsError
+from account import Account, _parse_digits, parse_amount
+from bank import Bank
+from ledger import from_micros
+from ids import IdProvider
+from errors import AccountNotFoundError, InvalidTransactionError, InsufficientFundsError
+from reconcile import reconcile
+from storage import Storage
+from wal import WAL_HEADER, segments
 
 
 def test_create_successful_account():
@@ -168,3 +177,482 @@ def test_transaction_history_order():
     account.withdraw("1000", "Groceries")
     tsx = account.get_transactions()
     assert [t.transaction_type for t in tsx] == ["DEPOSIT", "WITHDRAW"]
+
+
+def test_get_transactions_is_a_view_of_the_history_at_call_time():
+    """
+    Tests that get_transactions() returns a read-only view that later transactions don't change, and that slicing doesn't copy
+    """
+    account = Account(starting_balance="3000")
+    account.deposit("500", "Salary")
+    tsx = account.get_transactions()
+
+    account.withdraw("100", "Coffee")
+    assert len(tsx) == 1
+    assert len(account.get_transactions()) == 2
+
+    tsx = account.get_transactions()
+    assert tsx[-1].description == "Coffee"
+    assert [t.amount for t in tsx[1:]] == [100]
+    assert [t.amount for t in reversed(tsx)] == [100, 500]
+    with pytest.raises(IndexError):
+        tsx[2]
+    with pytest.raises(TypeError):
+        tsx[0] = None
+
+
+def test_transaction_fields_round_trip_through_ledger():
+    """
+    Tests that transactions rebuilt from the columnar ledger keep their id, account, UTC timestamp, type and description
+    """
+    account = Account(starting_balance="0")
+    returned = account.deposit("250", "Refund")
+    stored = account.get_transactions()[0]
+
+    assert stored == returned
+    assert str(UUID(stored.transaction_id)) == stored.transaction_id
+    assert stored.account_id == account.account_id
+    assert stored.timestamp.tzinfo == timezone.utc
+    assert stored.balance_after == 250
+
+
+def test_ledger_memory_per_transaction():
+    """
+    Tests that the columnar ledger stays compact as the history grows
+    """
+    account = Account(starting_balance="0")
+    for i in range(1000):
+        account.deposit("10", "Salary" if i % 2 else "Interest")
+    assert account._ledger.nbytes() / 1000 < 64
+
+
+def test_post_batch_applies_all_entries():
+    """
+    Tests posting a batch of deposits and withdrawals, the running balances, and the shared timestamp
+    """
+    account = Account(starting_balance="100")
+    posted = account.post_batch(
+        [("DEPOSIT", "50", "Salary"), ("WITHDRAW", "120", "Rent"), ("DEPOSIT", "5")]
+    )
+    assert account.balance == 35
+    assert [t.balance_after for t in posted] == [150, 30, 35]
+    assert [t.description for t in posted] == ["Salary", "Rent", ""]
+    assert len({t.timestamp for t in posted}) == 1
+    assert len({t.transaction_id for t in posted}) == 3
+    assert len(account.get_transactions()) == 3
+
+    assert len(account.post_batch([])) == 0
+    assert account.balance == 35
+
+
+def test_post_batch_is_all_or_nothing():
+    """
+    Tests that an overdraft anywhere in the batch, or any invalid entry, leaves the account untouched
+    """
+    account = Account(starting_balance="100")
+    with pytest.raises(InsufficientFundsError, match="-50"):
+        account.post_batch(
+            [("WITHDRAW", "100"), ("WITHDRAW", "50"), ("DEPOSIT", "1000")]
+        )
+
+    for bad in (" 5", "", "0", "-5", "٠١٢", 5):
+        with pytest.raises(InvalidTransactionError):
+            account.post_batch([("DEPOSIT", "10"), ("DEPOSIT", bad)])
+
+    with pytest.raises(InvalidTransactionError):
+        account.post_batch([("DEPOSIT", "10"), ("TRANSFER", "10")])
+
+    for shape in [("DEPOSIT",)], [("DEPOSIT", "10"), ("DEPOSIT", "10", "Salary", "extra")]:
+        with pytest.raises(InvalidTransactionError):
+            account.post_batch(shape)
+
+    assert account.balance == 100
+    assert len(account.get_transactions()) == 0
+
+
+def test_bank_transfer_moves_money_atomically():
+    """
+    Tests a transfer between two accounts, and that a failed transfer leaves both accounts untouched
+    """
+    bank = Bank(shards=4)
+    src = bank.open_account("1000")
+    dst = bank.open_account("0")
+
+    withdrawal, deposit = bank.transfer(src.account_id, dst.account_id, "400")
+    assert (src.balance, dst.balance) == (600, 400)
+    assert withdrawal.transaction_type == "WITHDRAW" and deposit.transaction_type == "DEPOSIT"
+
+    with pytest.raises(InsufficientFundsError):
+        bank.transfer(src.account_id, dst.account_id, "601")
+    with pytest.raises(InvalidTransactionError):
+        bank.transfer(src.account_id, dst.account_id, "0")
+    with pytest.raises(InvalidTransactionError):
+        bank.transfer(src.account_id, src.account_id, "1")
+    with pytest.raises(AccountNotFoundError):
+        bank.transfer(src.account_id, "missing", "1")
+
+    assert (src.balance, dst.balance) == (600, 400)
+    assert len(src.get_transactions()) == 1 and len(dst.get_transactions()) == 1
+
+
+def test_bank_concurrent_transfers_conserve_money():
+    """
+    Stress test: many threads transferring between random accounts never create or destroy money or overdraw an account
+    """
+    bank = Bank(shards=8)
+    ids = [bank.open_account("100").account_id for _ in range(50)]
+    errors = []
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            src, dst = rng.sample(ids, 2)
+            try:
+                bank.transfer(src, dst, str(rng.randint(1, 40)))
+            except InsufficientFundsError:
+                pass
+            except Exception as e:
+                errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert bank.total_balance() == 100 * len(ids)
+    assert all(bank.get_account(i).balance >= 0 for i in ids)
+    for i in ids:
+        account = bank.get_account(i)
+        history = account.get_transactions()
+        assert (history[-1].balance_after if history else 100) == account.balance
+
+
+def bank_state(bank: Bank) -> dict:
+    return {
+        account_id: (
+            bank.get_account(account_id).balance,
+            [(t.transaction_id, t.timestamp, t.amount, t.balance_after, t.description)
+             for t in bank.get_account(account_id).get_transactions()],
+        )
+        for shard in bank._shards
+        for account_id in shard
+    }
+
+
+def test_storage_recovers_bank_from_wal(tmp_path):
+    """
+    Tests that reopening storage replays the WAL into the same balances and transaction histories
+    """
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    bank = storage.open()
+    a = bank.open_account("1000")
+    b = bank.open_account("0")
+    bank.deposit(a.account_id, "250", "Salary")
+    bank.transfer(a.account_id, b.account_id, "400")
+    bank.withdraw(b.account_id, "100", "Café")
+    expected = bank_state(bank)
+    storage.close()
+
+    recovered = Storage(tmp_path).open()
+    assert bank_state(recovered) == expected
+    assert recovered.total_balance() == 1150
+    recovered.storage.close()
+
+
+def test_storage_ignores_torn_or_corrupt_wal_tail(tmp_path):
+    """
+    Tests that a frame cut short or failing its CRC (a crash mid-write) is dropped on recovery, keeping everything before it
+    """
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    bank = storage.open()
+    a = bank.open_account("1000")
+    bank.withdraw(a.account_id, "1")
+    size = storage.wal.position
+    bank.withdraw(a.account_id, "2")
+    storage.close()
+
+    wal = storage.wal.segment
+    data = bytearray(wal.read_bytes())
+    data[-1] ^= 0xFF
+    wal.write_bytes(bytes(data))
+    recovered = Storage(tmp_path).open()
+    assert recovered.get_account(a.account_id).balance == 999
+    assert wal.stat().st_size == size
+
+    # New frames are appended after the last good one
+    recovered.withdraw(a.account_id, "9")
+    recovered.storage.close()
+    with open(wal, "ab") as f:
+        f.write(b"\x10\x00\x00")
+    assert Storage(tmp_path).open().get_account(a.account_id).balance == 990
+
+
+def test_storage_checkpoint_then_replays_only_the_tail(tmp_path):
+    """
+    Tests periodic snapshots: recovery loads the snapshot and replays the WAL written after it
+    """
+    storage = Storage(tmp_path, sync="group", group_commit_ms=1, checkpoint_every=5)
+    bank = storage.open()
+    a = bank.open_account("1000")
+    for i in range(12):
+        bank.withdraw(a.account_id, "10", f"Bill {i % 3}")
+    expected = bank_state(bank)
+    storage.close()
+
+    assert (tmp_path / "bank.snapshot").exists()
+    recovered_storage = Storage(tmp_path)
+    accounts, offset = recovered_storage._load_snapshot()
+    assert 0 < len(accounts[a.account_id].get_transactions()) < 12
+    # Segments the snapshot covers are deleted: only the one holding the tail is left
+    ((base, segment),) = segments(tmp_path / "bank.wal")
+    assert base + WAL_HEADER.size == offset
+    assert WAL_HEADER.size < segment.stat().st_size
+
+    recovered = recovered_storage.open()
+    assert bank_state(recovered) == expected
+    recovered_storage.close()
+
+
+def test_wal_segments_replay_in_order_until_a_checkpoint_drops_them(tmp_path):
+    """
+    Tests that recovery reads across WAL segments (a crash between rotating and writing the snapshot) and that a checkpoint deletes the segments it covers
+    """
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    bank = storage.open()
+    a = bank.open_account("1000")
+    bank.withdraw(a.account_id, "1")
+    storage.wal.rotate()
+    bank.withdraw(a.account_id, "2")
+    storage.wal.rotate()
+    bank.deposit(a.account_id, "5")
+    storage.close()
+    assert len(segments(tmp_path / "bank.wal")) == 3
+
+    recovered_storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    recovered = recovered_storage.open()
+    assert recovered.get_account(a.account_id).balance == 1002
+    assert recovered.checkpoint()
+    assert len(segments(tmp_path / "bank.wal")) == 1
+    recovered.withdraw(a.account_id, "2")
+    recovered_storage.close()
+
+    assert Storage(tmp_path).load()[a.account_id].balance == 1000
+
+
+def test_storage_keeps_writes_after_a_crash_right_after_a_checkpoint(tmp_path):
+    """
+    Tests that a process killed just after a checkpoint (new WAL segment, old one deleted) recovers, and that later writes survive the next recovery
+    """
+    crash = f"""
+import os, sys
+sys.path.insert(0, {str(Path(__file__).resolve().parents[1] / "src")!r})
+from storage import Storage
+bank = Storage({str(tmp_path)!r}, sync="always", checkpoint_every=0).open()
+account = bank.open_account("100")
+bank.deposit(account.account_id, "50")
+bank.checkpoint()
+print(account.account_id, flush=True)
+os._exit(0)
+"""
+    run = subprocess.run([sys.executable, "-c", crash], capture_output=True, text=True, check=True)
+    account_id = run.stdout.strip()
+
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    bank = storage.open()
+    assert bank.get_account(account_id).balance == 150
+    bank.deposit(account_id, "1000")
+    storage.close()
+    assert Storage(tmp_path).load()[account_id].balance == 1150
+
+    # With no segment left at all, the log continues from the snapshot's offset
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    bank = storage.open()
+    assert bank.checkpoint()
+    storage.close()
+    for _, segment in segments(tmp_path / "bank.wal"):
+        segment.unlink()
+    storage = Storage(tmp_path, sync="always", checkpoint_every=0)
+    storage.open().deposit(account_id, "1")
+    storage.close()
+    assert Storage(tmp_path).load()[account_id].balance == 1151
+
+
+def test_query_by_time_range_type_and_pages():
+    """
+    Tests range queries on timestamps, filtering by type, and paging through results with a cursor
+    """
+    account = Account(starting_balance="10000")
+    base = 1_700_000_000_000_000
+    for i in range(100):
+        ledger_type = "DEPOSIT" if i % 4 else "WITHDRAW"
+        account._ledger.append(bytes(16), base + i * 1_000_000, ledger_type, i + 1, 0, "")
+
+    t = lambda i: from_micros(base + i * 1_000_000)  # noqa: E731
+    page = account.query(start=t(10), end=t(20))
+    assert [x.amount for x in page.transactions] == list(range(11, 21))
+    assert page.next_cursor is None
+
+    withdrawals = account.query(start=t(10), end=t(50), transaction_type="WITHDRAW")
+    assert [x.amount for x in withdrawals.transactions] == [13, 17, 21, 25, 29, 33, 37, 41, 45, 49]
+
+    seen, cursor = [], None
+    while True:
+        page = account.query(transaction_type="DEPOSIT", limit=30, cursor=cursor)
+        seen += [x.amount for x in page.transactions]
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == [i + 1 for i in range(100) if i % 4]
+
+    # find() only copies the rows a page needs, plus one to tell if there is a next page
+    ledger = account._ledger
+    assert list(ledger.find(type_code=0, after_row=5, limit=3)) == [5, 6, 7]
+    assert list(ledger.find(start_us=base, after_row=95, limit=10)) == [95, 96, 97, 98, 99]
+
+    assert len(account.query(start=t(200)).transactions) == 0
+    with pytest.raises(InvalidTransactionError):
+        account.query(transaction_type="TRANSFER")
+
+
+def test_query_sees_new_transactions():
+    """
+    Tests that the type index keeps up with deposits and batches posted after an earlier query
+    """
+    account = Account(starting_balance="100")
+    account.deposit("1")
+    assert len(account.query(transaction_type="DEPOSIT").transactions) == 1
+    account.post_batch([("WITHDRAW", "2"), ("DEPOSIT", "3")])
+    deposits = account.query(transaction_type="DEPOSIT").transactions
+    assert [t.amount for t in deposits] == [1, 3]
+    assert [t.amount for t in account.query(start=deposits[0].timestamp).transactions] == [1, 2, 3]
+
+
+def test_statement_streams_in_every_format():
+    """
+    Tests the streamed statement formats against the Transaction objects and that files get chunked writes
+    """
+    account = Account(starting_balance="1000")
+    account.deposit("250", 'Refund, "late"')
+    account.withdraw("100", "Rent")
+    account.post_batch([("DEPOSIT", "5", "Salary")] * 50)
+    transactions = list(account.get_transactions())
+
+    text = account.get_statement()
+    assert text.splitlines()[3:] == [str(t) for t in transactions]
+    assert "".join(account.iter_statement()) == text + "\n"
+
+    rows = list(csv.DictReader(io.StringIO("".join(account.iter_statement(format="csv")))))
+    assert [r["description"] for r in rows[:2]] == ['Refund, "late"', "Rent"]
+    assert [datetime.fromisoformat(r["timestamp"]) for r in rows] == [t.timestamp for t in transactions]
+    assert [r["transaction_id"] for r in rows] == [t.transaction_id for t in transactions]
+
+    records = [json.loads(line) for line in account.iter_statement(format="jsonl")]
+    assert records[1] == {
+        "transaction_id": transactions[1].transaction_id,
+        "timestamp": transactions[1].timestamp.isoformat(),
+        "transaction_type": "WITHDRAW",
+        "amount": 100,
+        "balance_after": 1150,
+        "description": "Rent",
+    }
+
+    class CountingFile(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            self.writes += 1
+            return super().write(s)
+
+    out = CountingFile()
+    next_cursor = account.write_statement(out, format="jsonl", limit=40, chunk_size=1024)
+    assert out.getvalue().count("\n") == 40
+    assert 1 < out.writes < 40
+    rest = CountingFile()
+    assert account.write_statement(rest, format="jsonl", cursor=next_cursor) is None
+    assert [json.loads(line) for line in (out.getvalue() + rest.getvalue()).splitlines()] == records
+
+    with pytest.raises(ValueError):
+        account.write_statement(io.StringIO(), format="xml")
+
+
+def test_parse_amount_validates_in_one_pass_and_caches():
+    """
+    Tests parse_amount against the amount rules and that repeated amounts hit its cache
+    """
+    assert parse_amount("1500") == 1500
+    assert parse_amount("0", minimum=0) == 0
+    for bad in ["", " 10", "10 ", "-5", "+5", "1.5", "1_000", "٠١٢", "²", "0", 10, None]:
+        with pytest.raises(InvalidTransactionError):
+            parse_amount(bad)
+
+    _parse_digits.cache_clear()
+    account = Account(starting_balance="0")
+    for _ in range(100):
+        account.deposit("2500", "Salary")
+    info = _parse_digits.cache_info()
+    assert (info.misses, info.hits) == (2, 99)
+    assert account.balance == 250_000
+
+
+def test_id_provider_issues_time_ordered_ids():
+    """
+    Tests that default ids are unique UUIDv7s in creation order and that a custom provider supplies ids and timestamps
+    """
+    account = Account(starting_balance="100")
+    account.deposit("1")
+    account.post_batch([("DEPOSIT", "1")] * 500)
+    account.withdraw("1")
+    ids = [UUID(t.transaction_id) for t in account.get_transactions()]
+    assert len(set(ids)) == len(ids) == 502
+    assert ids == sorted(ids)
+    assert {u.version for u in ids} == {7}
+
+    class FixedClock(IdProvider):
+        def now_us(self):
+            return 1_700_000_000_000_000
+
+    fixed = Account(starting_balance="0", ids=FixedClock())
+    transaction = fixed.deposit("5")
+    assert transaction.timestamp == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert int.from_bytes(UUID(transaction.transaction_id).bytes[:6], "big") == 1_700_000_000_000
+
+
+def test_reconcile_finds_discrepancies_in_parallel(tmp_path):
+    """
+    Tests reconciling accounts recovered from storage in a process pool, then with tampered ledgers
+    """
+    storage = Storage(tmp_path, sync="none")
+    bank = storage.open(shards=4)
+    ids = [bank.open_account("100").account_id for _ in range(20)]
+    for i, account_id in enumerate(ids):
+        for _ in range(i):
+            bank.deposit(account_id, "5")
+            bank.withdraw(account_id, "3")
+    storage.close()
+
+    accounts = list(Storage(tmp_path).load().values())
+    report = reconcile(accounts, workers=2)
+    assert report.ok
+    assert (report.accounts, report.transactions) == (20, 380)
+
+    by_id = {a.account_id: a for a in accounts}
+    by_id[ids[3]]._ledger.balances[2] += 1
+    by_id[ids[7]]._balance += 4
+    by_id[ids[9]]._ledger.types[0] = 5
+    by_id[ids[11]]._ledger.amounts[0] = 500
+    found = {(d.account_id, d.kind, d.row) for d in reconcile(accounts, workers=2).discrepancies}
+    assert found == {
+        (ids[3], "chain", 2),
+        (ids[3], "chain", 3),
+        (ids[7], "balance", None),
+        (ids[9], "type", 0),
+        (ids[11], "opening", 0),
+    }
+    assert reconcile(accounts, workers=1).discrepancies == reconcile(accounts, workers=2).discrepancies
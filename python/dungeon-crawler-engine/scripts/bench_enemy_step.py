@@ -0,0 +1,118 @@
+"""
+Time and memory per Enemy.act call: the original float Vector2D version, which allocates a
+new vector for every -, normalise, step and position assignment, against integer GridPos
+positions updated in place with squared distance checks. Entities coerce any assigned
+position to GridPos, so the original version runs on GridPos positions too
+
+Run from the project root:
+    python -m scripts.bench_enemy_step
+"""
+
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from random import Random
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dungeon import Enemy, Goblin, Player, Room, Vector2D  # noqa: E402
+
+ENEMIES = 1_000
+STEPS = 20
+ROOM_SIZE = 64
+REPEATS = 5
+
+
+def legacy_act(enemy: Enemy, player: Player, room: Room | None):
+    """
+    Enemy.act as it was before positions became GridPos
+    """
+    diff = Vector2D(player.position.x, player.position.y) - enemy.position
+    distance = diff.magnitude()
+
+    if distance <= 1:
+        player.take_damage(enemy.attack)
+    elif distance <= enemy.aggro_range:
+        old_pos = enemy.position
+        if room is None:
+            step = diff.normalise()
+            enemy.position = enemy.position + Vector2D(round(step.x), round(step.y))
+            return
+
+        if not room.visibility.can_see(player.position, enemy.position):
+            return
+        step = room.pathfinder.step_towards(enemy.position, player.position)
+        if step is not None:
+            enemy.position = Vector2D(*step)
+            room.move_entity(enemy, old_pos)
+
+
+def setup(seed: int = 7):
+    rng = Random(seed)
+    room = Room(width=ROOM_SIZE, height=ROOM_SIZE, rng=rng)
+    room.grid = [["." for _ in range(ROOM_SIZE)] for _ in range(ROOM_SIZE)]
+    centre = ROOM_SIZE // 2
+    player = Player("Bench", hp=10**9, attack=0, position=Vector2D(centre, centre))
+
+    enemies = []
+    for _ in range(ENEMIES):
+        x = centre + rng.randint(-4, 4)
+        y = centre + rng.randint(-4, 4)
+        enemies.append(Goblin(position=Vector2D(x, y)))
+    room.entities = enemies
+    return room, player, enemies
+
+
+def run_steps(act, room, player, enemies):
+    for _ in range(STEPS):
+        for enemy in enemies:
+            act(enemy, player, room)
+
+
+def measure(act, use_room: bool) -> tuple[float, float]:
+    # Best-of time per step, then bytes allocated at peak per step on a fresh setup
+    best = float("inf")
+    for _ in range(REPEATS):
+        room, player, enemies = setup()
+        start = time.perf_counter()
+        run_steps(act, room if use_room else None, player, enemies)
+        best = min(best, time.perf_counter() - start)
+
+    room, player, enemies = setup()
+    room_arg = room if use_room else None
+    peak_total = 0
+    tracemalloc.start()
+    for _ in range(STEPS):
+        for enemy in enemies:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            act(enemy, player, room_arg)
+            peak_total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    steps = STEPS * ENEMIES
+    return best / steps, peak_total / steps
+
+
+def run() -> None:
+    # Attack messages would dominate the timings
+    logging.getLogger("dungeon").setLevel(logging.WARNING)
+
+    def new_act(enemy, player, room):
+        enemy.act(player, room)
+
+    print(f"{ENEMIES} enemies x {STEPS} steps")
+    print(f"{'mode':>8} | {'version':>8} | {'ns/step':>8} | {'peak bytes/step':>15}")
+    for use_room in (False, True):
+        mode = "room" if use_room else "no room"
+        before_time, before_bytes = measure(legacy_act, use_room)
+        after_time, after_bytes = measure(new_act, use_room)
+        print(f"{mode:>8} | {'before':>8} | {before_time * 1e9:>8.0f} | {before_bytes:>15.0f}")
+        print(f"{mode:>8} | {'after':>8} | {after_time * 1e9:>8.0f} | {after_bytes:>15.0f}")
+        print(f"{'':>8} | speedup {before_time / after_time:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
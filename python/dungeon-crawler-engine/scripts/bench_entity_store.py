@@ -0,0 +1,79 @@
+"""
+Compares ticks/sec of the per-object Enemy.act loop against the vectorised EntityStore.update
+
+Run from the project root:
+    python -m scripts.bench_entity_store
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dungeon import Goblin, Player, Troll, Vector2D  # noqa: E402
+from entity_store import EntityStore  # noqa: E402
+
+SIZES = [10, 1_000, 100_000]
+ROOM_SIZE = 1_000
+TIME_BUDGET = 1.0
+
+
+def make_player() -> Player:
+    # Effectively unkillable so every tick does the same amount of work
+    return Player("Bench", hp=10**12, attack=0, position=Vector2D(500, 500))
+
+
+def spawn_positions(count: int, seed: int = 42) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, ROOM_SIZE, count), rng.integers(0, ROOM_SIZE, count)
+
+
+def bench_objects(count: int) -> float:
+    xs, ys = spawn_positions(count)
+    enemies = [
+        (Goblin if i % 2 else Troll)(Vector2D(int(x), int(y)))
+        for i, (x, y) in enumerate(zip(xs, ys))
+    ]
+    player = make_player()
+
+    ticks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_BUDGET:
+        for e in enemies:
+            e.act(player)
+        dead = [e for e in enemies if not e.is_alive()]
+        for e in dead:
+            player.gain_xp(e.xp_reward)
+        enemies = [e for e in enemies if e.is_alive()]
+        ticks += 1
+    return ticks / (time.perf_counter() - start)
+
+
+def bench_store(count: int) -> float:
+    xs, ys = spawn_positions(count)
+    store = EntityStore(capacity=count)
+    store.spawn_many(Troll, xs[::2], ys[::2])
+    store.spawn_many(Goblin, xs[1::2], ys[1::2])
+    player = make_player()
+
+    ticks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_BUDGET:
+        store.update(player)
+        ticks += 1
+    return ticks / (time.perf_counter() - start)
+
+
+def run() -> None:
+    print(f"{'enemies':>10} | {'objects t/s':>12} | {'store t/s':>12} | speedup")
+    for count in SIZES:
+        objects = bench_objects(count)
+        store = bench_store(count)
+        print(f"{count:>10} | {objects:>12.1f} | {store:>12.1f} | {store / objects:.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,71 @@
+"""
+Events dispatched per second: the original list-of-Event queue with a string match per
+event against the pooled EventBus with integer-coded handler tables
+
+Run from the project root:
+    python -m scripts.bench_events
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dungeon import Event, Goblin, Vector2D  # noqa: E402
+from events import EventBus, EventType  # noqa: E402
+
+BATCH = 1_000
+ROUNDS = 500
+
+
+def bench_legacy(target) -> float:
+    inventory: list[str] = []
+    queue: list[Event] = []
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for i in range(BATCH):
+            if i % 10:
+                queue.append(Event(type="damage", target=target, amount=1))
+            else:
+                queue.append(Event(type="loot", target=target, item="gold"))
+        for event in queue:
+            match event.type:
+                case "damage":
+                    event.target.take_damage(event.amount)
+                case "loot":
+                    inventory.append(event.item)
+        queue.clear()
+        inventory.clear()
+    return BATCH * ROUNDS / (time.perf_counter() - start)
+
+
+def bench_bus(target) -> float:
+    inventory: list[str] = []
+    bus = EventBus(capacity=BATCH)
+    bus.on(EventType.DAMAGE, lambda e: e.target.take_damage(e.amount))
+    bus.on(EventType.LOOT, lambda e: inventory.append(e.item))
+    emit = bus.emit
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for i in range(BATCH):
+            if i % 10:
+                emit(EventType.DAMAGE, target, 1)
+            else:
+                emit(EventType.LOOT, target, 0, "gold")
+        bus.dispatch()
+        inventory.clear()
+    return BATCH * ROUNDS / (time.perf_counter() - start)
+
+
+def run() -> None:
+    target = Goblin(Vector2D(0, 0))
+    target.hp = 10**12
+    legacy = bench_legacy(target)
+    bus = bench_bus(target)
+    print(f"legacy queue: {legacy:>12,.0f} events/s")
+    print(f"EventBus:     {bus:>12,.0f} events/s ({bus / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    run()
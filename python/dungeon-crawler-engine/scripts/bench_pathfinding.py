@@ -0,0 +1,73 @@
+"""
+Compares one shared flow field per tick against running A* for every enemy
+
+Run from the project root:
+    python -m scripts.bench_pathfinding
+"""
+
+import sys
+import time
+from pathlib import Path
+from random import Random
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dungeon import Room  # noqa: E402
+from pathfinding import FlowField, astar  # noqa: E402
+
+ROOM_SIZE = 128
+ENEMY_COUNTS = [10, 100, 1_000]
+MAX_DISTANCE = 32
+REPEATS = 5
+
+
+def setup(count: int, seed: int = 42):
+    rng = Random(seed)
+    room = Room(width=ROOM_SIZE, height=ROOM_SIZE, rng=rng)
+    target = (ROOM_SIZE // 2, ROOM_SIZE // 2)
+    room.grid[target[1]][target[0]] = "."
+
+    # Enemies scattered within chasing distance of the player
+    enemies = []
+    while len(enemies) < count:
+        x = target[0] + rng.randint(-MAX_DISTANCE // 2, MAX_DISTANCE // 2)
+        y = target[1] + rng.randint(-MAX_DISTANCE // 2, MAX_DISTANCE // 2)
+        if room.grid[y][x] != "#":
+            enemies.append((x, y))
+    return room, target, enemies
+
+
+def tick_flow_field(room: Room, target, enemies) -> None:
+    field = FlowField(room, target, MAX_DISTANCE)
+    for x, y in enemies:
+        field.next_step(x, y)
+
+
+def tick_astar(room: Room, target, enemies) -> None:
+    for start in enemies:
+        astar(room, start, target)
+
+
+def best_of(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run() -> None:
+    print(f"{'enemies':>8} | {'flow field ms':>13} | {'A* ms':>10} | speedup")
+    for count in ENEMY_COUNTS:
+        room, target, enemies = setup(count)
+        flow = best_of(tick_flow_field, room, target, enemies)
+        per_enemy = best_of(tick_astar, room, target, enemies)
+        print(
+            f"{count:>8} | {flow * 1000:>13.2f} | {per_enemy * 1000:>10.2f} | "
+            f"{per_enemy / flow:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,51 @@
+"""
+Snapshot save and load times for rooms from 64x64 up to 1024x1024 tiles, next to the time
+to generate a room of the same size. Loading passes the saved tiles straight to
+Room(tiles=...) instead of generating a layout and overwriting it
+
+Run from the project root:
+    python -m scripts.bench_snapshot
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+from random import Random
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dungeon import GameEngine, Room  # noqa: E402
+from replay import load_snapshot, save_snapshot  # noqa: E402
+
+SIZES = [64, 256, 1024]
+REPEATS = 5
+
+
+def best(fn) -> float:
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run() -> None:
+    print(f"{'size':>10} | {'generate ms':>11} | {'save ms':>8} | {'load ms':>8} | {'bytes':>10}")
+    for size in SIZES:
+        generate = best(lambda: Room(size, size, rng=Random(1)))
+        engine = GameEngine("Bench", room=Room(size, size, rng=Random(1)))
+        buf = io.BytesIO()
+        save = best(lambda: save_snapshot(engine, io.BytesIO()))
+        save_snapshot(engine, buf)
+        data = buf.getvalue()
+        load = best(lambda: load_snapshot(io.BytesIO(data)))
+        print(
+            f"{f'{size}x{size}':>10} | {generate * 1e3:>11.1f} | {save * 1e3:>8.1f} | "
+            f"{load * 1e3:>8.1f} | {len(data):>10,}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,115 @@
+"""
+Load generator for the line-protocol game server. Starts the server in its own process,
+opens N client sessions that each send a random command every tick, then asks the server
+for its tick latency stats.
+
+Run from the project root:
+    python -m scripts.load_test --sessions 1000 10000 --duration 10
+
+10k sessions need an open file limit above 10k (ulimit -n).
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from server import COMMANDS, serve  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+def run_server(port: int, tick_rate: float) -> None:
+    import logging
+
+    logging.getLogger("dungeon").setLevel(logging.WARNING)
+    asyncio.run(serve(HOST, port, tick_rate))
+
+
+async def client(port: int, interval: float, stop_at: float, rng: random.Random) -> int:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    commands = sorted(COMMANDS)
+    received = 0
+
+    async def drain_lines():
+        nonlocal received
+        while await reader.readline():
+            received += 1
+
+    reading = asyncio.create_task(drain_lines())
+    # Spread the first command over one tick so clients don't all fire together
+    await asyncio.sleep(rng.random() * interval)
+    while time.monotonic() < stop_at:
+        writer.write(f"{rng.choice(commands)}\n".encode())
+        await asyncio.sleep(interval)
+
+    writer.close()
+    reading.cancel()
+    return received
+
+
+async def query_stats(port: int) -> dict:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(b"stats\n")
+    while True:
+        line = (await reader.readline()).decode()
+        if line.startswith("S "):
+            writer.close()
+            return json.loads(line[2:])
+
+
+async def connect_all(port: int, sessions: int, tick_rate: float, duration: float):
+    stop_at = time.monotonic() + duration
+    rng = random.Random(0)
+    tasks = [
+        asyncio.create_task(client(port, 1.0 / tick_rate, stop_at, random.Random(rng.random())))
+        for _ in range(sessions)
+    ]
+    # Let every session connect and the server settle before sampling latency
+    await asyncio.sleep(duration * 0.9)
+    stats = await query_stats(port)
+    received = await asyncio.gather(*tasks)
+    return stats, sum(received)
+
+
+def run(sessions: int, tick_rate: float, duration: float, port: int) -> None:
+    server = multiprocessing.Process(target=run_server, args=(port, tick_rate), daemon=True)
+    server.start()
+    time.sleep(0.5)
+    try:
+        stats, lines = asyncio.run(connect_all(port, sessions, tick_rate, duration))
+    finally:
+        server.terminate()
+        server.join()
+
+    # How many sessions one core could step within the tick budget at the p99 cost
+    per_session_ms = stats["p99_tick_ms"] / max(1, stats["sessions"])
+    sessions_per_core = stats["tick_budget_ms"] / per_session_ms if per_session_ms else 0
+    print(
+        f"sessions={stats['sessions']:>6} p50={stats['p50_tick_ms']:.2f}ms "
+        f"p99={stats['p99_tick_ms']:.2f}ms budget={stats['tick_budget_ms']:.0f}ms "
+        f"overruns={stats['overruns']} sessions/core@p99={sessions_per_core:,.0f} "
+        f"lines_received={lines:,}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    for count in args.sessions:
+        run(count, args.tick_rate, args.duration, args.port)
@@ -0,0 +1,191 @@
+"""
+Fixed-timestep asyncio game loop. update() runs at tick_rate whether or not the player typed
+anything, input arrives as events on the event loop, and rendering runs as its own task at a
+capped frame rate. Several loops can share one event loop to host many sessions per process.
+
+    PYTHONPATH=src python -m async_loop
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dungeon import GameEngine
+from renderer import DiffRenderer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopStats:
+    ticks: int = 0
+    frames: int = 0
+    overruns: int = 0
+    skipped_ticks: int = 0
+    max_tick_time: float = 0.0
+    total_tick_time: float = 0.0
+    tick_times: list[float] = field(default_factory=list)
+
+    @property
+    def mean_tick_time(self) -> float:
+        return self.total_tick_time / self.ticks if self.ticks else 0.0
+
+
+class AsyncGameLoop:
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        tick_rate: float = 4.0,
+        frame_rate: float = 30.0,
+        inputs: Optional[asyncio.Queue[str]] = None,
+        max_catchup: int = 5,
+        record_tick_times: bool = False,
+    ):
+        """
+        frame_rate=0 disables rendering (headless). If the loop falls more than max_catchup
+        ticks behind, the missed ticks are dropped rather than run back to back
+        """
+        self.engine = engine
+        self.tick_interval = 1.0 / tick_rate
+        self.frame_interval = 1.0 / frame_rate if frame_rate > 0 else None
+        self.inputs: asyncio.Queue[str] = inputs if inputs is not None else asyncio.Queue()
+        self.max_catchup = max_catchup
+        self.record_tick_times = record_tick_times
+        self.stats = LoopStats()
+        self.result: Optional[str] = None
+        self._stopped = asyncio.Event()
+
+    def send(self, command: str):
+        """
+        Queue a command for the next tick. Safe to call from any task on the same loop
+        """
+        self.inputs.put_nowait(command)
+
+    def stop(self):
+        self._stopped.set()
+
+    def tick(self):
+        # At most one command per tick so input can't speed the simulation up
+        try:
+            command = self.inputs.get_nowait()
+        except asyncio.QueueEmpty:
+            command = ""
+
+        if command == "q":
+            self.stop()
+            return
+
+        start = time.perf_counter()
+        self.result = self.engine.step(command)
+        elapsed = time.perf_counter() - start
+
+        stats = self.stats
+        stats.ticks += 1
+        stats.total_tick_time += elapsed
+        stats.max_tick_time = max(stats.max_tick_time, elapsed)
+        if self.record_tick_times:
+            stats.tick_times.append(elapsed)
+        if elapsed > self.tick_interval:
+            stats.overruns += 1
+            logger.warning(
+                "Tick %d took %.2f ms (budget %.2f ms)",
+                stats.ticks,
+                elapsed * 1000,
+                self.tick_interval * 1000,
+            )
+
+        if self.result is not None:
+            self.stop()
+
+    async def _simulate(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while not self._stopped.is_set():
+            self.tick()
+            next_tick += self.tick_interval
+
+            now = loop.time()
+            behind = int((now - next_tick) / self.tick_interval)
+            if behind > self.max_catchup:
+                # Too far behind: drop the backlog instead of spiralling
+                self.stats.skipped_ticks += behind
+                next_tick += behind * self.tick_interval
+
+            await asyncio.sleep(max(0.0, next_tick - now))
+
+    async def _render(self):
+        while not self._stopped.is_set():
+            self.engine.render()
+            self.stats.frames += 1
+            await asyncio.sleep(self.frame_interval)
+
+    async def run(self, max_ticks: Optional[int] = None) -> Optional[str]:
+        """
+        Runs until win/lose, "q", stop(), or max_ticks. Returns the result like step()
+        """
+        tasks = [asyncio.create_task(self._simulate())]
+        if self.frame_interval is not None:
+            tasks.append(asyncio.create_task(self._render()))
+        if max_ticks is not None:
+            tasks.append(asyncio.create_task(self._stop_after(max_ticks)))
+
+        await self._stopped.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.frame_interval is not None:
+            self.engine.render()
+        return self.result
+
+    async def _stop_after(self, ticks: int):
+        while self.stats.ticks < ticks:
+            await asyncio.sleep(self.tick_interval)
+        self.stop()
+
+
+def attach_stdin(game_loop: AsyncGameLoop):
+    """
+    Feeds lines typed on stdin into the loop's input queue without blocking the event loop
+    """
+    loop = asyncio.get_running_loop()
+
+    def on_readable():
+        line = sys.stdin.readline()
+        if not line:
+            loop.remove_reader(sys.stdin.fileno())
+            game_loop.stop()
+            return
+        game_loop.send(line.strip().lower())
+
+    loop.add_reader(sys.stdin.fileno(), on_readable)
+
+
+async def main(name: str, tick_rate: float, frame_rate: float):
+    engine = GameEngine(name)
+    # Frames redraw while the player types, so don't touch the prompt line unless needed
+    engine.renderer = DiffRenderer(park_unchanged=False)
+    game_loop = AsyncGameLoop(engine, tick_rate=tick_rate, frame_rate=frame_rate)
+    attach_stdin(game_loop)
+    result = await game_loop.run()
+
+    if result == "win":
+        print("You escaped the dungeon")
+    elif result == "lose":
+        print("You died!")
+    stats = game_loop.stats
+    print(
+        f"ticks={stats.ticks} frames={stats.frames} overruns={stats.overruns} "
+        f"mean_tick={stats.mean_tick_time * 1000:.3f}ms max_tick={stats.max_tick_time * 1000:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main("Hero", tick_rate=4.0, frame_rate=30.0))
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from random import random
+import itertools
+import logging
+from random import Random
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from enum import IntEnum
+from typing import Iterator, Literal, Optional
 
+import numpy as np
+
+from events import EventBus, EventRecord, EventType
+from fov import Visibility
+from pathfinding import Pathfinder
+from renderer import DiffRenderer
+
+logger = logging.getLogger(__name__)
 
 @dataclass(slots=True)
 class Vector2D:
@@ -49,6 +60,80 @@ class Vector2D:
         return Vector2D(self.x / mag, self.y / mag)
 
 
+class GridPos:
+    """
+    Mutable integer tile position used for entity positions. += and -= update it in place
+    so movement doesn't allocate, which means anyone holding a reference sees the change:
+    copy() it first if the old position is still needed. Compares equal to a Vector2D with
+    the same coordinates
+    """
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: int, y: int):
+        self.x = int(x)
+        self.y = int(y)
+
+    @classmethod
+    def of(cls, pos: Vector2D | GridPos) -> GridPos:
+        return cls(pos.x, pos.y)
+
+    def copy(self) -> GridPos:
+        return GridPos(self.x, self.y)
+
+    def set(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def __iadd__(self, other: Vector2D | GridPos) -> GridPos:
+        self.x += int(other.x)
+        self.y += int(other.y)
+        return self
+
+    def __isub__(self, other: Vector2D | GridPos) -> GridPos:
+        self.x -= int(other.x)
+        self.y -= int(other.y)
+        return self
+
+    def __add__(self, other: Vector2D | GridPos) -> GridPos:
+        return GridPos(self.x + int(other.x), self.y + int(other.y))
+
+    def __sub__(self, other: Vector2D | GridPos) -> GridPos:
+        return GridPos(self.x - int(other.x), self.y - int(other.y))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (GridPos, Vector2D)):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
+
+    # Mutable, so not hashable. Use (pos.x, pos.y) as a key
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"GridPos(x={self.x}, y={self.y})"
+
+    def distance_sq(self, other: Vector2D | GridPos) -> int:
+        dx, dy = self.x - other.x, self.y - other.y
+        return dx * dx + dy * dy
+
+    def magnitude(self) -> float:
+        return (self.x * self.x + self.y * self.y) ** 0.5
+
+    def normalise(self) -> Vector2D:
+        return Vector2D(self.x, self.y).normalise()
+
+
+# The 8 neighbour offsets, indexed by (dy + 1) * 3 + (dx + 1) for dx, dy in -1..1. The
+# centre slot is the zero offset. Shared instances: only ever add them, never mutate them
+NEIGHBOUR_OFFSETS = tuple(GridPos(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
+# Tiles within attack range (distance <= 1) of a position, in row-major order
+ATTACK_OFFSETS = ((0, -1), (-1, 0), (0, 0), (1, 0), (0, 1))
+
+
+ENTITY_UIDS = itertools.count(1)
+
+
 @dataclass
 class Entity(ABC):
 
@@ -57,6 +142,17 @@ class Entity(ABC):
     attack: int
     position: Vector2D
 
+    def __setattr__(self, name: str, value):
+        # Entities own their position, so it can be moved in place without aliasing. Any
+        # assignment, not just the constructor's, stores a private GridPos copy
+        if name == "position":
+            value = GridPos.of(value)
+        object.__setattr__(self, name, value)
+
+    def __post_init__(self):
+        # Stable identity for clients and logs (id() values are reused after collection)
+        self.uid = next(ENTITY_UIDS)
+
     def is_alive(self) -> bool:
         return self.hp > 0
 
@@ -68,54 +164,300 @@ class Entity(ABC):
         pass
 
 
+class SpatialHash:
+    """
+    Buckets entities by grid cell so position and radius lookups only touch nearby cells
+    instead of scanning every entity in the room
+    """
+
+    def __init__(self, cell_size: int = 1):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[Entity]] = {}
+
+    def _key(self, pos: Vector2D) -> tuple[int, int]:
+        return int(pos.x) // self.cell_size, int(pos.y) // self.cell_size
+
+    def clear(self):
+        self._cells.clear()
+
+    def insert(self, entity: Entity):
+        self._cells.setdefault(self._key(entity.position), []).append(entity)
+
+    def remove(self, entity: Entity, pos: Optional[Vector2D] = None) -> bool:
+        """
+        Removes the entity from the cell for pos (defaults to its current position).
+        Returns False if the entity was not indexed there
+        """
+        key = self._key(entity.position if pos is None else pos)
+        bucket = self._cells.get(key, ())
+        # Entities are dataclasses with value equality, so match on identity
+        for i, e in enumerate(bucket):
+            if e is entity:
+                break
+        else:
+            return False
+        del bucket[i]
+        if not bucket:
+            del self._cells[key]
+        return True
+
+    def move(self, entity: Entity, old_pos: Vector2D):
+        """
+        Re-buckets an entity after its position changed. Untracked entities are ignored
+        """
+        if self._key(old_pos) == self._key(entity.position):
+            return
+        if self.remove(entity, old_pos):
+            self.insert(entity)
+
+    def at(self, pos: Vector2D) -> list[Entity]:
+        bucket = self._cells.get(self._key(pos))
+        if not bucket:
+            return []
+        return [e for e in bucket if e.position == pos]
+
+    def at_xy(self, x: int, y: int) -> list[Entity]:
+        bucket = self._cells.get((x // self.cell_size, y // self.cell_size))
+        if not bucket:
+            return []
+        return [e for e in bucket if e.position.x == x and e.position.y == y]
+
+    def within(self, pos: Vector2D, radius: float) -> list[Entity]:
+        """
+        Entities whose euclidean distance to pos is <= radius
+        """
+        cs = self.cell_size
+        min_x, max_x = int(pos.x - radius) // cs, int(pos.x + radius) // cs
+        min_y, max_y = int(pos.y - radius) // cs, int(pos.y + radius) // cs
+        radius_sq = radius * radius
+
+        found = []
+        for cy in range(min_y, max_y + 1):
+            for cx in range(min_x, max_x + 1):
+                for e in self._cells.get((cx, cy), ()):
+                    dx = e.position.x - pos.x
+                    dy = e.position.y - pos.y
+                    if dx * dx + dy * dy <= radius_sq:
+                        found.append(e)
+        return found
+
+    def occupied(self, x: int, y: int) -> bool:
+        bucket = self._cells.get((x // self.cell_size, y // self.cell_size))
+        if not bucket:
+            return False
+        if self.cell_size == 1:
+            return True
+        return any(int(e.position.x) == x and int(e.position.y) == y for e in bucket)
+
+
+class Tile(IntEnum):
+    """
+    Tile codes stored in Room.tiles. Values are the ASCII characters they render as
+    """
+
+    FLOOR = ord(".")
+    WALL = ord("#")
+    EXIT = ord("E")
+
+
+WALL = int(Tile.WALL)
+WALL_CHANCE = 0.15
+
+
+class TileRow:
+    """
+    str-based view of one row of Room.tiles, so grid[y][x] reads and writes still work
+    """
+
+    __slots__ = ("_room", "_start")
+
+    def __init__(self, room: Room, y: int):
+        self._room = room
+        self._start = y * room.width
+
+    def __len__(self) -> int:
+        return self._room.width
+
+    def __getitem__(self, x: int) -> str:
+        return chr(self._room.tiles[self._start + range(self._room.width)[x]])
+
+    def __setitem__(self, x: int, tile: str):
+        self._room.tiles[self._start + range(self._room.width)[x]] = ord(tile)
+        self._room.grid_version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(str(self))
+
+    def __contains__(self, tile: str) -> bool:
+        return tile.encode("ascii") in self._room.tiles[self._start : self._start + len(self)]
+
+    def __str__(self) -> str:
+        return self._room.tiles[self._start : self._start + len(self)].decode("ascii")
+
+
+class TileGrid:
+    """
+    list[list[str]]-compatible view over the compact tile buffer
+    """
+
+    __slots__ = ("_room",)
+
+    def __init__(self, room: Room):
+        self._room = room
+
+    def __len__(self) -> int:
+        return self._room.height
+
+    def __getitem__(self, y: int) -> TileRow:
+        return TileRow(self._room, range(self._room.height)[y])
+
+    def __iter__(self) -> Iterator[TileRow]:
+        return (TileRow(self._room, y) for y in range(self._room.height))
+
+
 class Room:
 
-    def __init__(self, width: int = 10, height: int = 10):
+    # World coordinate of tiles[0]. A standalone room starts at the origin
+    origin: tuple[int, int] = (0, 0)
+
+    def __init__(
+        self,
+        width: int = 10,
+        height: int = 10,
+        rng: Optional[Random] = None,
+        tiles: Optional[bytes] = None,
+    ):
+        """
+        Passing tiles (width * height Tile codes) restores a saved layout instead of generating
+        """
         self.width = width
         self.height = height
-        self.entities: list[Enemy] = []
-        self.grid = self._generate()
+        self.rng = rng if rng is not None else Random()
+        self.index = SpatialHash()
+        self._entities: list[Enemy] = []
+        # Bumped on every tile change so cached pathfinding data knows when to rebuild
+        self.grid_version = 0
+        # One byte per tile (a Tile code), row-major. tile_array is a zero-copy NumPy view
+        self.tiles = bytearray(tiles) if tiles is not None else bytearray(width * height)
+        if len(self.tiles) != width * height:
+            raise ValueError(f"Expected {width * height} tiles, got {len(self.tiles)}")
+        self.tile_array = np.frombuffer(self.tiles, dtype=np.uint8).reshape(
+            height, width
+        )
+        if tiles is None:
+            self._generate()
+        self.pathfinder = Pathfinder(self)
+        self.visibility = Visibility(self)
+
+    @property
+    def entities(self) -> list[Enemy]:
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities: list[Enemy]):
+        # Replacing the whole list rebuilds the spatial index
+        self._entities = list(entities)
+        self.index.clear()
+        for e in self._entities:
+            self.index.insert(e)
+
+    def add_entity(self, entity: Enemy):
+        self._entities.append(entity)
+        self.index.insert(entity)
+
+    def remove_entity(self, entity: Enemy):
+        self._entities = [e for e in self._entities if e is not entity]
+        self.index.remove(entity)
+
+    def move_entity(self, entity: Entity, old_pos: Vector2D):
+        """
+        Must be called after an entity's position changes to keep the spatial index in sync
+        """
+        self.index.move(entity, old_pos)
 
-    def _generate(self) -> list[list[str]]:
-        grid = [["." for _ in range(self.width)] for _ in range(self.height)]
+    @property
+    def grid(self) -> TileGrid:
+        return TileGrid(self)
 
-        # Place walls randomly (~15% of tiles)
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x, y) != (1, 1) and random() < 0.15:
-                    grid[y][x] = "#"
+    @grid.setter
+    def grid(self, rows: list[list[str]]):
+        self.tiles[:] = "".join("".join(row) for row in rows).encode("ascii")
+        self.grid_version += 1
 
-        # Guarantee exit
-        grid[self.height - 1][self.width - 1] = "E"
-        return grid
+    def _generate(self):
+        """
+        Fills tile_array in place
+        """
+        # Seed NumPy from the room rng so generation stays reproducible from one seed
+        np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        tiles = self.tile_array
+
+        # Place walls randomly (~15% of tiles) with one byte of randomness per tile
+        threshold = round(WALL_CHANCE * 256)
+        noise = np_rng.integers(0, 256, size=tiles.shape, dtype=np.uint8)
+        tiles.fill(Tile.FLOOR)
+        np.copyto(tiles, np.uint8(Tile.WALL), where=noise < threshold)
+
+        # Keep the player start clear and guarantee exit
+        if self.width > 1 and self.height > 1:
+            tiles[1, 1] = Tile.FLOOR
+        tiles[self.height - 1, self.width - 1] = Tile.EXIT
+
+    def set_tile(self, pos: Vector2D, tile: str):
+        """
+        Tile writes should go through here so grid_version stays accurate
+        """
+        self.tiles[int(pos.y) * self.width + int(pos.x)] = ord(tile)
+        self.grid_version += 1
+        self.visibility.tile_changed(int(pos.x), int(pos.y))
 
     def is_walkable(self, pos: Vector2D) -> bool:
-        x, y = int(pos.x), int(pos.y)
+        return self.walkable_at(int(pos.x), int(pos.y))
+
+    def walkable_at(self, x: int, y: int) -> bool:
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return False
-        return self.grid[y][x] != "#"
+        return self.tiles[y * self.width + x] != WALL
 
     def get_entities_at(self, pos: Vector2D) -> list[Enemy]:
-        return [e for e in self.entities if e.position == pos]
+        return self.index.at(pos)
+
+    def get_entities_within(self, pos: Vector2D, radius: float) -> list[Enemy]:
+        return self.index.within(pos, radius)
 
     def get_tile(self, pos: Vector2D) -> str:
-        return self.grid[int(pos.y)][int(pos.x)]
+        return chr(self.tiles[int(pos.y) * self.width + int(pos.x)])
+
+    def render_rows(
+        self, player: Player, visible: Optional[frozenset[tuple[int, int]]] = None
+    ) -> list[bytearray]:
+        """
+        One bytearray per row: tiles first, then enemies and the player drawn over them.
+        With a visible set (see Visibility.fov) everything outside it is left blank
+        """
+        w, h, tiles = self.width, self.height, self.tiles
+        if visible is None:
+            rows = [tiles[i : i + w] for i in range(0, w * h, w)]
+        else:
+            rows = [bytearray(b" " * w) for _ in range(h)]
+            for x, y in visible:
+                if 0 <= x < w and 0 <= y < h:
+                    rows[y][x] = tiles[y * w + x]
+
+        for e in self._entities:
+            x, y = int(e.position.x), int(e.position.y)
+            if visible is not None and (x, y) not in visible:
+                continue
+            if 0 <= x < self.width and 0 <= y < self.height:
+                rows[y][x] = ord("M")
+
+        x, y = int(player.position.x), int(player.position.y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            rows[y][x] = ord("P")
+        return rows
 
     def render(self, player: Player) -> str:
-        rows = []
-
-        for y in range(self.height):
-            row = ""
-            for x in range(self.width):
-                pos = Vector2D(x, y)
-                if player.position == pos:
-                    row += "P"
-                elif any(e.position == pos for e in self.entities):
-                    row += "M"
-                else:
-                    row += self.grid[y][x]
-            rows.append(row)
-        return "\n".join(rows)
+        return "\n".join(row.decode("ascii") for row in self.render_rows(player))
 
 
 class Player(Entity):
@@ -138,15 +480,22 @@ class Player(Entity):
         self.xp: int = xp
         self.level: int = 1
         self.inventory = inventory if inventory is not None else []
+        self.damage_taken: int = 0
+
+    def take_damage(self, amount: int):
+        self.damage_taken += min(self.hp, amount)
+        super().take_damage(amount)
 
     def move(self, direction: Vector2D, room: Room):
         """
         Takes a directions (Vector) and calculates the new position of the player
         Checks this new position against the room to see if it is valid before committing
         """
-        new_pos = self.position + direction
-        if room.is_walkable(new_pos):
-            self.position = new_pos
+        pos = self.position
+        if room.walkable_at(pos.x + int(direction.x), pos.y + int(direction.y)):
+            old_pos = pos.copy()
+            pos += direction
+            room.move_entity(self, old_pos)
 
     def gain_xp(self, amount: int):
         """
@@ -161,7 +510,7 @@ class Player(Entity):
         self.level += 1
         self.hp += 10
         self.attack += 2
-        print(f"Player has leveled up! Now level {self.level}")
+        logger.info("Player has leveled up! Now level %d", self.level)
 
     def attack_target(self, target: Enemy):
         target.take_damage(self.attack)
@@ -185,19 +534,35 @@ class Enemy(Entity):
         self.aggro_range = aggro_range
         self.xp_reward = xp_reward
 
-    def act(self, player: Player):
-        diff = player.position - self.position
-        distance = diff.magnitude()
+    def act(self, player: Player, room: Optional[Room] = None):
+        pos, target = self.position, player.position
+        dx, dy = target.x - pos.x, target.y - pos.y
+        # Squared integer distance, so no square roots or float vectors per step
+        distance_sq = dx * dx + dy * dy
 
-        if distance <= 1:
+        if distance_sq <= 1:
             # Adjacent attack
             player.take_damage(self.attack)
-            print(f"{self.name} attacks {player.name} for {self.attack} damage")
-        elif distance <= self.aggro_range:
-            # Player in range -> move towards player
-            step = diff.normalise()
-            new_pos = self.position + Vector2D(round(step.x), round(step.y))
-            self.position = new_pos
+            logger.info("%s attacks %s for %d damage", self.name, player.name, self.attack)
+        elif distance_sq <= self.aggro_range * self.aggro_range:
+            # Player in range -> move towards player, unless a wall hides them
+            if room is None:
+                # Same as rounding the normalised direction: an axis is stepped along when
+                # it makes up over half the distance (|dx| / distance > 0.5)
+                sx = (dx > 0) - (dx < 0) if 4 * dx * dx > distance_sq else 0
+                sy = (dy > 0) - (dy < 0) if 4 * dy * dy > distance_sq else 0
+                pos += NEIGHBOUR_OFFSETS[(sy + 1) * 3 + sx + 1]
+                return
+
+            if not room.visibility.can_see(target, pos):
+                return
+
+            # Follow the room's shared flow field so walls are respected
+            step = room.pathfinder.step_towards(pos, target)
+            if step is not None:
+                old_pos = pos.copy()
+                pos.set(*step)
+                room.move_entity(self, old_pos)
 
 
 class Goblin(Enemy):
@@ -224,6 +589,10 @@ class Troll(Enemy):
         )
 
 
+# Game messages shown under the HUD when a message buffer is attached
+MESSAGE_LINES = 3
+
+
 DIRECTIONS = {
     "w": Vector2D(0, -1),
     "s": Vector2D(0, 1),
@@ -240,31 +609,91 @@ class Event:
     item: Optional[str] = None
 
 
+EVENT_CODES: dict[str, EventType] = {
+    "damage": EventType.DAMAGE,
+    "loot": EventType.LOOT,
+    "level_up": EventType.LEVEL_UP,
+}
+
+
 class GameEngine:
 
-    def __init__(self, name: str, width: int = 10, height: int = 10):
+    def __init__(
+        self,
+        name: str,
+        width: int = 10,
+        height: int = 10,
+        seed: Optional[int] = None,
+        room: Optional[Room] = None,
+    ):
+        """
+        room may be any Room-compatible map (e.g. world.World). A provided room brings its
+        own enemies, otherwise a width x height Room is generated with the default spawns
+        """
+        # All randomness goes through the engine's rng so a seed reproduces a whole game.
+        # Unseeded games still pick a concrete seed so they can be recorded and replayed
+        self.seed = seed if seed is not None else Random().getrandbits(63)
+        self.rng = Random(self.seed)
         self.player = Player(name=name, hp=50, attack=10, position=Vector2D(1, 1))
-        self.room = Room(width=width, height=height)
-        self.event_queue: list[Event] = []
+        self.events = EventBus()
+        self.events.on(EventType.DAMAGE, self._on_damage)
+        self.events.on(EventType.LOOT, self._on_loot)
+        self.events.on(EventType.LEVEL_UP, self._on_level_up)
+        self.events.subscribe(self._log_events)
         self.running = False
+        self.renderer: Optional[DiffRenderer] = None
+        # Only draw what the player can currently see
+        self.fog_of_war = True
+        # Set by replay.InputRecorder to log every step's input
+        self.recorder = None
+        # Set by profiler.TickProfiler, which wraps step(), render() and their phases while attached
+        self.profiler = None
+        # Optional messages.MessageBuffer whose latest lines are shown under the HUD
+        self.messages = None
+        self.ticks = 0
+        self.damage_dealt = 0
+
+        if room is not None:
+            self.room = room
+            return
+
+        self.room = Room(width=width, height=height, rng=self.rng)
 
         # Spawn some enemies
         self.room.entities = [Goblin(Vector2D(5, 5)), Troll(Vector2D(8, 8))]
 
-    def queue_event(self, event: dict):
-        self.event_queue.append(event)
+    def queue_event(self, event: Event):
+        """
+        Compatibility wrapper for Event objects. Hot paths emit on self.events directly
+        """
+        self.events.emit(EVENT_CODES[event.type], event.target, event.amount or 0, event.item)
 
     def process_events(self):
-        for event in self.event_queue:
-            match event.type:
-                case "damage":
-                    event.target.take_damage(event.amount)
-                case "loot":
-                    self.player.inventory.append(event.item)
-                case "level_up":
-                    self.player.gain_xp(100)
-
-        self.event_queue.clear()
+        self.events.dispatch()
+
+    def _on_damage(self, event: EventRecord):
+        if event.target is not self.player:
+            self.damage_dealt += min(event.target.hp, event.amount)
+        event.target.take_damage(event.amount)
+
+    def _on_loot(self, event: EventRecord):
+        self.player.inventory.append(event.item)
+
+    def _on_level_up(self, event: EventRecord):
+        self.player.gain_xp(100)
+
+    def _log_events(self, events: list[EventRecord], count: int):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        for event in events[:count]:
+            if event.code == EventType.DAMAGE and event.target is not self.player:
+                logger.info(
+                    "You attack %s for %d damage. %s remaining health: %d",
+                    event.target.name,
+                    event.amount,
+                    event.target.name,
+                    event.target.hp,
+                )
 
     def handle_input(self, user_input: str):
         if user_input in DIRECTIONS:
@@ -273,30 +702,39 @@ class GameEngine:
             self._handle_attack()
 
     def _handle_attack(self):
-        for entity in self.room.entities:
-            diff = (entity.position - self.player.position).magnitude()
-            if diff <= 1:
-                event = Event(type="damage", target=entity, amount=self.player.attack)
-                self.queue_event(event)
-                print(
-                    f"You attack {entity.name} for {self.player.attack} damage. {entity.name} remaining health: {entity.hp}"
-                )
+        pos, index = self.player.position, self.room.index
+        x, y, attack = pos.x, pos.y, self.player.attack
+        for dx, dy in ATTACK_OFFSETS:
+            for entity in index.at_xy(x + dx, y + dy):
+                self.events.emit(EventType.DAMAGE, entity, attack)
 
     def update(self):
-        # Enemies act
+        self._act_enemies()
+        self._remove_dead()
+        self.process_events()
+
+    def _act_enemies(self):
         for entity in self.room.entities:
-            entity.act(self.player)
+            entity.act(self.player, self.room)
 
+    def _remove_dead(self):
         # Remove dead enemies, grant xp
         dead = [e for e in self.room.entities if not e.is_alive()]
         for e in dead:
-            print(f"{e.name} defeated!")
+            logger.info("%s defeated!", e.name)
             self.player.gain_xp(e.xp_reward)
+            self.room.remove_entity(e)
 
-        self.room.entities = [e for e in self.room.entities if e.is_alive()]
-
-        # Process queued events
-        self.process_events()
+    def step(self, user_input: str) -> str | None:
+        """
+        Advances the game by one tick without rendering. Returns "win", "lose" or None
+        """
+        if self.recorder is not None:
+            self.recorder.record(user_input)
+        self.handle_input(user_input)
+        self.update()
+        self.ticks += 1
+        return self.check_win_lose()
 
     def check_win_lose(self) -> str | None:
         if not self.player.is_alive():
@@ -305,14 +743,26 @@ class GameEngine:
             return "win"
         return None
 
-    def render(self):
-        print("\033[2J\033[H")  # clear terminal
-        print(self.room.render(self.player))
-        print(
-            f"\nHP: {self.player.hp} | ATK: {self.player.attack} | "
-            f"Level: {self.player.level} | XP: {self.player.xp} | Gold: {self.player.gold}"
+    def frame(self) -> list[bytes | bytearray]:
+        visible = self.room.visibility.fov(self.player.position) if self.fog_of_war else None
+        rows: list[bytes | bytearray] = self.room.render_rows(self.player, visible)
+        rows.append(b"")
+        rows.append(
+            f"HP: {self.player.hp} | ATK: {self.player.attack} | "
+            f"Level: {self.player.level} | XP: {self.player.xp} | Gold: {self.player.gold}".encode()
         )
-        print("Move: w/a/s/d | Attack: attack | Quit: q")
+        rows.append(b"Move: w/a/s/d | Attack: attack | Quit: q")
+        if self.messages is not None:
+            rows.append(b"")
+            for message in self.messages.latest(MESSAGE_LINES):
+                rows.append(message.encode("ascii", "replace"))
+        return rows
+
+    def render(self):
+        # Only cells that changed since the last frame are written to the terminal
+        if self.renderer is None:
+            self.renderer = DiffRenderer()
+        self.renderer.draw(self.frame())
 
     def run(self):
         self.running = True
@@ -324,10 +774,7 @@ class GameEngine:
             if user_input == "q":
                 break
 
-            self.handle_input(user_input)
-            self.update()
-
-            result = self.check_win_lose()
+            result = self.step(user_input)
             if result == "win":
                 print("You escaped the dungeon")
                 break
@@ -337,6 +784,10 @@ class GameEngine:
 
 
 if __name__ == "__main__":
+    from messages import MessageBuffer
+
     name = input("What is your name? ").strip().capitalize()
     game = GameEngine(name)
+    # Show game messages in the frame instead of printing over it
+    game.messages = MessageBuffer().attach(__name__)
     game.run()
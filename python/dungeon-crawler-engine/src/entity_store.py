@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from dungeon import Enemy, Goblin, Player, Troll, Vector2D
+
+
+# Type ids for the type_id column. Index 0 is reserved for plain Enemy instances
+ENEMY_TYPES: list[type[Enemy]] = [Enemy, Goblin, Troll]
+
+
+class EntityStore:
+    """
+    Struct-of-arrays store for enemies. Each stat lives in its own NumPy column so a whole
+    tick (distance checks, movement, attacks, removal of the dead) runs as array operations
+    instead of one Enemy.act call per enemy
+    """
+
+    COLUMNS = ("x", "y", "hp", "attack", "aggro_range", "xp_reward", "type_id")
+
+    def __init__(self, capacity: int = 64):
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self.x = np.zeros(self._capacity, dtype=np.int32)
+        self.y = np.zeros(self._capacity, dtype=np.int32)
+        self.hp = np.zeros(self._capacity, dtype=np.int32)
+        self.attack = np.zeros(self._capacity, dtype=np.int32)
+        self.aggro_range = np.zeros(self._capacity, dtype=np.int32)
+        self.xp_reward = np.zeros(self._capacity, dtype=np.int32)
+        self.type_id = np.zeros(self._capacity, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+        self._capacity = capacity
+
+    def add(self, enemy: Enemy) -> int:
+        """
+        Copies an Enemy's stats into a new row and returns the row index
+        """
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+
+        i = self._size
+        self.x[i] = int(enemy.position.x)
+        self.y[i] = int(enemy.position.y)
+        self.hp[i] = enemy.hp
+        self.attack[i] = enemy.attack
+        self.aggro_range[i] = enemy.aggro_range
+        self.xp_reward[i] = enemy.xp_reward
+        self.type_id[i] = self._type_id(type(enemy))
+        self._size += 1
+        return i
+
+    def spawn(self, enemy_type: type[Enemy], x: int, y: int) -> int:
+        """
+        Uses an Enemy subclass (e.g. Goblin, Troll) as a factory for a new row
+        """
+        return self.add(enemy_type(Vector2D(x, y)))
+
+    def spawn_many(
+        self, enemy_type: type[Enemy], xs: NDArray[np.int_], ys: NDArray[np.int_]
+    ):
+        """
+        Bulk spawn of one enemy type at the given coordinates
+        """
+        template = enemy_type(Vector2D(0, 0))
+        count = len(xs)
+        start, end = self._size, self._size + count
+        if end > self._capacity:
+            self._grow(end)
+
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.hp[start:end] = template.hp
+        self.attack[start:end] = template.attack
+        self.aggro_range[start:end] = template.aggro_range
+        self.xp_reward[start:end] = template.xp_reward
+        self.type_id[start:end] = self._type_id(enemy_type)
+        self._size = end
+
+    @classmethod
+    def from_enemies(cls, enemies: Iterable[Enemy]) -> EntityStore:
+        enemies = list(enemies)
+        store = cls(capacity=len(enemies))
+        for e in enemies:
+            store.add(e)
+        return store
+
+    def to_enemies(self) -> list[Enemy]:
+        """
+        Materialises the rows back into Enemy objects, e.g. to hand them to a Room
+        """
+        enemies = []
+        for i in range(self._size):
+            enemy_type = ENEMY_TYPES[self.type_id[i]]
+            position = Vector2D(int(self.x[i]), int(self.y[i]))
+            if enemy_type is Enemy:
+                enemy = Enemy(name="Enemy", hp=0, attack=0, position=position)
+            else:
+                enemy = enemy_type(position)
+            enemy.hp = int(self.hp[i])
+            enemy.attack = int(self.attack[i])
+            enemy.aggro_range = int(self.aggro_range[i])
+            enemy.xp_reward = int(self.xp_reward[i])
+            enemies.append(enemy)
+        return enemies
+
+    def damage(self, i: int, amount: int):
+        self.hp[i] = max(0, int(self.hp[i]) - amount)
+
+    def apply_player_attack(self, player: Player) -> int:
+        """
+        Vectorised GameEngine._handle_attack: damages every enemy within 1 tile of the player.
+        Returns the number of enemies hit
+        """
+        n = self._size
+        dx = self.x[:n] - int(player.position.x)
+        dy = self.y[:n] - int(player.position.y)
+        hit = dx * dx + dy * dy <= 1
+        hp = self.hp[:n]
+        hp[hit] = np.maximum(0, hp[hit] - player.attack)
+        return int(hit.sum())
+
+    def update(self, player: Player) -> int:
+        """
+        Vectorised equivalent of calling Enemy.act for every enemy followed by the dead enemy
+        sweep in GameEngine.update. Returns the total damage dealt to the player
+        """
+        n = self._size
+        if n == 0:
+            return 0
+
+        x, y = self.x[:n], self.y[:n]
+        dx = int(player.position.x) - x
+        dy = int(player.position.y) - y
+        dist_sq = dx * dx + dy * dy
+
+        # Adjacent attack
+        adjacent = dist_sq <= 1
+        damage = int(self.attack[:n][adjacent].sum())
+        if damage:
+            player.take_damage(damage)
+
+        # Player in range -> step towards player, rounding the unit vector like Enemy.act
+        aggro = self.aggro_range[:n]
+        chasing = ~adjacent & (dist_sq <= aggro * aggro)
+        if chasing.any():
+            dist = np.sqrt(dist_sq[chasing])
+            x[chasing] += np.rint(dx[chasing] / dist).astype(np.int32)
+            y[chasing] += np.rint(dy[chasing] / dist).astype(np.int32)
+
+        # Remove dead enemies, grant xp
+        dead = self.hp[:n] <= 0
+        if dead.any():
+            for reward in self.xp_reward[:n][dead].tolist():
+                player.gain_xp(reward)
+            self._compact(~dead)
+
+        return damage
+
+    def _compact(self, keep: NDArray[np.bool_]):
+        n = self._size
+        remaining = int(keep.sum())
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:remaining] = column[:n][keep]
+        self._size = remaining
+
+    @staticmethod
+    def _type_id(enemy_type: type[Enemy]) -> int:
+        if enemy_type not in ENEMY_TYPES:
+            ENEMY_TYPES.append(enemy_type)
+        return ENEMY_TYPES.index(enemy_type)
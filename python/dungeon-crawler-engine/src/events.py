@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import Any, Callable, Optional, Sequence
+
+
+class EventType(IntEnum):
+    DAMAGE = 0
+    LOOT = 1
+    LEVEL_UP = 2
+
+
+class EventRecord:
+    """
+    Mutable event slot. Records are owned by an EventBus and reused between batches, so
+    handlers and subscribers must not keep references to them after they return
+    """
+
+    __slots__ = ("code", "target", "amount", "item")
+
+    def __init__(self):
+        self.code = 0
+        self.target: Any = None
+        self.amount = 0
+        self.item: Optional[str] = None
+
+
+Handler = Callable[[EventRecord], None]
+Subscriber = Callable[[Sequence[EventRecord], int], None]
+
+
+class EventBus:
+    """
+    Event queue with integer codes and per-code handler tables. Records come from a
+    preallocated pool that grows only when a batch outgrows it, so emitting doesn't allocate.
+
+    Handlers run per event and apply game state changes. Subscribers (logging, stats,
+    replay...) are called once per dispatched batch with the records and batch size, keeping
+    them off the per-event path.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._records = [EventRecord() for _ in range(capacity)]
+        self._count = 0
+        self._handlers: list[list[Handler]] = [[] for _ in EventType]
+        self._subscribers: list[Subscriber] = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    def on(self, code: EventType, handler: Handler):
+        self._handlers[code].append(handler)
+
+    def subscribe(self, subscriber: Subscriber):
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.remove(subscriber)
+
+    def emit(
+        self, code: EventType, target: Any, amount: int = 0, item: Optional[str] = None
+    ):
+        if self._count == len(self._records):
+            self._records.append(EventRecord())
+        record = self._records[self._count]
+        record.code = code
+        record.target = target
+        record.amount = amount
+        record.item = item
+        self._count += 1
+
+    def dispatch(self) -> int:
+        """
+        Runs handlers for every pending event in emit order, including events emitted by the
+        handlers themselves, then notifies subscribers. Returns the number dispatched
+        """
+        records, handlers = self._records, self._handlers
+        i = 0
+        while i < self._count:
+            record = records[i]
+            for handler in handlers[record.code]:
+                handler(record)
+            i += 1
+
+        for subscriber in self._subscribers:
+            subscriber(records, i)
+
+        # Release the slots back to the pool, dropping references to game objects
+        for record in records[:i]:
+            record.target = None
+            record.item = None
+        self._count = 0
+        return i
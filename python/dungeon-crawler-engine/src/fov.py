@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dungeon import Room, Vector2D
+
+# How far the player can see. Kept above every enemy's aggro range so aggro checks can be
+# answered from the player's field of view
+SIGHT_RADIUS = 8
+
+# (xx, xy, yx, yy) transforms mapping octant 0 onto each of the eight octants
+OCTANTS = (
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+    (-1, 0, 0, 1),
+    (-1, 0, 0, -1),
+    (0, -1, -1, 0),
+    (0, 1, -1, 0),
+    (1, 0, 0, -1),
+)
+
+
+def _opaque(room: Room, x: int, y: int) -> bool:
+    # Anything outside the loaded tiles blocks sight like a wall
+    lx, ly = x - room.origin[0], y - room.origin[1]
+    if not (0 <= lx < room.width and 0 <= ly < room.height):
+        return True
+    return room.tiles[ly * room.width + lx] == ord("#")
+
+
+def shadowcast(room: Room, origin: tuple[int, int], radius: int) -> frozenset[tuple[int, int]]:
+    """
+    Recursive shadowcasting. Returns every tile visible from origin within radius, walls
+    included (a wall is seen but hides what is behind it)
+    """
+    tiles, width, height = room.tiles, room.width, room.height
+    ox, oy = room.origin
+    wall = ord("#")
+    cx, cy = origin
+    radius_sq = radius * radius
+    visible = {origin}
+
+    def opaque(x: int, y: int) -> bool:
+        lx, ly = x - ox, y - oy
+        return not (0 <= lx < width and 0 <= ly < height) or tiles[ly * width + lx] == wall
+
+    def cast(row: int, start: float, end: float, xx: int, xy: int, yx: int, yy: int):
+        if start < end:
+            return
+        new_start = start
+        for j in range(row, radius + 1):
+            dx, dy = -j - 1, -j
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+
+                x, y = cx + dx * xx + dy * xy, cy + dx * yx + dy * yy
+                if dx * dx + dy * dy <= radius_sq:
+                    visible.add((x, y))
+
+                if blocked:
+                    if opaque(x, y):
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif opaque(x, y) and j < radius:
+                    # Scan the lit part of the next row, then carry on past the wall
+                    blocked = True
+                    cast(j + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    for octant in OCTANTS:
+        cast(1, 1.0, 0.0, *octant)
+    return frozenset(visible)
+
+
+def line_of_sight(room: Room, a: tuple[int, int], b: tuple[int, int]) -> bool:
+    """
+    Bresenham line from a to b. Only the tiles strictly between the endpoints can block
+    """
+    x, y = a
+    bx, by = b
+    dx, dy = abs(bx - x), -abs(by - y)
+    sx = 1 if x < bx else -1
+    sy = 1 if y < by else -1
+    err = dx + dy
+
+    while True:
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x += sx
+        if e2 <= dx:
+            err += dx
+            y += sy
+        if (x, y) == (bx, by):
+            return True
+        if _opaque(room, x, y):
+            return False
+
+
+class Visibility:
+    """
+    Caches fields of view by origin and line-of-sight results by endpoints for the room's
+    current grid_version. Enemies and the renderer share one cache, so a tick where many
+    enemies look at the same player casts the rays once.
+
+    Room.set_tile reports single tile changes through tile_changed(), which only drops the
+    cached results that could include that tile. Any other grid change (grid_version moving
+    on without a report) clears everything on next use.
+    """
+
+    def __init__(self, room: Room, radius: int = SIGHT_RADIUS, max_cached: int = 256):
+        self.room = room
+        self.radius = radius
+        self.max_cached = max_cached
+        self._fov: dict[tuple[int, int], frozenset[tuple[int, int]]] = {}
+        self._lines: dict[tuple[int, int, int, int], bool] = {}
+        self._version = room.grid_version
+        self.builds = 0
+        self.rays = 0
+
+    def _sync(self):
+        if self._version != self.room.grid_version:
+            self._fov.clear()
+            self._lines.clear()
+            self._version = self.room.grid_version
+
+    def tile_changed(self, x: int, y: int):
+        """
+        Must be called right after the one grid_version bump caused by changing tile (x, y)
+        """
+        if self._version != self.room.grid_version - 1:
+            # Other changes were missed, so the next lookup clears the whole cache
+            return
+        r = self.radius
+        for ox, oy in [k for k in self._fov if abs(k[0] - x) <= r and abs(k[1] - y) <= r]:
+            del self._fov[(ox, oy)]
+        for key in [
+            k
+            for k in self._lines
+            if min(k[0], k[2]) <= x <= max(k[0], k[2])
+            and min(k[1], k[3]) <= y <= max(k[1], k[3])
+        ]:
+            del self._lines[key]
+        self._version = self.room.grid_version
+
+    def fov(self, origin: Vector2D) -> frozenset[tuple[int, int]]:
+        self._sync()
+        key = (int(origin.x), int(origin.y))
+        visible = self._fov.get(key)
+        if visible is None:
+            if len(self._fov) >= self.max_cached:
+                del self._fov[next(iter(self._fov))]
+            visible = self._fov[key] = shadowcast(self.room, key, self.radius)
+            self.builds += 1
+        return visible
+
+    def can_see(self, a: Vector2D, b: Vector2D) -> bool:
+        """
+        Whether b is visible from a. Within the sight radius the answer comes from a's field
+        of view, further out from a cached Bresenham ray
+        """
+        self._sync()
+        ax, ay, bx, by = int(a.x), int(a.y), int(b.x), int(b.y)
+        dx, dy = bx - ax, by - ay
+        if dx * dx + dy * dy <= self.radius * self.radius:
+            return (bx, by) in self.fov(a)
+
+        key = (ax, ay, bx, by)
+        seen = self._lines.get(key)
+        if seen is None:
+            if len(self._lines) >= self.max_cached:
+                del self._lines[next(iter(self._lines))]
+            seen = self._lines[key] = line_of_sight(self.room, (ax, ay), (bx, by))
+            self.rays += 1
+        return seen
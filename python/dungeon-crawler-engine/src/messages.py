@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+
+
+class MessageBuffer(logging.Handler):
+    """
+    Logging handler that keeps the latest game messages in memory instead of writing them
+    out. Records are only formatted when read, so the simulation never pays for I/O or string
+    formatting of messages nobody looks at
+    """
+
+    def __init__(self, maxlen: int = 100, level: int = logging.INFO):
+        super().__init__(level)
+        self.records: deque[logging.LogRecord] = deque(maxlen=maxlen)
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def attach(self, name: str = "dungeon") -> MessageBuffer:
+        """
+        Routes the named logger's messages here and stops them propagating to the root logger
+        """
+        target = logging.getLogger(name)
+        target.addHandler(self)
+        target.setLevel(self.level)
+        target.propagate = False
+        return self
+
+    def detach(self, name: str = "dungeon"):
+        target = logging.getLogger(name)
+        target.removeHandler(self)
+        target.propagate = True
+
+    def latest(self, n: int) -> list[str]:
+        records = list(self.records)[-n:] if n > 0 else []
+        return [self.format(r) for r in records]
+
+    def drain(self) -> list[str]:
+        messages = [self.format(r) for r in self.records]
+        self.records.clear()
+        return messages
+
+    def clear(self):
+        self.records.clear()
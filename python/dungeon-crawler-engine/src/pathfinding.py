@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from dungeon import Room, Vector2D
+
+# 4-connected movement so a distance of 1 is exactly the enemy attack range
+NEIGHBOURS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+class FlowField:
+    """
+    BFS distance map from a single target tile. Every enemy chasing the same target reads its
+    next step from here, so the search is paid once per target instead of once per enemy
+    """
+
+    def __init__(self, room: Room, target: tuple[int, int], max_distance: int = 32):
+        self.target = target
+        self.max_distance = max_distance
+        self.distances = self._build(room)
+
+    def _build(self, room: Room) -> dict[tuple[int, int], int]:
+        # origin is the world coordinate of tiles[0], (0, 0) for a standalone Room
+        tiles, width, height = room.tiles, room.width, room.height
+        ox, oy = room.origin
+        wall = ord("#")
+        tx, ty = self.target
+        distances = {self.target: 0}
+        if not (0 <= tx - ox < width and 0 <= ty - oy < height):
+            return distances
+
+        frontier = deque([self.target])
+        while frontier:
+            x, y = frontier.popleft()
+            d = distances[(x, y)] + 1
+            if d > self.max_distance:
+                continue
+            for dx, dy in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                lx, ly = nx - ox, ny - oy
+                if (
+                    0 <= lx < width
+                    and 0 <= ly < height
+                    and (nx, ny) not in distances
+                    and tiles[ly * width + lx] != wall
+                ):
+                    distances[(nx, ny)] = d
+                    frontier.append((nx, ny))
+        return distances
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        return self.distances.get((x, y))
+
+    def next_step(self, x: int, y: int) -> Optional[tuple[int, int]]:
+        """
+        The neighbouring tile that is one step closer to the target, or None if the tile
+        is unreachable within max_distance or already next to the target
+        """
+        best = self.distances.get((x, y))
+        if best is None or best <= 1:
+            return None
+
+        step = None
+        for dx, dy in NEIGHBOURS:
+            d = self.distances.get((x + dx, y + dy))
+            if d is not None and d < best:
+                best, step = d, (x + dx, y + dy)
+        return step
+
+
+class Pathfinder:
+    """
+    Caches the flow field towards the current target and only rebuilds it when the target
+    moves or the room's grid_version changes
+    """
+
+    def __init__(self, room: Room, max_distance: int = 32):
+        self.room = room
+        self.max_distance = max_distance
+        self._field: Optional[FlowField] = None
+        self._version = -1
+        self.builds = 0
+
+    def field_to(self, target: Vector2D) -> FlowField:
+        key = (int(target.x), int(target.y))
+        if (
+            self._field is None
+            or self._field.target != key
+            or self._version != self.room.grid_version
+        ):
+            self._field = FlowField(self.room, key, self.max_distance)
+            self._version = self.room.grid_version
+            self.builds += 1
+        return self._field
+
+    def step_towards(self, start: Vector2D, target: Vector2D) -> Optional[tuple[int, int]]:
+        return self.field_to(target).next_step(int(start.x), int(start.y))
+
+
+def astar(
+    room: Room, start: tuple[int, int], goal: tuple[int, int]
+) -> Optional[list[tuple[int, int]]]:
+    """
+    Single-pair A* with a Manhattan heuristic. Kept as the per-enemy baseline that the flow
+    field is benchmarked against
+    """
+    tiles, width, height = room.tiles, room.width, room.height
+    ox, oy = room.origin
+    wall = ord("#")
+    gx, gy = goal
+    open_heap = [(abs(gx - start[0]) + abs(gy - start[1]), 0, start)]
+    came_from: dict[tuple[int, int], tuple[int, int]] = {}
+    cost = {start: 0}
+
+    while open_heap:
+        _, g, current = heapq.heappop(open_heap)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+        if g > cost[current]:
+            continue
+
+        x, y = current
+        for dx, dy in NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            lx, ly = nx - ox, ny - oy
+            if not (0 <= lx < width and 0 <= ly < height):
+                continue
+            if tiles[ly * width + lx] == wall and (nx, ny) != goal:
+                continue
+            ng = g + 1
+            if ng < cost.get((nx, ny), ng + 1):
+                cost[(nx, ny)] = ng
+                came_from[(nx, ny)] = current
+                heapq.heappush(
+                    open_heap, (ng + abs(gx - nx) + abs(gy - ny), ng, (nx, ny))
+                )
+    return None
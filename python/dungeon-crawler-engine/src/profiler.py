@@ -0,0 +1,203 @@
+"""
+Opt-in per-phase tick profiler for GameEngine. Attaching one wraps the engine's step(),
+render() and the methods step() calls with timed versions on that instance, so the game
+logic itself stays in GameEngine; a detached engine runs its plain methods.
+
+    PYTHONPATH=src python -m profiler --ticks 5000 --policy greedy --allocations --out tick_profile.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from dungeon import GameEngine
+
+# Phase name -> GameEngine method timed for it, in the order they run within a tick. update
+# covers enemy_act, cleanup and process_events; tick is the whole of step()
+PHASES = {
+    "input": "handle_input",
+    "enemy_act": "_act_enemies",
+    "cleanup": "_remove_dead",
+    "process_events": "process_events",
+    "update": "update",
+    "check_win_lose": "check_win_lose",
+    "tick": "step",
+    "render": "render",
+}
+
+
+class Histogram:
+    """
+    Running totals plus a window of recent samples for percentiles, and power-of-two buckets
+    over every sample. Samples are multiplied by scale to get the reported unit
+    """
+
+    __slots__ = ("unit", "scale", "count", "total", "max", "samples", "buckets")
+
+    def __init__(self, window: int, unit: str = "us", scale: float = 1e6):
+        self.unit = unit
+        self.scale = scale
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=window)
+        self.buckets: dict[int, int] = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.samples.append(value)
+        # Bucket b holds samples below 2**b units
+        bucket = int(value * self.scale).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        unit, scale = self.unit, self.scale
+        return {
+            "count": self.count,
+            f"mean_{unit}": self.total / self.count * scale if self.count else 0.0,
+            f"p50_{unit}": self.percentile(0.50) * scale,
+            f"p99_{unit}": self.percentile(0.99) * scale,
+            f"max_{unit}": self.max * scale,
+            f"histogram_{unit}": {f"<{1 << b}": n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class TickProfiler:
+
+    def __init__(self, window: int = 10_000, track_allocations: bool = False):
+        """
+        track_allocations starts tracemalloc, which slows everything down noticeably, so
+        compare timings only between runs with the same setting
+        """
+        self.phases = {name: Histogram(window) for name in PHASES}
+        self.track_allocations = track_allocations
+        # Per tick: bytes still held afterwards, the high-water mark above the start, and
+        # the change in the number of live allocated blocks
+        self.net_bytes = Histogram(window, unit="bytes", scale=1)
+        self.peak_bytes = Histogram(window, unit="bytes", scale=1)
+        self.net_blocks = Histogram(window, unit="blocks", scale=1)
+        self._started_tracemalloc = False
+
+    def attach(self, engine: GameEngine) -> TickProfiler:
+        engine.profiler = self
+        for name, method in PHASES.items():
+            timed = self._timed_tick if name == "tick" else self._timed
+            setattr(engine, method, timed(self.phases[name], getattr(engine, method)))
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def detach(self, engine: GameEngine):
+        engine.profiler = None
+        # Drop the instance wrappers so the class methods are found again
+        for method in PHASES.values():
+            engine.__dict__.pop(method, None)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @staticmethod
+    def _timed(stats: Histogram, method):
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            result = method(*args)
+            stats.add(clock() - start)
+            return result
+
+        return timed
+
+    def _timed_tick(self, stats: Histogram, step):
+        clock = time.perf_counter
+
+        def timed(user_input: str) -> str | None:
+            if not self.track_allocations:
+                start = clock()
+                result = step(user_input)
+                stats.add(clock() - start)
+                return result
+
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            blocks = sys.getallocatedblocks()
+            start = clock()
+            result = step(user_input)
+            stats.add(clock() - start)
+            current, peak = tracemalloc.get_traced_memory()
+            self.net_bytes.add(max(0, current - before))
+            self.peak_bytes.add(peak - before)
+            self.net_blocks.add(max(0, sys.getallocatedblocks() - blocks))
+            return result
+
+        return timed
+
+    def report(self) -> dict:
+        report = {
+            "phases": {
+                name: stats.to_dict() for name, stats in self.phases.items() if stats.count
+            }
+        }
+        if self.track_allocations:
+            report["allocations"] = {
+                "net_bytes": self.net_bytes.to_dict(),
+                "peak_bytes": self.peak_bytes.to_dict(),
+                "net_blocks": self.net_blocks.to_dict(),
+            }
+        return report
+
+    def dump(self, path: str | Path):
+        Path(path).write_text(json.dumps(self.report(), indent=2))
+
+
+if __name__ == "__main__":
+    from messages import MessageBuffer
+    from simulation import make_policy
+
+    parser = argparse.ArgumentParser(description="Profile GameEngine ticks by phase")
+    parser.add_argument("--ticks", type=int, default=5_000)
+    parser.add_argument("--policy", default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=64, help="room width and height")
+    parser.add_argument("--allocations", action="store_true", help="track tracemalloc")
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    MessageBuffer().attach()
+    profiler = TickProfiler(track_allocations=args.allocations)
+    seed = args.seed
+    ticks = 0
+    engine: Optional[GameEngine] = None
+    while ticks < args.ticks:
+        # Keep starting new games until enough ticks have been profiled
+        engine = GameEngine("Profiler", width=args.size, height=args.size, seed=seed)
+        profiler.attach(engine)
+        policy = make_policy(args.policy, seed)
+        while ticks < args.ticks:
+            ticks += 1
+            if engine.step(policy(engine)) is not None:
+                break
+        seed += 1
+    if engine is not None:
+        profiler.detach(engine)
+
+    if args.out:
+        profiler.dump(args.out)
+    print(json.dumps(profiler.report(), indent=2))
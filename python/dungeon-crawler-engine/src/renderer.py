@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import io
+import sys
+from typing import BinaryIO, Optional, Sequence
+
+CLEAR_SCREEN = b"\033[2J\033[H"
+CLEAR_TO_EOL = b"\033[K"
+SAVE_CURSOR = b"\0337"
+RESTORE_CURSOR = b"\0338"
+
+
+def move_cursor(x: int, y: int) -> bytes:
+    """
+    ANSI cursor position escape. Terminal rows/columns are 1-based
+    """
+    return b"\033[%d;%dH" % (y + 1, x + 1)
+
+
+class DiffRenderer:
+    """
+    Terminal renderer that remembers the last frame it drew and only writes the cells that
+    changed since then, so output per frame scales with what moved instead of the room area
+    """
+
+    def __init__(
+        self,
+        out: Optional[BinaryIO] = None,
+        buffer_size: int = 1 << 16,
+        park_unchanged: bool = True,
+    ):
+        """
+        park_unchanged=False leaves the cursor where it was after a partial redraw and writes
+        nothing at all for identical frames, which suits loops that redraw while the user is
+        typing on the prompt line
+        """
+        raw = out if out is not None else sys.stdout.buffer
+        self._out = (
+            raw
+            if isinstance(raw, (io.BufferedWriter, io.BytesIO))
+            else io.BufferedWriter(raw, buffer_size)
+        )
+        self._prev: list[bytes] = []
+        self._buf = bytearray()
+        self.park_unchanged = park_unchanged
+        self.last_frame_bytes = 0
+
+    def reset(self):
+        """
+        Forget the previous frame so the next draw is a full redraw
+        """
+        self._prev = []
+
+    def draw(self, rows: Sequence[bytes | bytearray]):
+        buf = self._buf
+        buf.clear()
+
+        if not self._prev or len(self._prev) != len(rows):
+            # First frame or the layout changed: clear once and draw everything
+            buf += CLEAR_SCREEN
+            for row in rows:
+                buf += row
+                buf += b"\r\n"
+        else:
+            for y, (new, old) in enumerate(zip(rows, self._prev)):
+                if new != old:
+                    self._diff_row(buf, y, new, old)
+
+            if not self.park_unchanged:
+                if buf:
+                    buf[:0] = SAVE_CURSOR
+                    buf += RESTORE_CURSOR
+                self._commit(rows, buf)
+                return
+
+        # Park the cursor under the frame, ready for the input prompt
+        buf += move_cursor(0, len(rows))
+        buf += CLEAR_TO_EOL
+        self._commit(rows, buf)
+
+    def _commit(self, rows: Sequence[bytes | bytearray], buf: bytearray):
+        self._prev = [bytes(r) for r in rows]
+        if buf:
+            self._out.write(buf)
+            self._out.flush()
+        self.last_frame_bytes = len(buf)
+
+    @staticmethod
+    def _diff_row(buf: bytearray, y: int, new: bytes | bytearray, old: bytes):
+        # Emit one cursor move per run of consecutive changed cells
+        shared = min(len(new), len(old))
+        x = 0
+        while x < shared:
+            if new[x] == old[x]:
+                x += 1
+                continue
+            start = x
+            while x < shared and new[x] != old[x]:
+                x += 1
+            buf += move_cursor(start, y)
+            buf += new[start:x]
+
+        if len(new) > shared:
+            buf += move_cursor(shared, y)
+            buf += new[shared:]
+        elif len(old) > shared:
+            buf += move_cursor(shared, y)
+            buf += CLEAR_TO_EOL
@@ -0,0 +1,259 @@
+"""
+Deterministic record/replay and binary snapshots for GameEngine.
+
+A game is fully determined by its seed, room size and the input given to each step(), so the
+input log only stores those: a fixed header followed by one byte per tick. Snapshots capture
+the full state (tiles, enemy columns, player, rng) so a bad tick can be reached without
+replaying from the start.
+
+    PYTHONPATH=src python -m replay game.dcrl --until 1200
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import struct
+import time
+from array import array
+from pathlib import Path
+from random import Random
+from typing import BinaryIO, Iterator, Optional
+
+from dungeon import DIRECTIONS, Enemy, GameEngine, Goblin, GridPos, Room, Troll, Vector2D
+
+LOG_MAGIC = b"DCRL"
+SNAPSHOT_MAGIC = b"DCSS"
+FORMAT_VERSION = 1
+
+# Input codes. Anything handle_input ignores is recorded as a no-op
+COMMANDS = ["", *DIRECTIONS, "attack"]
+COMMAND_CODES = {command: code for code, command in enumerate(COMMANDS)}
+
+# magic, version, seed, width, height, name length
+LOG_HEADER = struct.Struct("<4sHqIIH")
+# magic, version, seed, ticks, damage_dealt, width, height, enemy count
+SNAPSHOT_HEADER = struct.Struct("<4sHqqqIII")
+# x, y, hp, attack, gold, xp, level, damage_taken
+PLAYER = struct.Struct("<qqqqqqqq")
+
+ENEMY_TYPES: dict[str, type[Enemy]] = {"Goblin": Goblin, "Troll": Troll}
+
+
+class InputRecorder:
+    """
+    Appends every GameEngine.step input to a binary log. Attach with engine.recorder
+    """
+
+    def __init__(self, engine: GameEngine, out: BinaryIO | str | Path):
+        if not isinstance(engine.room, Room):
+            raise TypeError("Only single Room games can be recorded")
+        self._out = open(out, "wb") if isinstance(out, (str, Path)) else out
+        name = engine.player.name.encode("utf-8")
+        self._out.write(
+            LOG_HEADER.pack(
+                LOG_MAGIC,
+                FORMAT_VERSION,
+                engine.seed,
+                engine.room.width,
+                engine.room.height,
+                len(name),
+            )
+        )
+        self._out.write(name)
+        engine.recorder = self
+
+    def record(self, user_input: str):
+        self._out.write(bytes((COMMAND_CODES.get(user_input, 0),)))
+
+    def flush(self):
+        self._out.flush()
+
+    def close(self):
+        self._out.close()
+
+
+def _read_log(src: BinaryIO | str | Path) -> tuple[GameEngine, bytes]:
+    data = Path(src).read_bytes() if isinstance(src, (str, Path)) else src.read()
+    magic, version, seed, width, height, name_len = LOG_HEADER.unpack_from(data)
+    if magic != LOG_MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a dungeon input log")
+
+    offset = LOG_HEADER.size
+    name = data[offset : offset + name_len].decode("utf-8")
+    engine = GameEngine(name, width=width, height=height, seed=seed)
+    return engine, data[offset + name_len :]
+
+
+def iter_replay(src: BinaryIO | str | Path) -> Iterator[GameEngine]:
+    """
+    Replays a log headlessly, yielding the engine after every tick (the same object each
+    time) so callers can check invariants while bisecting
+    """
+    engine, inputs = _read_log(src)
+    step = engine.step
+    for code in inputs:
+        step(COMMANDS[code])
+        yield engine
+
+
+def replay(src: BinaryIO | str | Path, until_tick: Optional[int] = None) -> GameEngine:
+    """
+    Fast-forwards a recorded game to until_tick (or the end of the log)
+    """
+    engine, inputs = _read_log(src)
+    if until_tick is not None:
+        inputs = inputs[:until_tick]
+
+    step = engine.step
+    for code in inputs:
+        step(COMMANDS[code])
+    return engine
+
+
+def save_snapshot(engine: GameEngine, out: BinaryIO | str | Path):
+    room = engine.room
+    if not isinstance(room, Room):
+        raise TypeError("Only single Room games can be snapshotted")
+
+    enemies = room.entities
+    buf = io.BytesIO()
+    buf.write(
+        SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            FORMAT_VERSION,
+            engine.seed,
+            engine.ticks,
+            engine.damage_dealt,
+            room.width,
+            room.height,
+            len(enemies),
+        )
+    )
+    buf.write(room.tiles)
+
+    # Enemies as columns, names as a small string table
+    names = sorted({e.name for e in enemies})
+    name_index = {n: i for i, n in enumerate(names)}
+    columns = [
+        array("i", [name_index[e.name] for e in enemies]),
+        array("i", [int(e.position.x) for e in enemies]),
+        array("i", [int(e.position.y) for e in enemies]),
+        array("i", [e.hp for e in enemies]),
+        array("i", [e.attack for e in enemies]),
+        array("i", [e.aggro_range for e in enemies]),
+        array("i", [e.xp_reward for e in enemies]),
+    ]
+    for column in columns:
+        buf.write(column.tobytes())
+
+    p = engine.player
+    buf.write(
+        PLAYER.pack(
+            int(p.position.x),
+            int(p.position.y),
+            p.hp,
+            p.attack,
+            p.gold,
+            p.xp,
+            p.level,
+            p.damage_taken,
+        )
+    )
+
+    # Variable-length leftovers: names, player name/inventory and the rng state
+    version, state, gauss = engine.rng.getstate()
+    meta = json.dumps(
+        {
+            "names": names,
+            "player": p.name,
+            "inventory": p.inventory,
+            "rng": [version, gauss],
+        }
+    ).encode("utf-8")
+    buf.write(struct.pack("<I", len(meta)))
+    buf.write(meta)
+    buf.write(array("I", state).tobytes())
+
+    data = buf.getvalue()
+    if isinstance(out, (str, Path)):
+        Path(out).write_bytes(data)
+    else:
+        out.write(data)
+
+
+def load_snapshot(src: BinaryIO | str | Path) -> GameEngine:
+    data = Path(src).read_bytes() if isinstance(src, (str, Path)) else src.read()
+    view = memoryview(data)
+    magic, version, seed, ticks, damage_dealt, width, height, count = (
+        SNAPSHOT_HEADER.unpack_from(view)
+    )
+    if magic != SNAPSHOT_MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a dungeon snapshot")
+    offset = SNAPSHOT_HEADER.size
+
+    room = Room(width, height, rng=Random(), tiles=view[offset : offset + width * height])
+    offset += width * height
+
+    columns = []
+    for _ in range(7):
+        column = array("i")
+        column.frombytes(view[offset : offset + 4 * count])
+        columns.append(column)
+        offset += 4 * count
+
+    px, py, hp, attack, gold, xp, level, damage_taken = PLAYER.unpack_from(view, offset)
+    offset += PLAYER.size
+
+    (meta_len,) = struct.unpack_from("<I", view, offset)
+    offset += 4
+    meta = json.loads(bytes(view[offset : offset + meta_len]))
+    offset += meta_len
+    state = array("I")
+    state.frombytes(view[offset:])
+
+    names = meta["names"]
+    enemies = []
+    for name_id, x, y, e_hp, e_attack, aggro, reward in zip(*columns):
+        name, position = names[name_id], Vector2D(x, y)
+        if name in ENEMY_TYPES:
+            enemy = ENEMY_TYPES[name](position)
+        else:
+            enemy = Enemy(name=name, hp=0, attack=0, position=position)
+        enemy.hp, enemy.attack = e_hp, e_attack
+        enemy.aggro_range, enemy.xp_reward = aggro, reward
+        enemies.append(enemy)
+    room.entities = enemies
+
+    engine = GameEngine(meta["player"], seed=seed, room=room)
+    engine.rng.setstate((meta["rng"][0], tuple(state), meta["rng"][1]))
+    room.rng = engine.rng
+    engine.ticks = ticks
+    engine.damage_dealt = damage_dealt
+
+    player = engine.player
+    player.position = GridPos(px, py)
+    player.hp, player.attack, player.gold = hp, attack, gold
+    player.xp, player.level, player.damage_taken = xp, level, damage_taken
+    player.inventory = meta["inventory"]
+    return engine
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded game headlessly")
+    parser.add_argument("log")
+    parser.add_argument("--until", type=int, default=None, help="stop after this tick")
+    parser.add_argument("--snapshot", default=None, help="write a snapshot at the end")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = replay(args.log, args.until)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {engine.ticks} ticks in {elapsed * 1000:.1f} ms "
+        f"({engine.ticks / elapsed if elapsed else 0:,.0f} ticks/s)"
+    )
+    print(engine.room.render(engine.player))
+    if args.snapshot:
+        save_snapshot(engine, args.snapshot)
@@ -0,0 +1,268 @@
+"""
+Line-protocol game server hosting one GameEngine per TCP connection. A single scheduler task
+steps every session once per tick, and clients receive compact state diffs instead of
+rendered rooms.
+
+    PYTHONPATH=src python -m server --port 8765 --tick-rate 10
+
+Client -> server, one command per line:
+    w | a | s | d | attack      queued for the next tick (latest command wins)
+    stats                       server tick statistics as a JSON line
+    q                           disconnect
+
+Server -> client:
+    I <seed> <width> <height> <tiles>      new game, tiles row-major
+    D <tick> [p=x,y,hp] [m<id>=x,y,hp ...] [-<id> ...]
+    R <win|lose>                           game over, a new game follows
+    S <json>                               reply to stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from dungeon import DIRECTIONS, GameEngine
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = {*DIRECTIONS, "attack"}
+
+# Stop sending diffs to clients whose socket buffer grows past this instead of queueing forever
+MAX_WRITE_BUFFER = 1 << 16
+
+
+class Session:
+
+    def __init__(
+        self, seed: int, writer: asyncio.StreamWriter, width: int = 10, height: int = 10
+    ):
+        self.writer = writer
+        self.width = width
+        self.height = height
+        self.command = ""
+        self.closed = False
+        self.new_game(seed)
+
+    def new_game(self, seed: int):
+        self.engine = GameEngine("Player", width=self.width, height=self.height, seed=seed)
+        # Entity uid -> the id this client knows it by, from a per-game counter
+        self._ids: dict[int, int] = {}
+        self._next_id = 0
+        self._sent: dict[int, tuple[int, int, int]] = {}
+        self._sent_player: Optional[tuple[int, int, int]] = None
+        self.send(
+            f"I {seed} {self.width} {self.height} "
+            f"{self.engine.room.tiles.decode('ascii')}\n"
+        )
+
+    def send(self, line: str, droppable: bool = False) -> bool:
+        """
+        Writes a line to the client. Droppable lines (diffs) are skipped while the client is
+        too far behind; returns whether the line was written
+        """
+        transport = self.writer.transport
+        if transport.is_closing():
+            self.closed = True
+            return False
+        if droppable and transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            return False
+        self.writer.write(line.encode("ascii"))
+        return True
+
+    def send_diff(self) -> bool:
+        """
+        Sends the changes since the last diff the client received. A dropped diff isn't
+        recorded as sent, so the next one carries the same changes
+        """
+        line, changes = self._changes()
+        if not line:
+            return True
+        if not self.send(line, droppable=True):
+            return False
+        self._commit(changes)
+        return True
+
+    def _changes(self) -> tuple[str, tuple]:
+        engine = self.engine
+        parts = []
+
+        p = engine.player
+        player = (int(p.position.x), int(p.position.y), p.hp)
+        if player != self._sent_player:
+            parts.append("p=%d,%d,%d" % player)
+
+        next_id = self._next_id
+        new_ids = {}
+        updated = {}
+        seen = set()
+        for e in engine.room.entities:
+            key = e.uid
+            seen.add(key)
+            eid = self._ids.get(key)
+            if eid is None:
+                eid = new_ids[key] = next_id
+                next_id += 1
+            state = (int(e.position.x), int(e.position.y), e.hp)
+            if self._sent.get(key) != state:
+                parts.append("m%d=%d,%d,%d" % (eid, *state))
+                updated[key] = state
+
+        removed = [k for k in self._sent if k not in seen]
+        parts.extend("-%d" % self._ids[k] for k in removed)
+
+        line = "D %d %s\n" % (engine.ticks, " ".join(parts)) if parts else ""
+        return line, (player, next_id, new_ids, updated, removed)
+
+    def _commit(self, changes: tuple):
+        player, next_id, new_ids, updated, removed = changes
+        self._sent_player = player
+        self._next_id = next_id
+        self._ids.update(new_ids)
+        self._sent.update(updated)
+        for key in removed:
+            del self._sent[key]
+            del self._ids[key]
+
+
+class GameServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        tick_rate: float = 10.0,
+        width: int = 10,
+        height: int = 10,
+        latency_window: int = 1000,
+    ):
+        self.host = host
+        self.port = port
+        self.tick_interval = 1.0 / tick_rate
+        self.width = width
+        self.height = height
+        self.sessions: list[Session] = []
+        self.ticks = 0
+        self.overruns = 0
+        self.tick_latencies: deque[float] = deque(maxlen=latency_window)
+        self._next_seed = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._scheduler: Optional[asyncio.Task] = None
+
+    def _seed(self) -> int:
+        self._next_seed += 1
+        return self._next_seed
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in self.sessions:
+            session.writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = Session(self._seed(), writer, self.width, self.height)
+        self.sessions.append(session)
+        try:
+            while not session.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("ascii", "replace").strip().lower()
+                if command == "q":
+                    break
+                if command == "stats":
+                    session.send(f"S {json.dumps(self.stats())}\n")
+                elif command in COMMANDS:
+                    session.command = command
+        except ConnectionError:
+            pass
+        finally:
+            session.closed = True
+            writer.close()
+
+    def tick(self):
+        """
+        Steps every session once and queues each client's diff
+        """
+        start = time.perf_counter()
+        alive = []
+        for session in self.sessions:
+            if session.closed:
+                continue
+            alive.append(session)
+
+            command, session.command = session.command, ""
+            result = session.engine.step(command)
+            session.send_diff()
+            if result is not None:
+                session.send(f"R {result}\n")
+                session.new_game(self._seed())
+
+        self.sessions = alive
+        self.ticks += 1
+        elapsed = time.perf_counter() - start
+        self.tick_latencies.append(elapsed)
+        if elapsed > self.tick_interval:
+            self.overruns += 1
+
+    async def _run_scheduler(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick = max(next_tick + self.tick_interval, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+
+    def stats(self) -> dict:
+        latencies = sorted(self.tick_latencies)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            "sessions": len(self.sessions),
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "tick_budget_ms": self.tick_interval * 1000,
+            "p50_tick_ms": percentile(0.50) * 1000,
+            "p99_tick_ms": percentile(0.99) * 1000,
+            "max_tick_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+
+async def serve(host: str, port: int, tick_rate: float):
+    server = GameServer(host, port, tick_rate)
+    await server.start()
+    logger.info("Listening on %s:%d at %.1f ticks/s", host, server.port, tick_rate)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many dungeon sessions in one process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Per-hit game messages from thousands of sessions would swamp the server log
+    logging.getLogger("dungeon").setLevel(logging.WARNING)
+    asyncio.run(serve(args.host, args.port, args.tick_rate))
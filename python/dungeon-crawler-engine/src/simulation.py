@@ -0,0 +1,244 @@
+"""
+Headless batch runner for balance testing. Drives GameEngine with an input policy instead of
+input(), never renders, and fans seeded games out across a process pool.
+
+    PYTHONPATH=src python -m simulation --games 10000 --policy greedy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from random import Random
+from statistics import fmean
+from typing import Callable, Literal, Optional, Sequence
+
+from dungeon import DIRECTIONS, GameEngine
+
+Policy = Callable[[GameEngine], str]
+PolicySpec = str | Sequence[str]
+
+
+def random_policy(rng: Random) -> Policy:
+    """
+    Picks any valid command uniformly at random
+    """
+    commands = [*DIRECTIONS, "attack"]
+
+    def policy(engine: GameEngine) -> str:
+        return rng.choice(commands)
+
+    return policy
+
+
+def greedy_policy(rng: Random, explore: float = 0.2) -> Policy:
+    """
+    Attacks anything adjacent, otherwise walks towards the exit with some random exploration
+    to get unstuck from walls
+    """
+
+    def policy(engine: GameEngine) -> str:
+        player, room = engine.player, engine.room
+        if room.get_entities_within(player.position, 1):
+            return "attack"
+
+        if rng.random() < explore:
+            return rng.choice(list(DIRECTIONS))
+
+        exit_x, exit_y = room.width - 1, room.height - 1
+        best, best_dist = None, None
+        for command, direction in DIRECTIONS.items():
+            new_pos = player.position + direction
+            if not room.is_walkable(new_pos):
+                continue
+            dist = abs(exit_x - new_pos.x) + abs(exit_y - new_pos.y)
+            if best_dist is None or dist < best_dist:
+                best, best_dist = command, dist
+        return best if best is not None else rng.choice(list(DIRECTIONS))
+
+    return policy
+
+
+def scripted_policy(commands: Sequence[str]) -> Policy:
+    """
+    Replays a fixed list of commands, then idles
+    """
+    it = iter(commands)
+
+    def policy(engine: GameEngine) -> str:
+        return next(it, "")
+
+    return policy
+
+
+POLICIES: dict[str, Callable[[Random], Policy]] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def make_policy(spec: PolicySpec, seed: int) -> Policy:
+    """
+    A policy name from POLICIES, or a sequence of commands to script
+    """
+    if isinstance(spec, str):
+        if spec not in POLICIES:
+            raise ValueError(f"Unknown policy: {spec}")
+        # Separate stream from the engine rng so the policy can't perturb room generation
+        return POLICIES[spec](Random(f"policy-{seed}"))
+    return scripted_policy(spec)
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    seed: int
+    outcome: Literal["win", "lose", "timeout"]
+    ticks: int
+    damage_dealt: int
+    damage_taken: int
+    level: int
+
+
+@dataclass(frozen=True, slots=True)
+class BatchReport:
+    games: int
+    wins: int
+    losses: int
+    timeouts: int
+    win_rate: float
+    loss_rate: float
+    mean_ticks: float
+    max_ticks: int
+    mean_damage_dealt: float
+    mean_damage_taken: float
+    elapsed: float
+    workers: int
+    games_per_second: float
+    games_per_second_per_core: float
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+def simulate_game(
+    seed: int,
+    policy: PolicySpec = "greedy",
+    max_ticks: int = 500,
+    width: int = 10,
+    height: int = 10,
+) -> GameResult:
+    """
+    Plays one game to completion (or max_ticks) with no rendering or terminal I/O
+    """
+    engine = GameEngine("Sim", width=width, height=height, seed=seed)
+    choose = make_policy(policy, seed)
+
+    result = None
+    while result is None and engine.ticks < max_ticks:
+        result = engine.step(choose(engine))
+
+    return GameResult(
+        seed=seed,
+        outcome=result if result is not None else "timeout",
+        ticks=engine.ticks,
+        damage_dealt=engine.damage_dealt,
+        damage_taken=engine.player.damage_taken,
+        level=engine.player.level,
+    )
+
+
+def _simulate_chunk(
+    seeds: range, policy: PolicySpec, max_ticks: int, width: int, height: int
+) -> list[GameResult]:
+    return [simulate_game(s, policy, max_ticks, width, height) for s in seeds]
+
+
+def summarise(results: Sequence[GameResult], elapsed: float, workers: int) -> BatchReport:
+    games = len(results)
+    wins = sum(r.outcome == "win" for r in results)
+    losses = sum(r.outcome == "lose" for r in results)
+    games_per_second = games / elapsed if elapsed > 0 else 0.0
+
+    return BatchReport(
+        games=games,
+        wins=wins,
+        losses=losses,
+        timeouts=games - wins - losses,
+        win_rate=wins / games if games else 0.0,
+        loss_rate=losses / games if games else 0.0,
+        mean_ticks=fmean(r.ticks for r in results) if games else 0.0,
+        max_ticks=max((r.ticks for r in results), default=0),
+        mean_damage_dealt=fmean(r.damage_dealt for r in results) if games else 0.0,
+        mean_damage_taken=fmean(r.damage_taken for r in results) if games else 0.0,
+        elapsed=elapsed,
+        workers=workers,
+        games_per_second=games_per_second,
+        games_per_second_per_core=games_per_second / workers,
+    )
+
+
+def run_batch(
+    games: int,
+    base_seed: int = 0,
+    policy: PolicySpec = "greedy",
+    max_ticks: int = 500,
+    width: int = 10,
+    height: int = 10,
+    workers: Optional[int] = None,
+    chunk_size: int = 250,
+) -> tuple[BatchReport, list[GameResult]]:
+    """
+    Runs seeds base_seed..base_seed+games-1. Games are handed to workers in chunks so the
+    per-task pickling cost is paid per chunk rather than per game. workers=1 runs in-process
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    if workers == 1:
+        results = _simulate_chunk(
+            range(base_seed, base_seed + games), policy, max_ticks, width, height
+        )
+    else:
+        chunks = [
+            range(s, min(s + chunk_size, base_seed + games))
+            for s in range(base_seed, base_seed + games, chunk_size)
+        ]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_simulate_chunk, c, policy, max_ticks, width, height)
+                for c in chunks
+            ]
+            # Collect in submission order so the result list is independent of scheduling
+            for f in futures:
+                results.extend(f.result())
+
+    elapsed = time.perf_counter() - start
+    return summarise(results, elapsed, workers), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run headless seeded games in parallel")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--max-ticks", type=int, default=500)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--height", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    report, _ = run_batch(
+        games=args.games,
+        base_seed=args.seed,
+        policy=args.policy,
+        max_ticks=args.max_ticks,
+        width=args.width,
+        height=args.height,
+        workers=args.workers,
+    )
+    print(report.to_json())
@@ -0,0 +1,357 @@
+"""
+Chunked, lazily generated world. Chunks are square Rooms generated deterministically from
+(seed, chunk coordinate) the first time they are needed, kept in an LRU cache, and written to
+disk when evicted so memory stays bounded however far the player explores.
+
+World implements the parts of the Room interface GameEngine uses, in world coordinates:
+
+    engine = GameEngine("Hero", room=World(seed=42))
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from random import Random
+from typing import Optional
+
+import numpy as np
+
+from dungeon import (
+    Enemy,
+    Entity,
+    Goblin,
+    Player,
+    Room,
+    SpatialHash,
+    Tile,
+    Troll,
+    Vector2D,
+    WALL,
+)
+from fov import Visibility
+from pathfinding import Pathfinder
+
+ENEMY_TYPES: dict[str, type[Enemy]] = {"Goblin": Goblin, "Troll": Troll}
+
+# Chunks within this many chunks of the player are loaded and simulated
+ACTIVE_RADIUS = 1
+
+
+@dataclass
+class Chunk:
+    coord: tuple[int, int]
+    room: Room
+    enemies: list[Enemy] = field(default_factory=list)
+
+
+class World:
+
+    def __init__(
+        self,
+        seed: int = 0,
+        chunk_size: int = 32,
+        max_loaded: int = 25,
+        exit_chunk: tuple[int, int] = (2, 2),
+        enemies_per_chunk: int = 2,
+        cache_dir: Optional[str | Path] = None,
+        view_width: int = 40,
+        view_height: int = 20,
+    ):
+        active = (2 * ACTIVE_RADIUS + 1) ** 2
+        if max_loaded < active:
+            raise ValueError(f"max_loaded must be at least {active}")
+
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_loaded = max_loaded
+        self.exit_chunk = exit_chunk
+        self.enemies_per_chunk = enemies_per_chunk
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        # Created on first eviction when no cache_dir is given, and removed by close()
+        self._tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.view_width = view_width
+        self.view_height = view_height
+
+        self._chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        self.index = SpatialHash()
+        self.generated = 0
+        self.evicted = 0
+
+        # The active window: tiles of the chunks around the focus, laid out like a Room so
+        # the Pathfinder can build flow fields over it in world coordinates
+        self.grid_version = 0
+        self.focus_chunk: Optional[tuple[int, int]] = None
+        self.origin = (0, 0)
+        self.width = self.height = 0
+        self.tiles = bytearray()
+        self.pathfinder = Pathfinder(self)
+        self.visibility = Visibility(self)
+        self.focus(Vector2D(0, 0))
+
+    # ─── Chunk management ────────────────────────────────────────────────────
+
+    def chunk_coord(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.chunk_size, y // self.chunk_size
+
+    def is_loaded(self, coord: tuple[int, int]) -> bool:
+        return coord in self._chunks
+
+    def chunk(self, coord: tuple[int, int]) -> Chunk:
+        """
+        Returns a loaded chunk, loading it from disk or generating it if needed
+        """
+        chunk = self._chunks.get(coord)
+        if chunk is not None:
+            self._chunks.move_to_end(coord)
+            return chunk
+
+        chunk = self._load(coord)
+        if chunk is None:
+            chunk = self._generate(coord)
+        self._chunks[coord] = chunk
+        for e in chunk.enemies:
+            self.index.insert(e)
+        self._evict()
+        return chunk
+
+    def _generate(self, coord: tuple[int, int]) -> Chunk:
+        cx, cy = coord
+        cs = self.chunk_size
+        # String seeds hash deterministically, unlike tuples
+        rng = Random(f"{self.seed}:{cx}:{cy}")
+        room = Room(width=cs, height=cs, rng=rng)
+        if coord != self.exit_chunk:
+            room.tiles[-1] = Tile.FLOOR
+
+        enemies = []
+        attempts = 0
+        while len(enemies) < self.enemies_per_chunk and attempts < 10 * cs:
+            attempts += 1
+            lx, ly = rng.randrange(cs), rng.randrange(cs)
+            if room.tiles[ly * cs + lx] == WALL or (coord, lx, ly) == ((0, 0), 1, 1):
+                continue
+            enemy_type = rng.choice(list(ENEMY_TYPES.values()))
+            enemies.append(enemy_type(Vector2D(cx * cs + lx, cy * cs + ly)))
+
+        self.generated += 1
+        return Chunk(coord, room, enemies)
+
+    def _evict(self):
+        # Least recently used first, never the chunks in the active window
+        for coord in list(self._chunks):
+            if len(self._chunks) <= self.max_loaded:
+                break
+            if self._in_window(coord):
+                continue
+            chunk = self._chunks.pop(coord)
+            for e in chunk.enemies:
+                self.index.remove(e)
+            self._save(chunk)
+            self.evicted += 1
+
+    def _chunk_path(self, coord: tuple[int, int]) -> Path:
+        if self.cache_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="dungeon-world-")
+            self.cache_dir = Path(self._tmp_dir.name)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return self.cache_dir / f"chunk_{self.seed}_{coord[0]}_{coord[1]}.json"
+
+    def _save(self, chunk: Chunk):
+        data = {
+            "tiles": chunk.room.tiles.decode("ascii"),
+            "enemies": [
+                {
+                    "type": e.name,
+                    "x": int(e.position.x),
+                    "y": int(e.position.y),
+                    "hp": e.hp,
+                }
+                for e in chunk.enemies
+            ],
+        }
+        self._chunk_path(chunk.coord).write_text(json.dumps(data))
+
+    def _load(self, coord: tuple[int, int]) -> Optional[Chunk]:
+        if self.cache_dir is None:
+            return None
+        path = self._chunk_path(coord)
+        if not path.exists():
+            return None
+
+        data = json.loads(path.read_text())
+        room = Room(
+            width=self.chunk_size,
+            height=self.chunk_size,
+            rng=Random(0),
+            tiles=data["tiles"].encode("ascii"),
+        )
+
+        enemies = []
+        for e in data["enemies"]:
+            enemy = ENEMY_TYPES[e["type"]](Vector2D(e["x"], e["y"]))
+            enemy.hp = e["hp"]
+            enemies.append(enemy)
+        return Chunk(coord, room, enemies)
+
+    def close(self):
+        """
+        Removes the temporary chunk directory, if the world made one. Chunks evicted to it are
+        lost, a cache_dir passed in is left alone
+        """
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+            self.cache_dir = None
+
+    def __enter__(self) -> World:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─── Active window ───────────────────────────────────────────────────────
+
+    def _in_window(self, coord: tuple[int, int]) -> bool:
+        fx, fy = self.focus_chunk
+        return abs(coord[0] - fx) <= ACTIVE_RADIUS and abs(coord[1] - fy) <= ACTIVE_RADIUS
+
+    def _window_coords(self) -> list[tuple[int, int]]:
+        fx, fy = self.focus_chunk
+        r = ACTIVE_RADIUS
+        return [(fx + dx, fy + dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)]
+
+    def focus(self, pos: Vector2D):
+        """
+        Loads the chunks around pos and rebuilds the active window if pos is in a new chunk
+        """
+        coord = self.chunk_coord(int(pos.x), int(pos.y))
+        if coord == self.focus_chunk:
+            return
+        self.focus_chunk = coord
+
+        span = 2 * ACTIVE_RADIUS + 1
+        cs = self.chunk_size
+        window = np.empty((span * cs, span * cs), dtype=np.uint8)
+        for i, c in enumerate(self._window_coords()):
+            wy, wx = divmod(i, span)
+            window[wy * cs : (wy + 1) * cs, wx * cs : (wx + 1) * cs] = self.chunk(
+                c
+            ).room.tile_array
+
+        self.tiles = bytearray(window.tobytes())
+        self.width = self.height = span * cs
+        self.origin = ((coord[0] - ACTIVE_RADIUS) * cs, (coord[1] - ACTIVE_RADIUS) * cs)
+        self.grid_version += 1
+        self._evict()
+
+    # ─── Room interface (world coordinates) ──────────────────────────────────
+
+    @property
+    def entities(self) -> list[Enemy]:
+        """
+        Enemies in the active window. Enemies in other loaded chunks are frozen
+        """
+        active = []
+        for c in self._window_coords():
+            active.extend(self._chunks[c].enemies)
+        return active
+
+    def add_entity(self, entity: Enemy):
+        coord = self.chunk_coord(int(entity.position.x), int(entity.position.y))
+        self.chunk(coord).enemies.append(entity)
+        self.index.insert(entity)
+
+    def remove_entity(self, entity: Enemy):
+        coord = self.chunk_coord(int(entity.position.x), int(entity.position.y))
+        chunk = self.chunk(coord)
+        chunk.enemies = [e for e in chunk.enemies if e is not entity]
+        self.index.remove(entity)
+
+    def move_entity(self, entity: Entity, old_pos: Vector2D):
+        if isinstance(entity, Player):
+            self.focus(entity.position)
+            return
+
+        old = self.chunk_coord(int(old_pos.x), int(old_pos.y))
+        new = self.chunk_coord(int(entity.position.x), int(entity.position.y))
+        if old != new:
+            self.chunk(old).enemies = [e for e in self.chunk(old).enemies if e is not entity]
+            self.chunk(new).enemies.append(entity)
+        self.index.move(entity, old_pos)
+
+    def get_entities_at(self, pos: Vector2D) -> list[Enemy]:
+        return self.index.at(pos)
+
+    def get_entities_within(self, pos: Vector2D, radius: float) -> list[Enemy]:
+        return self.index.within(pos, radius)
+
+    def _tile_code(self, x: int, y: int) -> int:
+        cs = self.chunk_size
+        room = self.chunk(self.chunk_coord(x, y)).room
+        return room.tiles[(y % cs) * cs + x % cs]
+
+    def get_tile(self, pos: Vector2D) -> str:
+        return chr(self._tile_code(int(pos.x), int(pos.y)))
+
+    def is_walkable(self, pos: Vector2D) -> bool:
+        return self._tile_code(int(pos.x), int(pos.y)) != WALL
+
+    def walkable_at(self, x: int, y: int) -> bool:
+        return self._tile_code(x, y) != WALL
+
+    def set_tile(self, pos: Vector2D, tile: str):
+        x, y = int(pos.x), int(pos.y)
+        cs = self.chunk_size
+        self.chunk(self.chunk_coord(x, y)).room.set_tile(Vector2D(x % cs, y % cs), tile)
+
+        lx, ly = x - self.origin[0], y - self.origin[1]
+        if 0 <= lx < self.width and 0 <= ly < self.height:
+            self.tiles[ly * self.width + lx] = ord(tile)
+        self.grid_version += 1
+        self.visibility.tile_changed(x, y)
+
+    def render_rows(
+        self, player: Player, visible: Optional[frozenset[tuple[int, int]]] = None
+    ) -> list[bytearray]:
+        """
+        A view_width x view_height viewport of the active window centred on the player.
+        Tiles and enemies outside visible (if given) are left blank
+        """
+        px, py = int(player.position.x), int(player.position.y)
+        left = px - self.view_width // 2
+        top = py - self.view_height // 2
+        ox, oy = self.origin
+
+        rows = []
+        for y in range(top, top + self.view_height):
+            row = bytearray(b" " * self.view_width)
+            ly = y - oy
+            if 0 <= ly < self.height:
+                start, end = max(left, ox), min(left + self.view_width, ox + self.width)
+                if start < end:
+                    base = ly * self.width - ox
+                    row[start - left : end - left] = self.tiles[base + start : base + end]
+            rows.append(row)
+
+        if visible is not None:
+            for y, row in enumerate(rows, top):
+                for x in range(left, left + self.view_width):
+                    if (x, y) not in visible:
+                        row[x - left] = ord(" ")
+
+        for e in self.entities:
+            if visible is not None and (int(e.position.x), int(e.position.y)) not in visible:
+                continue
+            x, y = int(e.position.x) - left, int(e.position.y) - top
+            if 0 <= x < self.view_width and 0 <= y < self.view_height:
+                rows[y][x] = ord("M")
+
+        rows[py - top][px - left] = ord("P")
+        return rows
+
+    def render(self, player: Player) -> str:
+        return "\n".join(row.decode("ascii") for row in self.render_rows(player))
@@ -0,0 +1,56 @@
+import asyncio
+import io
+
+from async_loop import AsyncGameLoop
+from dungeon import GameEngine
+from renderer import DiffRenderer
+
+
+def test_loop_ticks_without_input():
+    engine = GameEngine("Hero", seed=1)
+    game_loop = AsyncGameLoop(engine, tick_rate=500, frame_rate=0)
+
+    asyncio.run(game_loop.run(max_ticks=20))
+
+    assert game_loop.stats.ticks >= 20
+    assert engine.ticks == game_loop.stats.ticks
+
+
+def test_loop_consumes_one_command_per_tick():
+    engine = GameEngine("Hero", seed=1)
+    game_loop = AsyncGameLoop(engine, tick_rate=500, frame_rate=0)
+    for command in ["s", "d", "attack"]:
+        game_loop.send(command)
+
+    game_loop.tick()
+    assert game_loop.inputs.qsize() == 2
+    game_loop.tick()
+    game_loop.tick()
+    assert game_loop.inputs.empty()
+
+
+def test_quit_command_stops_loop():
+    engine = GameEngine("Hero", seed=1)
+    game_loop = AsyncGameLoop(engine, tick_rate=200, frame_rate=0)
+    game_loop.send("q")
+
+    result = asyncio.run(game_loop.run())
+    assert result is None
+    assert game_loop.stats.ticks == 0
+
+
+def test_render_runs_at_its_own_rate():
+    engine = GameEngine("Hero", seed=1)
+    engine.renderer = DiffRenderer(io.BytesIO())
+    game_loop = AsyncGameLoop(engine, tick_rate=100, frame_rate=1000)
+
+    asyncio.run(game_loop.run(max_ticks=5))
+    assert game_loop.stats.frames > 0
+
+
+def test_overruns_are_counted():
+    engine = GameEngine("Hero", seed=1)
+    # A zero-length budget means every tick overruns
+    game_loop = AsyncGameLoop(engine, tick_rate=10**9, frame_rate=0)
+    game_loop.tick()
+    assert game_loop.stats.overruns == 1
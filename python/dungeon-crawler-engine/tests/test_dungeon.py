@@ -1,5 +1,5 @@
 import pytest
-from dungeon import Vector2D, Player, Room, Goblin, Troll, Enemy
+from dungeon import Vector2D, GridPos, Player, Room, Goblin, Troll, Enemy, Tile
 
 # ─── Vector2D ────────────────────────────────────────────────────────────────
 
@@ -18,6 +18,55 @@ def test_vector_magnitude():
     assert Vector2D(3, 4).magnitude() == 5.0
 
 
+def test_grid_pos_updates_in_place():
+    pos = GridPos(1, 2)
+    alias = pos
+    pos += Vector2D(1, 0)
+    pos -= GridPos(0, 1)
+    assert alias is pos
+    assert pos == GridPos(2, 1) == Vector2D(2, 1)
+    assert pos.distance_sq(Vector2D(5, 5)) == 25
+
+
+def test_entity_positions_are_owned_grid_positions():
+    start = Vector2D(3, 3)
+    goblin = Goblin(position=start)
+    troll = Troll(position=start)
+    assert isinstance(goblin.position, GridPos)
+    assert goblin.position is not troll.position
+    assert goblin.position == start
+
+
+def test_assigned_vector_position_is_coerced_and_moves():
+    room = Room(width=10, height=10)
+    room.grid = [["." for _ in range(10)] for _ in range(10)]
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(0, 0))
+    start = Vector2D(2, 2)
+    player.position = start
+    assert isinstance(player.position, GridPos)
+    player.move(Vector2D(1, 0), room)
+    assert player.position == Vector2D(3, 2)
+    assert start == Vector2D(2, 2)
+
+    goblin = Goblin(position=Vector2D(0, 0))
+    goblin.position = Vector2D(6, 2)
+    goblin.act(player)
+    assert goblin.position == Vector2D(5, 2)
+
+
+def test_enemy_step_without_room_matches_rounded_direction():
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(5, 5))
+    for x in range(10):
+        for y in range(10):
+            goblin = Goblin(position=Vector2D(x, y))
+            diff = Vector2D(5 - x, 5 - y)
+            if not 1 < diff.magnitude() <= goblin.aggro_range:
+                continue
+            step = diff.normalise()
+            goblin.act(player)
+            assert goblin.position == Vector2D(x + round(step.x), y + round(step.y))
+
+
 # ─── Entity ───────────────────────────────────────────────────────────────────
 
 
@@ -70,6 +119,55 @@ def test_room_generation_has_exit():
         assert has_exit
 
 
+def test_room_tiles_are_compact_and_shared_with_numpy_view():
+    room = Room(width=64, height=32)
+    assert len(room.tiles) == 64 * 32
+    assert room.tile_array.shape == (32, 64)
+
+    version = room.grid_version
+    room.set_tile(Vector2D(3, 2), "#")
+    assert room.tile_array[2, 3] == Tile.WALL
+    assert room.grid[2][3] == "#"
+    assert not room.is_walkable(Vector2D(3, 2))
+    assert room.grid_version > version
+
+
+def test_room_generation_wall_density():
+    room = Room(width=256, height=256)
+    walls = (room.tile_array == Tile.WALL).mean()
+    assert 0.12 < walls < 0.18
+    assert room.get_tile(Vector2D(1, 1)) == "."
+
+
+def test_room_spatial_index_tracks_enemy_movement():
+    room = Room(width=10, height=10)
+    room.grid = [["." for _ in range(10)] for _ in range(10)]
+    goblin = Goblin(position=Vector2D(2, 2))
+    room.entities = [goblin]
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(5, 2))
+
+    goblin.act(player, room)
+
+    assert goblin.position == Vector2D(3, 2)
+    assert room.get_entities_at(Vector2D(2, 2)) == []
+    assert room.get_entities_at(Vector2D(3, 2)) == [goblin]
+
+
+def test_room_entities_within_radius():
+    room = Room(width=10, height=10)
+    near = Goblin(position=Vector2D(4, 5))
+    diagonal = Troll(position=Vector2D(6, 6))
+    far = Goblin(position=Vector2D(9, 9))
+    room.entities = [near, diagonal, far]
+
+    found = room.get_entities_within(Vector2D(5, 5), 1)
+    assert len(found) == 1 and found[0] is near
+
+    room.remove_entity(near)
+    assert room.get_entities_within(Vector2D(5, 5), 1) == []
+    assert room.entities == [diagonal, far]
+
+
 # ─── Enemy ───────────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,45 @@
+from dungeon import Vector2D, Player, Goblin, Troll
+from entity_store import EntityStore
+
+
+def test_store_round_trips_enemies():
+    enemies = [Goblin(Vector2D(1, 2)), Troll(Vector2D(3, 4))]
+    store = EntityStore.from_enemies(enemies)
+
+    assert len(store) == 2
+    assert store.to_enemies() == enemies
+
+
+def test_store_update_matches_enemy_act():
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(5, 5))
+    enemies = [
+        Goblin(Vector2D(5, 6)),  # adjacent -> attacks
+        Goblin(Vector2D(2, 2)),  # in range -> moves
+        Troll(Vector2D(0, 0)),  # out of range -> stays
+        Troll(Vector2D(8, 5)),  # in range -> moves
+    ]
+    store = EntityStore.from_enemies(enemies)
+
+    expected_player = Player("Hero", hp=50, attack=10, position=Vector2D(5, 5))
+    for e in enemies:
+        e.act(expected_player)
+
+    store.update(player)
+
+    assert player.hp == expected_player.hp
+    assert store.to_enemies() == enemies
+
+
+def test_store_removes_dead_and_grants_xp():
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(0, 0))
+    store = EntityStore()
+    store.spawn(Goblin, 1, 0)
+    store.spawn(Troll, 9, 9)
+
+    store.apply_player_attack(player)
+    store.apply_player_attack(player)
+    store.update(player)
+
+    assert len(store) == 1
+    assert store.to_enemies()[0].name == "Troll"
+    assert player.xp == 50
@@ -0,0 +1,53 @@
+from dungeon import Event, GameEngine, Goblin, Vector2D
+from events import EventBus, EventType
+
+
+def test_bus_dispatches_to_handlers_by_code():
+    bus = EventBus(capacity=2)
+    seen = []
+    bus.on(EventType.DAMAGE, lambda e: seen.append(("damage", e.amount)))
+    bus.on(EventType.LOOT, lambda e: seen.append(("loot", e.item)))
+
+    bus.emit(EventType.DAMAGE, None, 5)
+    bus.emit(EventType.LOOT, None, item="sword")
+    bus.emit(EventType.DAMAGE, None, 7)  # grows past initial capacity
+
+    assert bus.dispatch() == 3
+    assert seen == [("damage", 5), ("loot", "sword"), ("damage", 7)]
+    assert len(bus) == 0
+
+
+def test_bus_reuses_records_between_batches():
+    bus = EventBus(capacity=4)
+    records = []
+    bus.on(EventType.DAMAGE, lambda e: records.append(id(e)))
+
+    for _ in range(3):
+        bus.emit(EventType.DAMAGE, None, 1)
+        bus.dispatch()
+
+    assert len(set(records)) == 1
+
+
+def test_subscribers_receive_whole_batch():
+    bus = EventBus()
+    batches = []
+    bus.subscribe(lambda events, count: batches.append([e.amount for e in events[:count]]))
+
+    bus.emit(EventType.DAMAGE, None, 1)
+    bus.emit(EventType.DAMAGE, None, 2)
+    bus.dispatch()
+
+    assert batches == [[1, 2]]
+
+
+def test_engine_applies_queued_events():
+    engine = GameEngine("Hero", seed=1)
+    goblin = Goblin(Vector2D(0, 0))
+    engine.queue_event(Event(type="damage", target=goblin, amount=10))
+    engine.queue_event(Event(type="loot", target=engine.player, item="potion"))
+    engine.process_events()
+
+    assert goblin.hp == 5
+    assert engine.player.inventory == ["potion"]
+    assert engine.damage_dealt == 10
@@ -0,0 +1,89 @@
+from random import Random
+
+from dungeon import GameEngine, Goblin, Player, Room, Vector2D
+from fov import line_of_sight, shadowcast
+
+
+def open_room(width: int = 10, height: int = 10) -> Room:
+    room = Room(width=width, height=height, rng=Random(0))
+    room.grid = [["." for _ in range(width)] for _ in range(height)]
+    return room
+
+
+def test_shadowcast_open_room_sees_everything_in_radius():
+    room = open_room()
+    visible = shadowcast(room, (5, 5), 3)
+    assert (5, 2) in visible and (8, 5) in visible and (7, 7) in visible
+    assert (5, 1) not in visible
+    assert (0, 0) not in visible
+
+
+def test_shadowcast_wall_hides_tiles_behind_it():
+    room = open_room()
+    room.set_tile(Vector2D(5, 3), "#")
+    visible = shadowcast(room, (5, 5), 5)
+    assert (5, 3) in visible
+    assert (5, 2) not in visible
+    assert (5, 1) not in visible
+
+
+def test_line_of_sight_blocked_by_wall():
+    room = open_room()
+    assert line_of_sight(room, (1, 1), (8, 4))
+    room.set_tile(Vector2D(4, 2), "#")
+    room.set_tile(Vector2D(5, 3), "#")
+    assert not line_of_sight(room, (1, 1), (8, 4))
+    # Endpoints never block
+    assert line_of_sight(room, (4, 2), (5, 3))
+
+
+def test_enemy_does_not_aggro_through_walls():
+    room = open_room()
+    for y in range(10):
+        room.set_tile(Vector2D(4, y), "#")
+    goblin = Goblin(position=Vector2D(2, 2))
+    room.entities = [goblin]
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(6, 2))
+
+    goblin.act(player, room)
+    assert goblin.position == Vector2D(2, 2)
+
+    room.set_tile(Vector2D(4, 2), ".")
+    goblin.act(player, room)
+    assert goblin.position == Vector2D(3, 2)
+
+
+def test_visibility_cache_shared_and_invalidated_per_tile():
+    room = open_room(32, 32)
+    vis = room.visibility
+    player = Vector2D(5, 5)
+    for x in range(1, 9):
+        assert vis.can_see(player, Vector2D(x, 9))
+    assert vis.builds == 1
+
+    # A far away tile change keeps the cached field, a nearby one drops it
+    room.set_tile(Vector2D(30, 30), "#")
+    vis.fov(player)
+    assert vis.builds == 1
+    room.set_tile(Vector2D(5, 7), "#")
+    assert (5, 9) not in vis.fov(player)
+    assert vis.builds == 2
+
+    # Bulk grid changes clear everything
+    room.grid = [["." for _ in range(32)] for _ in range(32)]
+    assert (5, 9) in vis.fov(player)
+    assert vis.builds == 3
+
+
+def test_frame_hides_tiles_outside_fov():
+    room = open_room(20, 5)
+    for y in range(5):
+        room.set_tile(Vector2D(4, y), "#")
+    engine = GameEngine("Hero", seed=1, room=room)
+
+    rows = engine.frame()
+    assert rows[1][:5] == b".P..#"
+    assert rows[1][5:] == b" " * 15
+
+    engine.fog_of_war = False
+    assert engine.frame()[1][5:] == b"." * 15
@@ -0,0 +1,61 @@
+from random import Random
+
+from dungeon import Goblin, Player, Room, Vector2D
+from pathfinding import FlowField, astar
+
+
+def open_room(width: int = 10, height: int = 10) -> Room:
+    room = Room(width=width, height=height, rng=Random(0))
+    room.grid = [["." for _ in range(width)] for _ in range(height)]
+    return room
+
+
+def test_flow_field_routes_around_walls():
+    room = open_room()
+    # Vertical wall between enemy and player with a gap at the bottom
+    for y in range(0, 9):
+        room.set_tile(Vector2D(5, y), "#")
+
+    field = FlowField(room, (8, 2))
+    assert field.distance(2, 2) == 6 + 2 * 7
+    assert field.distance(*field.next_step(2, 2)) == field.distance(2, 2) - 1
+
+
+def test_enemy_does_not_walk_through_walls():
+    room = open_room()
+    room.set_tile(Vector2D(3, 2), "#")
+    room.set_tile(Vector2D(3, 1), "#")
+    room.set_tile(Vector2D(3, 3), "#")
+    goblin = Goblin(position=Vector2D(2, 2))
+    room.entities = [goblin]
+    player = Player("Hero", hp=50, attack=10, position=Vector2D(5, 2))
+
+    for _ in range(3):
+        goblin.act(player, room)
+        assert room.is_walkable(goblin.position)
+
+
+def test_pathfinder_reuses_field_until_player_moves_or_grid_changes():
+    room = open_room()
+    target = Vector2D(5, 5)
+
+    room.pathfinder.field_to(target)
+    room.pathfinder.field_to(target)
+    assert room.pathfinder.builds == 1
+
+    room.pathfinder.field_to(Vector2D(5, 6))
+    assert room.pathfinder.builds == 2
+
+    room.set_tile(Vector2D(0, 0), "#")
+    room.pathfinder.field_to(Vector2D(5, 6))
+    assert room.pathfinder.builds == 3
+
+
+def test_astar_matches_flow_field_distance():
+    room = open_room()
+    for y in range(1, 10):
+        room.set_tile(Vector2D(4, y), "#")
+
+    path = astar(room, (0, 9), (9, 9))
+    field = FlowField(room, (9, 9))
+    assert len(path) - 1 == field.distance(0, 9)
@@ -0,0 +1,80 @@
+import json
+import logging
+
+from dungeon import GameEngine, Goblin, Vector2D
+from messages import MessageBuffer
+from profiler import TickProfiler
+
+
+def test_profiled_step_matches_plain_step():
+    plain = GameEngine("Hero", seed=3)
+    profiled = GameEngine("Hero", seed=3)
+    profiler = TickProfiler().attach(profiled)
+
+    for command in "ddssddssaawd" * 3:
+        assert plain.step(command) == profiled.step(command)
+    assert plain.player.position == profiled.player.position
+    assert plain.player.hp == profiled.player.hp
+    assert profiled.ticks == plain.ticks
+    assert profiler.phases["tick"].count == plain.ticks
+
+
+def test_report_has_percentiles_per_phase(tmp_path):
+    engine = GameEngine("Hero", seed=1)
+    profiler = TickProfiler(track_allocations=True).attach(engine)
+    for _ in range(50):
+        engine.step("")
+    profiler.detach(engine)
+
+    out = tmp_path / "profile.json"
+    profiler.dump(out)
+    report = json.loads(out.read_text())
+    for phase in ("input", "enemy_act", "process_events", "update", "check_win_lose"):
+        stats = report["phases"][phase]
+        assert stats["count"] == 50
+        assert 0 <= stats["p50_us"] <= stats["p99_us"] <= stats["max_us"]
+        assert sum(stats["histogram_us"].values()) == 50
+    assert "render" not in report["phases"]
+    for name in ("net_bytes", "peak_bytes", "net_blocks"):
+        assert report["allocations"][name]["count"] == 50
+    assert "mean_blocks" in report["allocations"]["net_blocks"]
+    assert engine.profiler is None
+    assert "step" not in vars(engine)
+
+
+def test_profiler_times_the_engines_own_step():
+    engine = GameEngine("Hero", seed=1)
+    profiler = TickProfiler().attach(engine)
+    recorded = []
+
+    class Recorder:
+        def record(self, user_input):
+            recorded.append(user_input)
+
+    engine.recorder = Recorder()
+    engine.step("d")
+    profiler.detach(engine)
+    engine.step("s")
+
+    # The recorder is called by GameEngine.step itself, with or without the profiler
+    assert recorded == ["d", "s"]
+    assert profiler.phases["tick"].count == 1
+    assert profiler.phases["input"].count == 1
+
+
+def test_message_buffer_collects_game_messages():
+    buffer = MessageBuffer(maxlen=2).attach()
+    try:
+        engine = GameEngine("Hero", seed=1)
+        engine.messages = buffer
+        engine.room.entities = [Goblin(position=Vector2D(2, 1))]
+        engine.step("")
+        engine.step("")
+
+        assert buffer.latest(1) == ["Goblin attacks Hero for 3 damage"]
+        assert engine.frame()[-1] == b"Goblin attacks Hero for 3 damage"
+        assert len(buffer.drain()) == 2
+        assert buffer.latest(5) == []
+    finally:
+        buffer.detach()
+        logging.getLogger("dungeon").setLevel(logging.NOTSET)
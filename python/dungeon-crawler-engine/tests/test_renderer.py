@@ -0,0 +1,63 @@
+import io
+
+from dungeon import GameEngine, Vector2D
+from renderer import CLEAR_SCREEN, DiffRenderer
+
+
+def test_room_render_draws_player_and_enemies():
+    engine = GameEngine("Hero", seed=1)
+    rows = engine.room.render(engine.player).split("\n")
+
+    assert len(rows) == engine.room.height
+    assert rows[1][1] == "P"
+    assert rows[5][5] == "M"
+    assert rows[8][8] == "M"
+
+
+def test_first_frame_is_full_redraw():
+    out = io.BytesIO()
+    renderer = DiffRenderer(out)
+    renderer.draw([b"....", b"..P."])
+
+    assert out.getvalue().startswith(CLEAR_SCREEN)
+    assert b"..P." in out.getvalue()
+
+
+def test_unchanged_frame_writes_only_cursor_park():
+    out = io.BytesIO()
+    renderer = DiffRenderer(out)
+    renderer.draw([b"....", b"..P."])
+    full = renderer.last_frame_bytes
+
+    renderer.draw([b"....", b"..P."])
+    assert renderer.last_frame_bytes < 16
+    assert renderer.last_frame_bytes < full
+
+
+def test_diff_writes_only_changed_cells():
+    out = io.BytesIO()
+    renderer = DiffRenderer(out)
+    width = 200
+    renderer.draw([b"." * width] * 50)
+
+    out.seek(0)
+    out.truncate()
+    moved = [b"." * width] * 50
+    moved[10] = b"." * 20 + b"P" + b"." * (width - 21)
+    renderer.draw(moved)
+
+    # Cursor to row 11, column 21 followed by the single changed cell
+    assert b"\033[11;21HP" in out.getvalue()
+    assert renderer.last_frame_bytes < 32
+
+
+def test_engine_render_uses_diff_renderer():
+    out = io.BytesIO()
+    engine = GameEngine("Hero", seed=1)
+    engine.renderer = DiffRenderer(out)
+    engine.render()
+    full = engine.renderer.last_frame_bytes
+
+    engine.player.position = Vector2D(2, 1)
+    engine.render()
+    assert engine.renderer.last_frame_bytes < full
@@ -0,0 +1,76 @@
+import io
+from random import Random
+
+from dungeon import GameEngine, Room, Vector2D
+from replay import InputRecorder, iter_replay, load_snapshot, replay, save_snapshot
+
+COMMANDS = ["w", "a", "s", "d", "attack", ""]
+
+
+def play(engine: GameEngine, ticks: int, seed: int = 0):
+    rng = Random(seed)
+    for _ in range(ticks):
+        if engine.step(rng.choice(COMMANDS)) is not None:
+            break
+
+
+def state(engine: GameEngine):
+    p = engine.player
+    return (
+        bytes(engine.room.tiles),
+        [(e.name, e.position, e.hp) for e in engine.room.entities],
+        (p.position, p.hp, p.xp, p.level, p.attack),
+        engine.ticks,
+    )
+
+
+def test_recorded_game_replays_identically(tmp_path):
+    log = tmp_path / "game.dcrl"
+    engine = GameEngine("Hero", width=16, height=16)
+    recorder = InputRecorder(engine, log)
+    play(engine, 200, seed=4)
+    recorder.close()
+
+    replayed = replay(log)
+    assert state(replayed) == state(engine)
+
+
+def test_replay_can_stop_at_a_tick(tmp_path):
+    log = tmp_path / "game.dcrl"
+    engine = GameEngine("Hero", seed=9)
+    recorder = InputRecorder(engine, log)
+    for command in ["s", "d", "d", "s", "attack"]:
+        engine.step(command)
+    recorder.close()
+
+    assert replay(log, until_tick=2).ticks == 2
+    assert [e.ticks for e in iter_replay(log)] == [1, 2, 3, 4, 5]
+
+
+def test_snapshot_round_trip_continues_identically():
+    engine = GameEngine("Hero", width=20, height=20, seed=11)
+    play(engine, 5, seed=1)
+
+    buf = io.BytesIO()
+    save_snapshot(engine, buf)
+    restored = load_snapshot(io.BytesIO(buf.getvalue()))
+    assert state(restored) == state(engine)
+
+    play(engine, 50, seed=2)
+    play(restored, 50, seed=2)
+    assert state(restored) == state(engine)
+
+
+def test_large_snapshot_loads_tiles_without_generating(monkeypatch):
+    engine = GameEngine("Hero", room=Room(1024, 1024))
+    buf = io.BytesIO()
+    save_snapshot(engine, buf)
+
+    # Tiles must come back through Room(tiles=...), never by generating a layout to overwrite
+    def no_generate(self):
+        raise AssertionError("load_snapshot generated a room")
+
+    monkeypatch.setattr(Room, "_generate", no_generate)
+    restored = load_snapshot(io.BytesIO(buf.getvalue()))
+    assert restored.room.tiles == engine.room.tiles
+    assert restored.player.position == Vector2D(1, 1)
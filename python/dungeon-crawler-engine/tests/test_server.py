@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+from dungeon import Goblin, Vector2D
+from server import MAX_WRITE_BUFFER, GameServer, Session
+
+
+async def _session_round_trip():
+    server = GameServer(port=0, tick_rate=100)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+
+        init = (await reader.readline()).decode().split()
+        assert init[0] == "I"
+        width, height, tiles = int(init[2]), int(init[3]), init[4]
+        assert len(tiles) == width * height
+
+        # First diff carries the full entity state
+        first = (await reader.readline()).decode().split()
+        assert first[0] == "D"
+        assert any(part.startswith("p=") for part in first[2:])
+        assert sum(part.startswith("m") for part in first[2:]) == 2
+
+        writer.write(b"stats\n")
+        while True:
+            line = (await reader.readline()).decode()
+            if line.startswith("S "):
+                break
+        stats = json.loads(line[2:])
+        assert stats["sessions"] == 1
+        assert stats["ticks"] > 0
+
+        writer.write(b"q\n")
+        writer.close()
+    finally:
+        await server.stop()
+
+
+def test_server_sends_init_and_diffs():
+    asyncio.run(_session_round_trip())
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(data.decode())
+
+
+def test_unchanged_state_sends_no_diff():
+    writer = FakeWriter()
+    session = Session(seed=1, writer=writer)
+    assert session.send_diff()
+    assert writer.lines[-1].startswith("D ")
+    sent = len(writer.lines)
+    assert session.send_diff()
+    assert len(writer.lines) == sent
+
+
+def test_dropped_diff_is_resent_to_slow_client():
+    writer = FakeWriter()
+    session = Session(seed=1, writer=writer)
+    assert session.send_diff()
+
+    # Client falls behind: the diff with the new hp is dropped and not marked as sent
+    writer.transport.buffered = MAX_WRITE_BUFFER + 1
+    session.engine.player.hp -= 7
+    sent = len(writer.lines)
+    assert not session.send_diff()
+    assert len(writer.lines) == sent
+
+    writer.transport.buffered = 0
+    assert session.send_diff()
+    assert f",{session.engine.player.hp}" in writer.lines[-1]
+
+    # Init lines are never dropped
+    writer.transport.buffered = MAX_WRITE_BUFFER + 1
+    session.new_game(seed=2)
+    assert writer.lines[-1].startswith("I 2 ")
+
+
+def test_entity_ids_are_never_reused_while_alive():
+    writer = FakeWriter()
+    session = Session(seed=1, writer=writer)
+    room = session.engine.room
+    session.send_diff()
+    first, second = room.entities[:2]
+    ids = dict(session._ids)
+
+    room.remove_entity(first)
+    session.send_diff()
+    assert f"-{ids[first.uid]}" in writer.lines[-1]
+
+    room.add_entity(Goblin(position=Vector2D(1, 1)))
+    session.send_diff()
+    added = writer.lines[-1]
+    new_ids = {int(part[1:].split("=")[0]) for part in added.split()[2:] if part.startswith("m")}
+    assert new_ids and ids[second.uid] not in new_ids and ids[first.uid] not in new_ids
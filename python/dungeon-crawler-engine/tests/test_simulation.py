@@ -0,0 +1,39 @@
+from dungeon import GameEngine, Room
+from random import Random
+from simulation import run_batch, simulate_game
+
+
+def test_room_generation_is_reproducible_from_seed():
+    a = Room(width=20, height=20, rng=Random(7))
+    b = Room(width=20, height=20, rng=Random(7))
+    assert a.tiles == b.tiles
+
+
+def test_simulate_game_is_deterministic():
+    first = simulate_game(seed=123, policy="random", max_ticks=200)
+    second = simulate_game(seed=123, policy="random", max_ticks=200)
+    assert first == second
+
+
+def test_scripted_game_reaches_lose_or_timeout():
+    result = simulate_game(seed=1, policy=["attack"] * 10, max_ticks=10)
+    assert result.outcome in ("lose", "timeout")
+    assert result.ticks <= 10
+
+
+def test_run_batch_parallel_matches_serial():
+    serial, serial_results = run_batch(games=20, policy="greedy", workers=1)
+    parallel, parallel_results = run_batch(
+        games=20, policy="greedy", workers=2, chunk_size=5
+    )
+
+    assert serial_results == parallel_results
+    assert serial.wins + serial.losses + serial.timeouts == 20
+    assert parallel.win_rate == serial.win_rate
+
+
+def test_engine_step_counts_ticks():
+    engine = GameEngine("Hero", seed=3)
+    engine.step("")
+    engine.step("")
+    assert engine.ticks == 2
@@ -0,0 +1,77 @@
+from dungeon import GameEngine, Vector2D
+from world import World
+
+
+def test_chunks_are_deterministic_per_seed(tmp_path):
+    a = World(seed=7, chunk_size=16, cache_dir=tmp_path / "a")
+    b = World(seed=7, chunk_size=16, cache_dir=tmp_path / "b")
+
+    assert a.chunk((5, -3)).room.tiles == b.chunk((5, -3)).room.tiles
+    assert a.chunk((5, -3)).room.tiles != a.chunk((6, -3)).room.tiles
+
+
+def test_chunks_load_lazily_around_player():
+    world = World(seed=1, chunk_size=16)
+    assert world.generated == 9  # only the window around the start
+
+    world.focus(Vector2D(16 * 4, 0))
+    assert world.is_loaded((4, 0))
+    assert world.is_loaded((5, 1))
+    assert not world.is_loaded((10, 10))
+
+
+def test_lru_eviction_bounds_memory_and_round_trips_to_disk(tmp_path):
+    world = World(seed=3, chunk_size=8, max_loaded=9, cache_dir=tmp_path)
+    world.set_tile(Vector2D(2, 2), "#")
+    goblins_before = [(e.name, e.position) for e in world.chunk((0, 0)).enemies]
+
+    # Walk far away so the start chunk is evicted
+    for step in range(1, 10):
+        world.focus(Vector2D(8 * 3 * step, 0))
+        assert len(world._chunks) <= 9
+    assert not world.is_loaded((0, 0))
+    assert world.evicted > 0
+
+    # Coming back restores the edited tile and enemies from disk
+    world.focus(Vector2D(0, 0))
+    assert world.get_tile(Vector2D(2, 2)) == "#"
+    assert [(e.name, e.position) for e in world.chunk((0, 0)).enemies] == goblins_before
+
+
+def test_player_moves_across_chunk_borders():
+    world = World(seed=5, chunk_size=8, enemies_per_chunk=0)
+    engine = GameEngine("Hero", room=world)
+
+    for x in range(1, 12):
+        world.set_tile(Vector2D(x, 1), ".")
+    for _ in range(10):
+        engine.step("d")
+
+    assert engine.player.position == Vector2D(11, 1)
+    assert world.focus_chunk == (1, 0)
+    assert engine.check_win_lose() is None
+
+
+def test_exit_only_in_exit_chunk():
+    world = World(seed=2, chunk_size=8, exit_chunk=(1, 1))
+    engine = GameEngine("Hero", room=world)
+    assert world.get_tile(Vector2D(7, 7)) != "E"
+
+    engine.player.position = Vector2D(15, 15)
+    assert engine.check_win_lose() == "win"
+
+
+def test_temporary_chunk_dir_is_removed_on_close():
+    with World(seed=3, chunk_size=8, max_loaded=9) as world:
+        for step in range(1, 4):
+            world.focus(Vector2D(8 * 3 * step, 0))
+        cache_dir = world.cache_dir
+        assert world.evicted > 0
+        assert any(cache_dir.iterdir())
+
+        # Evicted chunks come back through Room(tiles=...) without regenerating
+        generated = world.generated
+        world.focus(Vector2D(0, 0))
+        assert world.generated == generated
+    assert not cache_dir.exists()
+    assert world.cache_dir is None